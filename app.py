@@ -15,7 +15,7 @@
 #   - Step 3: Shape factor
 #   - Step 4: Energy barrier
 #
-# PART 3: THE COMPLETE PICTURE (Cells 23-26)
+# PART 3: THE COMPLETE PICTURE (Cells 23-29)
 #   - Interactive 3-panel visualization
 #   - Key takeaways
 #
@@ -24,6 +24,23 @@
 
 # ======================= CELL 1: IMPORTS =======================
 import marimo as mo
+import numpy as np
+
+# The sibling modules of a clone are optional. A single-file run (molab, the
+# WASM export) has only this notebook, and the features built on them are
+# hidden: Langevin runs, the target-barrier query and the 3-panel overlays.
+try:
+    import physics
+except ImportError:
+    physics = None
+try:
+    import langevin
+except ImportError:
+    langevin = None
+try:
+    import overlays
+except ImportError:
+    overlays = None
 
 
 # ======================= CELL 2: TITLE AND LEARNING PATH =======================
@@ -83,10 +100,10 @@ r_competition_slider
 import math
 
 r_comp = r_competition_slider.value
-r_star = 1.0
 
 gamma = 1.0
 deltaGv = 2.0
+r_star = 2 * gamma / deltaGv
 
 surface_energy = 4 * math.pi * r_comp * r_comp * gamma
 volume_energy = (4/3) * math.pi * r_comp * r_comp * r_comp * deltaGv
@@ -112,19 +129,16 @@ winner_text = "EQUAL (r = r*)" if is_critical else "↑ SURFACE WINS → Shrinks
 winner_bg = "#422006" if is_critical else "#450a0a" if surface_dominates else "#052e16"
 
 def generate_curve_points(curve_type, max_e):
-    points = []
-    for i in range(1, 201):
-        x = i * 0.01 * 2
-        if curve_type == 'surface':
-            y = 4 * math.pi * x * x * gamma
-        elif curve_type == 'volume':
-            y = (4/3) * math.pi * x * x * x * deltaGv
-        else:
-            y = 4 * math.pi * x * x * gamma - (4/3) * math.pi * x * x * x * deltaGv
-        svg_x = 50 + x * 130
-        svg_y = 200 - (y / max_e) * 150 if curve_type != 'total' else 160 - (y / deltaG_star) * 70
-        points.append(f"{svg_x},{svg_y}")
-    return " ".join(points)
+    x = np.arange(1, 201) * 0.01 * 2
+    if curve_type == 'surface':
+        y = 4 * np.pi * x * x * gamma
+    elif curve_type == 'volume':
+        y = (4/3) * np.pi * x * x * x * deltaGv
+    else:
+        y = 4 * np.pi * x * x * gamma - (4/3) * np.pi * x * x * x * deltaGv
+    svg_x = 50 + x * 130
+    svg_y = 200 - (y / max_e) * 150 if curve_type != 'total' else 160 - (y / deltaG_star) * 70
+    return " ".join(f"{sx},{sy}" for sx, sy in zip(svg_x.tolist(), svg_y.tolist()))
 
 surface_curve = generate_curve_points('surface', max_energy)
 volume_curve = generate_curve_points('volume', max_energy)
@@ -238,15 +252,24 @@ r_fate_slider = mo.ui.slider(
     value=0.5,
     label="Nucleus radius r"
 )
-r_fate_slider
+stochastic_toggle = mo.ui.checkbox(value=False, label="Thermal noise (Langevin)")
+barrier_kT_slider = mo.ui.slider(
+    start=1,
+    stop=20,
+    step=1,
+    value=5,
+    label="ΔG*/kT"
+)
+mo.hstack([r_fate_slider] + ([stochastic_toggle, barrier_kT_slider] if langevin is not None else []),
+          justify="start", gap=2)
 
 
 # ======================= CELL 9: NUCLEUS FATE VISUALIZATION =======================
 r_fate = r_fate_slider.value
-r_star_fate = 1.0
 
 gamma_f = 1.0
 deltaGv_f = 2.0
+r_star_fate = 2 * gamma_f / deltaGv_f
 surface_f = 4 * math.pi * r_fate * r_fate * gamma_f
 volume_f = (4/3) * math.pi * r_fate * r_fate * r_fate * deltaGv_f
 deltaG_f = surface_f - volume_f
@@ -268,16 +291,38 @@ ball_y_f = 180 - (deltaG_f / deltaG_star_f) * 100
 nucleus_size = 30 + r_fate * 50
 r_star_size = 30 + r_star_fate * 50
 
-curve_points_fate = []
-for i in range(1, 201):
-    x = i * 0.01 * 2
-    s = 4 * math.pi * x * x * gamma_f
-    v = (4/3) * math.pi * x * x * x * deltaGv_f
-    y = s - v
-    svg_x = 60 + x * 130
-    svg_y = 180 - (y / deltaG_star_f) * 100
-    curve_points_fate.append(f"{svg_x},{svg_y}")
-curve_path = " ".join(curve_points_fate)
+x_fate = np.arange(1, 201) * 0.01 * 2
+y_fate = 4 * np.pi * x_fate**2 * gamma_f - (4/3) * np.pi * x_fate**3 * deltaGv_f
+svg_x_fate = 60 + x_fate * 130
+svg_y_fate = 180 - (y_fate / deltaG_star_f) * 100
+curve_path = " ".join(f"{sx},{sy}" for sx, sy in zip(svg_x_fate.tolist(), svg_y_fate.tolist()))
+
+# Stochastic mode: Langevin runs on the same landscape (x = r/r*, β = ΔG*/kT)
+langevin_svg = ""
+langevin_stats = ""
+if langevin is not None and stochastic_toggle.value:
+    beta_f = barrier_kT_slider.value
+    fate_runs = langevin.simulate(r_fate / r_star_fate, n_traj=2000, beta=beta_f, t_max=2.0, seed=0)
+    grid_runs = langevin.simulate(np.arange(1, 10) * 0.2, n_traj=256, beta=beta_f, t_max=2.0, seed=1)
+    x_c = np.arange(1, 100) * 0.02
+    p_exact = langevin.committor_exact(x_c, beta_f)
+    committor_path = " ".join(f"{sx},{sy}" for sx, sy in zip((60 + x_c * r_star_fate * 130).tolist(),
+                                                             (180 - p_exact * 100).tolist()))
+    hist_f = fate_runs.hist[0]
+    bin_w = (fate_runs.hist_edges[1] - fate_runs.hist_edges[0]) * r_star_fate * 130
+    bars = "".join(
+        f'<rect x="{60 + e * r_star_fate * 130:.1f}" y="{180 - h / hist_f.max() * 60:.1f}" width="{bin_w:.1f}" '
+        f'height="{h / hist_f.max() * 60:.1f}" fill="#38bdf8" opacity="0.45"/>'
+        for e, h in zip(fate_runs.hist_edges[:-1].tolist(), hist_f.tolist()) if h > 0)
+    dots = "".join(
+        f'<circle cx="{60 + x0 * r_star_fate * 130:.1f}" cy="{180 - p * 100:.1f}" r="3" fill="#22c55e"/>'
+        for x0, p in zip(grid_runs.x0.tolist(), grid_runs.committor.tolist()))
+    langevin_svg = (bars + f'<polyline points="{committor_path}" fill="none" stroke="#22c55e" '
+                    f'stroke-width="1.5" stroke-dasharray="4,3" opacity="0.7"/>' + dots
+                    + '<text x="318" y="95" fill="#22c55e" font-size="10" text-anchor="end">P(grow)</text>')
+    langevin_stats = (f'<span>P(grow) = <strong style="color: #22c55e;">{fate_runs.committor[0]:.2f} '
+                      f'± {fate_runs.committor_err[0]:.2f}</strong> ({fate_runs.n_traj} runs, '
+                      f'blue = r at t = 0.5)</span>')
 
 arrow_left_points = f"{ball_x - 28},{ball_y_f} {ball_x - 40},{ball_y_f - 7} {ball_x - 40},{ball_y_f + 7}"
 arrow_right_points = f"{ball_x + 28},{ball_y_f} {ball_x + 40},{ball_y_f - 7} {ball_x + 40},{ball_y_f + 7}"
@@ -296,6 +341,7 @@ html_fate = f'''
           <line x1="60" y1="180" x2="320" y2="180" stroke="#475569" stroke-width="1"/>
           <line x1="{60 + r_star_fate * 130}" y1="60" x2="{60 + r_star_fate * 130}" y2="195" stroke="#facc15" stroke-width="2" stroke-dasharray="6,4" opacity="0.7"/>
           <text x="{60 + r_star_fate * 130}" y="210" fill="#facc15" font-size="13" text-anchor="middle" font-weight="bold">r*</text>
+          {langevin_svg}
           <polyline points="{curve_path}" fill="none" stroke="#a78bfa" stroke-width="3.5"/>
           <circle cx="{ball_x}" cy="{ball_y_f}" r="14" fill="{nucleus_color}"/>
           {"<polygon points='" + arrow_left_points + "' fill='" + nucleus_color + "'/>" if is_sub else ""}
@@ -330,6 +376,7 @@ html_fate = f'''
   <div style="margin-top: 12px; display: flex; justify-content: center; gap: 24px; color: #94a3b8; font-size: 13px;">
     <span>ΔG/ΔG* = <strong style="color: #a78bfa;">{deltaG_f / deltaG_star_f:.3f}</strong></span>
     <span>r/r* = <strong style="color: {nucleus_color};">{r_fate / r_star_fate:.2f}</strong></span>
+    {langevin_stats}
   </div>
 </div>
 '''
@@ -360,15 +407,21 @@ $$\gamma_{SL} = \gamma_{SN} + \gamma_{NL} \cos\theta$$
 gamma_sl_slider = mo.ui.slider(start=10, stop=90, step=1, value=50)
 gamma_sn_slider = mo.ui.slider(start=10, stop=90, step=1, value=30)
 gamma_nl_slider = mo.ui.slider(start=10, stop=90, step=1, value=40)
+# Reverse query: the barrier you want → the θ and γ_SN that give it
+target_barrier_slider = mo.ui.slider(start=1, stop=99, step=1, value=25)
 
-mo.vstack([
+tension_controls = [
     mo.md("**Surface Tensions (arbitrary units):**"),
     mo.hstack([
         mo.vstack([mo.md("$\\\\gamma_{SL}$ (Solid-Liquid)"), gamma_sl_slider]),
         mo.vstack([mo.md("$\\\\gamma_{SN}$ (Solid-Nucleus)"), gamma_sn_slider]),
         mo.vstack([mo.md("$\\\\gamma_{NL}$ (Nucleus-Liquid)"), gamma_nl_slider]),
-    ], justify="start", gap=2)
-])
+    ], justify="start", gap=2),
+]
+if physics is not None:
+    tension_controls.append(
+        mo.vstack([mo.md("**Target barrier** $\\\\Delta G^*_{het} / \\\\Delta G^*_{hom}$ (%)"), target_barrier_slider]))
+mo.vstack(tension_controls)
 
 
 # ======================= CELL 12: SURFACE TENSION VISUALIZATION =======================
@@ -376,15 +429,40 @@ gamma_sl = gamma_sl_slider.value
 gamma_sn = gamma_sn_slider.value
 gamma_nl = gamma_nl_slider.value
 
-cos_theta_y = (gamma_sl - gamma_sn) / gamma_nl
-cos_theta_y = max(-1, min(1, cos_theta_y))
+raw_cos_y = (gamma_sl - gamma_sn) / gamma_nl
+cos_theta_y = max(-1, min(1, raw_cos_y))
 
 theta_rad_y = math.acos(cos_theta_y)
 theta_deg_y = theta_rad_y * 180 / math.pi
 
 S_y = ((2 + cos_theta_y) * (1 - cos_theta_y)**2) / 4
 
-if theta_deg_y < 30:
+# Reverse query: θ with S(θ) = target, and the γ_SN that gives it for these γ_SL, γ_NL
+target_html = ""
+if physics is not None:
+    target_S = target_barrier_slider.value / 100
+    theta_target = float(physics.theta_from_S(target_S))
+    gamma_sn_target = float(physics.young_gamma_sn(theta_target, gamma_sl, gamma_nl))
+    if gamma_sn_target < 0:
+        target_note = "needs γ<sub>SN</sub> &lt; 0: raise γ<sub>SL</sub> or lower γ<sub>NL</sub>"
+    else:
+        target_note = f"currently {gamma_sn}, change by {gamma_sn_target - gamma_sn:+.1f}"
+    target_html = f'''
+  <div style="margin-top: 12px; padding: 12px 16px; background: #1e293b; border-radius: 8px; font-size: 13px; color: #94a3b8; text-align: center;">
+    To cut the barrier to <span style="color: #ec4899; font-weight: bold;">{target_S*100:.0f}%</span>
+    you need <span style="color: #64ff96; font-weight: bold;">θ = {theta_target:.1f}°</span>,
+    i.e. <span style="color: #e2e8f0; font-weight: bold;">γ<sub>SN</sub> = {gamma_sn_target:.1f}</span>
+    for γ<sub>SL</sub> = {gamma_sl}, γ<sub>NL</sub> = {gamma_nl} &mdash; {target_note}
+  </div>'''
+
+# The regimes of physics.WETTING_REGIMES (never "invalid": the sliders start at 10)
+if raw_cos_y >= 1:
+    wetting = "Complete"
+    wetting_color = "#22c55e"
+elif raw_cos_y <= -1:
+    wetting = "None (dewets)"
+    wetting_color = "#f87171"
+elif theta_deg_y < 30:
     wetting = "Excellent"
     wetting_color = "#22c55e"
 elif theta_deg_y < 60:
@@ -509,7 +587,7 @@ html_tension = f'''
       <div style="color: #94a3b8; font-size: 12px;">Barrier Reduction</div>
       <div style="color: #ec4899; font-size: 20px; font-weight: bold;">{S_y*100:.1f}%</div>
     </div>
-  </div>
+  </div>{target_html}
 </div>
 '''
 mo.Html(html_tension)
@@ -715,7 +793,7 @@ def draw_step1_geometry(theta_deg):
                                    facecolor=(30/255, 50/255, 80/255), edgecolor=YELLOW, linewidth=2)
     ax_explain.add_patch(rect_box)
     ax_explain.text(10, 22, f'Current values (θ = {theta_deg:.0f}°):', fontsize=10, color=YELLOW, fontweight='bold')
-    ax_explain.text(10, 12, f'h = {(1-cos_t):.3f}R  |  a = {abs(sin_t):.3f}R', fontsize=10, color=WHITE)
+    ax_explain.text(10, 12, f'h = {h/R:.3f}R  |  a = {a/R:.3f}R', fontsize=10, color=WHITE)
     
     fig.suptitle('Step 1: Spherical Cap Geometry', fontsize=16, color=YELLOW, fontweight='bold', y=0.98)
     plt.tight_layout()
@@ -1062,20 +1140,84 @@ theta_slider = mo.ui.slider(
     label="Contact Angle θ (degrees)",
     full_width=True
 )
-theta_slider
-
-
-# ======================= CELL 27: THE WORKING 3-PANEL VISUALIZATION =======================
-def _():
+substrate_choice = mo.ui.dropdown(
+    options=["Flat", "Particle (convex)", "Cavity (concave)"],
+    value="Flat",
+    label="Substrate"
+)
+substrate_radius_slider = mo.ui.slider(
+    start=0.2,
+    stop=20,
+    step=0.1,
+    value=3,
+    label="Substrate radius R / r*"
+)
+site_select = mo.ui.multiselect(
+    options={"Grain boundary": "grain_boundary",
+             "Triple junction": "triple_junction",
+             "Grain corner": "grain_corner"},
+    label="Overlay nucleation sites (θ = half dihedral angle)"
+)
+facet_choice = mo.ui.dropdown(
+    options=["Spherical cap", "cube", "octahedron", "cuboctahedron", "rhombic"],
+    value="Spherical cap",
+    label="Nucleus shape (flat substrate)"
+)
+line_tension_slider = mo.ui.slider(
+    start=-0.3,
+    stop=0.3,
+    step=0.01,
+    value=0,
+    label="Line tension κ = τ / (γ_NL r*)"
+)
+energy_sd_slider = mo.ui.slider(
+    start=0,
+    stop=0.2,
+    step=0.01,
+    value=0,
+    label="Surface-energy uncertainty σ / γ_NL"
+)
+# The overlays need the sibling modules; at their defaults the panels are the classical ones
+mo.vstack([theta_slider] + ([
+    mo.hstack([substrate_choice, substrate_radius_slider], justify="start"),
+    mo.hstack([facet_choice, site_select], justify="start"),
+    mo.hstack([line_tension_slider, energy_sd_slider], justify="start"),
+] if overlays is not None else []))
+
+
+# ======================= CELL 27: 3-PANEL RENDER CONTEXT =======================
+# Everything the 3-panel frame needs that does not depend on θ lives here, so a
+# slider tick only re-runs the small drawing cell below.
+def _make_render_context():
     import math
     from PIL import Image, ImageDraw, ImageFont
     import matplotlib.pyplot as plt
     import matplotlib
     matplotlib.use('Agg')
+    from matplotlib.font_manager import FontProperties
+    from matplotlib.mathtext import MathTextParser
     import io
-    import base64
+    import os
+    import hashlib
+    import functools
     import numpy as np
 
+    # The kernels of physics.py, kept inline so the notebook runs on its own;
+    # half-angle forms, so the frames match generate_gifs.py pixel for pixel.
+    def S(theta_deg):
+        s2 = np.sin(np.radians(np.asarray(theta_deg, dtype=float)) / 2) ** 2
+        return (s2 * s2 * (3 - 2 * s2))[()]
+
+    def h_over_R(theta_deg):
+        return (2 * np.sin(np.radians(np.asarray(theta_deg, dtype=float)) / 2) ** 2)[()]
+
+    def a_over_R(theta_deg):
+        return np.sin(np.radians(np.asarray(theta_deg, dtype=float)))[()]
+
+    def dG_het(r, s=1.0):
+        r = np.asarray(r, dtype=float)
+        return np.where(r > 0, s * (3 * r**2 - 2 * r**3), 0.0)[()]
+
     WIDTH = 1100
     HEIGHT = 500
 
@@ -1097,11 +1239,34 @@ def _():
     LIGHT_GRAY = (120, 120, 130)
     BLACK = (0, 0, 0)
 
-    plt.rcParams['mathtext.fontset'] = 'stix'
-    plt.rcParams['font.family'] = 'STIXGeneral'
-
-    def render_latex(latex_str, fontsize=12, color='white'):
-        fig, ax = plt.subplots(figsize=(4, 0.5), dpi=100)
+    FONT_DIR = "/usr/share/fonts/truetype/dejavu"
+
+    # Rendered labels are cached on disk (shared with generate_gifs.py), keyed by
+    # everything that affects the pixels. Set LABEL_CACHE_DIR to '' to disable.
+    LABEL_CACHE_VERSION = 1
+    LABEL_CACHE_DIR = os.environ.get(
+        'LABEL_CACHE_DIR',
+        os.path.join(os.environ.get('XDG_CACHE_HOME', os.path.expanduser('~/.cache')),
+                     'heterogeneous-nucleation', 'latex'))
+
+    def label_cache_path(latex_str, fontsize, color, dpi):
+        if not LABEL_CACHE_DIR:
+            return None
+        key = repr((LABEL_CACHE_VERSION, latex_str, fontsize, color, dpi, matplotlib.__version__,
+                    plt.rcParams['mathtext.fontset'], plt.rcParams['font.family']))
+        digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return os.path.join(LABEL_CACHE_DIR, digest[:2], digest + '.png')
+
+    def render_latex(latex_str, fontsize=12, color='white', dpi=100):
+        cache_path = label_cache_path(latex_str, fontsize, color, dpi)
+        if cache_path and os.path.exists(cache_path):
+            try:
+                img = Image.open(cache_path)
+                img.load()
+                return img
+            except OSError:
+                pass
+        fig, ax = plt.subplots(figsize=(4, 0.5), dpi=dpi)
         fig.patch.set_alpha(0)
         ax.axis('off')
         ax.set_xlim(0, 1)
@@ -1110,13 +1275,21 @@ def _():
                        ha='left', va='center', transform=ax.transAxes)
         buf = io.BytesIO()
         fig.savefig(buf, format='png', transparent=True, bbox_inches='tight', 
-                    pad_inches=0.01, dpi=100)
+                    pad_inches=0.01, dpi=dpi)
         plt.close(fig)
         buf.seek(0)
         img = Image.open(buf).convert('RGBA')
         bbox = img.getbbox()
         if bbox:
             img = img.crop(bbox)
+        if cache_path:
+            try:
+                os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+                tmp = f"{cache_path}.{os.getpid()}.tmp"
+                img.save(tmp, format='PNG')
+                os.replace(tmp, cache_path)
+            except OSError:
+                pass  # read-only filesystem (e.g. WASM): caching is best effort
         return img
 
     def get_latex_labels():
@@ -1134,15 +1307,64 @@ def _():
         labels['gamma_sn_leg'] = render_latex(r'$\gamma_{SN}$', fontsize=10, color='white')
         labels['gamma_sl_leg'] = render_latex(r'$\gamma_{SL}$', fontsize=10, color='white')
         labels['gamma_nl_leg'] = render_latex(r'$\gamma_{NL}$', fontsize=10, color='#FFD700')
+        labels['pct_atlas'] = build_pct_label_atlas(fontsize=12, color='#FFB464')
         return labels
 
-    def get_dynamic_label(sf):
-        return render_latex(rf'$\Delta G^*_{{het}} = {sf*100:.1f}\%$ of $\Delta G^*_{{hom}}$', fontsize=12, color='#FFB464')
-
-    def S(theta_deg):
-        theta = math.radians(theta_deg)
-        c = math.cos(theta)
-        return (2 + c) * (1 - c) ** 2 / 4
+    # The per-frame "ΔG*_het = xx.x% of ΔG*_hom" label is assembled from pre-rendered
+    # pieces (static head/tail plus one glyph per digit) so the frame loop never
+    # touches matplotlib. Glyph positions come from mathtext's own layout.
+    PCT_LABEL_HEAD = r'$\Delta G^*_{het} =$'
+    PCT_LABEL_TAIL = r'$\%$ of $\Delta G^*_{hom}$'
+    PCT_LABEL_CHARS = '0123456789.'
+
+    def render_label_piece(tex, fontsize, color, dpi=100):
+        """Render tex, returning (ink image, x offset, y offset) relative to the text origin"""
+        origin_x, origin_y = 20, 60
+        fig = plt.figure(figsize=(6, 1.2), dpi=dpi)
+        fig.patch.set_alpha(0)
+        w, h = fig.canvas.get_width_height()
+        fig.text(origin_x / w, 1 - origin_y / h, tex, fontsize=fontsize, color=color,
+                 ha='left', va='baseline')
+        fig.canvas.draw()
+        img = Image.frombuffer('RGBA', (w, h), bytes(fig.canvas.buffer_rgba()), 'raw', 'RGBA', 0, 1)
+        plt.close(fig)
+        bbox = img.getbbox()
+        return img.crop(bbox), bbox[0] - origin_x, bbox[1] - origin_y
+
+    def build_pct_label_atlas(fontsize=12, color='#FFB464', dpi=100):
+        parser = MathTextParser('path')
+        prop = FontProperties(size=fontsize)
+        advance = {}
+        for c in '0123456789':
+            # Laying out "cc.c%" gives the head width and the digit and dot advances
+            layout = parser.parse(PCT_LABEL_HEAD[:-1] + f' {c}{c}.{c}' + PCT_LABEL_TAIL[1:],
+                                  dpi=dpi, prop=prop)
+            x = [g[-2] for g in layout.glyphs if chr(g[2]) in PCT_LABEL_CHARS + '%'][:5]
+            start = x[0]
+            advance[c] = x[1] - x[0]
+            advance['.'] = x[3] - x[2]
+        pieces = {'head': render_label_piece(PCT_LABEL_HEAD, fontsize, color, dpi),
+                  'tail': render_label_piece(PCT_LABEL_TAIL, fontsize, color, dpi)}
+        for c in PCT_LABEL_CHARS:
+            pieces[c] = render_label_piece(f'${c}$', fontsize, color, dpi)
+        return {'pieces': pieces, 'start': start, 'advance': advance}
+
+    def get_dynamic_label(sf, atlas):
+        placed = [('head', 0)]
+        x = atlas['start']
+        for c in f'{sf*100:.1f}':
+            placed.append((c, int(x)))
+            x += atlas['advance'][c]
+        placed.append(('tail', int(x)))
+        boxes = [(atlas['pieces'][k], dx + atlas['pieces'][k][1], atlas['pieces'][k][2]) for k, dx in placed]
+        left = min(x0 for _, x0, _ in boxes)
+        top = min(y0 for _, _, y0 in boxes)
+        right = max(x0 + piece[0].width for piece, x0, _ in boxes)
+        bottom = max(y0 + piece[0].height for piece, _, y0 in boxes)
+        label = Image.new('RGBA', (right - left, bottom - top), (0, 0, 0, 0))
+        for piece, x0, y0 in boxes:
+            label.alpha_composite(piece[0], (x0 - left, y0 - top))
+        return label
 
     def draw_arrow(draw, x1, y1, x2, y2, color, width=3, arrow_len=10):
         draw.line([(x1, y1), (x2, y2)], fill=color, width=width)
@@ -1170,59 +1392,71 @@ def _():
         w, h = label.size
         draw.rectangle([x - padding, y - padding, x + w + padding, y + h + padding], 
                        fill=bg_color, outline=(60, 80, 110))
-        img.paste(label, (x, y), label)
+        img.alpha_composite(label, (x, y))
 
-    def get_fonts():
+    def get_fonts(font_dir=FONT_DIR):
         try:
-            f_small = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 11)
-            f_normal = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 13)
-            f_medium = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 14)
-            f_large = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 16)
-            f_title = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 18)
-            f_bigtitle = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 22)
+            f_small = ImageFont.truetype(f"{font_dir}/DejaVuSans.ttf", 11)
+            f_normal = ImageFont.truetype(f"{font_dir}/DejaVuSans.ttf", 13)
+            f_medium = ImageFont.truetype(f"{font_dir}/DejaVuSans-Bold.ttf", 14)
+            f_large = ImageFont.truetype(f"{font_dir}/DejaVuSans-Bold.ttf", 16)
+            f_title = ImageFont.truetype(f"{font_dir}/DejaVuSans-Bold.ttf", 18)
+            f_bigtitle = ImageFont.truetype(f"{font_dir}/DejaVuSans-Bold.ttf", 22)
         except:
             f_small = f_normal = f_medium = f_large = f_title = f_bigtitle = ImageFont.load_default()
         return f_small, f_normal, f_medium, f_large, f_title, f_bigtitle
 
     def draw_nucleus(draw, cx, baseY, theta_deg, a=60):
-        theta_rad = math.radians(theta_deg)
-        sin_t = max(math.sin(theta_rad), 0.05)
-        cos_t = math.cos(theta_rad)
+        sin_t = max(a_over_R(theta_deg), 0.05)
         R = a / sin_t
         R = min(R, 400)
-        Cy = baseY + R * cos_t
+        h = R * h_over_R(theta_deg)
+        Cy = baseY - h + R  # apex is h above the substrate, centre R below the apex
         alpha_R = math.atan2(baseY - Cy, a)
         alpha_L = math.atan2(baseY - Cy, -a)
         if alpha_L <= alpha_R:
             span = alpha_R - alpha_L
         else:
             span = alpha_R - (alpha_L - 2*math.pi)
-        arc_pts = []
-        for i in range(61):
-            t = i / 60
-            angle = alpha_R - t * span
-            px = cx + R * math.cos(angle)
-            py = Cy + R * math.sin(angle)
-            if py <= baseY + 1:
-                arc_pts.append((px, py))
+        angles = alpha_R - np.arange(61) / 60 * span
+        arc_x = cx + R * np.cos(angles)
+        arc_y = Cy + R * np.sin(angles)
+        keep = arc_y <= baseY + 1
+        arc_pts = list(zip(arc_x[keep].tolist(), arc_y[keep].tolist()))
         if len(arc_pts) >= 2:
             poly = [(cx - a, baseY)] + arc_pts + [(cx + a, baseY)]
             draw.polygon(poly, fill=NUCLEUS_COLOR, outline=NUCLEUS_OUTLINE)
             draw.line(arc_pts, fill=NUCLEUS_OUTLINE, width=3)
-        h = R * (1 - cos_t)
         return (h, Cy, R)
 
-    def draw_geometry_panel(img, draw, theta_deg, px, py, pw, ph, fonts, labels):
+    # Each panel is split into three layers, drawn in the same order as the
+    # original single-pass panels:
+    #   background - θ-independent content underneath the moving parts
+    #   overlay    - θ-dependent content, redrawn every frame
+    #   foreground - θ-independent content that sits on top of the moving parts
+    # Background and foreground are rasterized once per RenderContext style.
+
+    def draw_geometry_background(img, draw, px, py, pw, ph, fonts, labels, substrate_x=None):
         f_small, f_normal, f_medium, f_large, f_title, f_bigtitle = fonts
         draw.rectangle([px, py, px+pw, py+ph], fill=PANEL_BG, outline=LIGHT_GRAY)
         draw.text((px + pw//2, py + 18), "NUCLEUS GEOMETRY", fill=YELLOW, anchor="mm", font=f_bigtitle)
-        cx = px + pw//2
+        if substrate_x is not None:
+            return  # the curved substrate is drawn with the nucleus
         baseY = py + int(ph * 0.58)
         substrate_top = baseY
         substrate_bottom = baseY + 35
         draw.rectangle([px+5, substrate_top, px+pw-5, substrate_bottom], fill=SUBSTRATE_COLOR)
         for i in range(px, px+pw, 8):
             draw.line([(i, substrate_top), (i+12, substrate_bottom)], fill=SUBSTRATE_HATCH, width=1)
+
+    def draw_geometry_overlay(img, draw, theta_deg, px, py, pw, ph, fonts, labels, substrate_x=None, facets=None):
+        if substrate_x is not None:
+            return overlays.draw_curved_geometry(img, draw, theta_deg, substrate_x, px, py, pw, ph, fonts)
+        if facets is not None:
+            return overlays.draw_faceted_geometry(img, draw, theta_deg, facets, px, py, pw, ph, fonts)
+        f_small, f_normal, f_medium, f_large, f_title, f_bigtitle = fonts
+        cx = px + pw//2
+        baseY = py + int(ph * 0.58)
         a = 55
         h, Cy, R = draw_nucleus(draw, cx, baseY, theta_deg, a)
         theta_rad = math.radians(theta_deg)
@@ -1273,8 +1507,6 @@ def _():
         img.paste(gamma_sn, (int(tpX - L - gamma_sn.width//2 - 5), int(tpY - 30)), gamma_sn)
         img.paste(gamma_sl, (int(tpX + L + 5), int(tpY - 30)), gamma_sl)
         img.paste(gamma_nl, (int(nlX - gamma_nl.width - 5), int(nlY - 20)), gamma_nl)
-        draw.text((cx, substrate_bottom - 12), "Substrate", fill=WHITE, anchor="mm", font=f_small)
-        draw.text((px + 12, py + 42), "Liquid", fill=WHITE, font=f_normal)
         if h > 20:
             draw.text((cx, baseY - min(h*0.5, 50)), "Nucleus", fill=WHITE, anchor="mm", font=f_normal)
         sf = S(theta_deg)
@@ -1293,31 +1525,31 @@ def _():
         else:
             wetting, wcolor = "Non-wetting", RED
         draw.text((px + 12, py + 108), wetting, fill=wcolor, font=f_small)
+
+    def draw_geometry_foreground(img, draw, px, py, pw, ph, fonts, labels, substrate_x=None):
+        f_small, f_normal, f_medium, f_large, f_title, f_bigtitle = fonts
+        cx = px + pw//2
+        substrate_bottom = py + int(ph * 0.58) + 35
+        if substrate_x is None:
+            draw.text((cx, substrate_bottom - 12), "Substrate", fill=WHITE, anchor="mm", font=f_small)
+        draw.text((px + 12, py + 42), "Liquid", fill=WHITE, font=f_normal)
         ly = py + ph - 55
         legend_box = [px + 5, ly - 2, px + 160, ly + 48]
         draw.rectangle(legend_box, fill=(45, 65, 95), outline=(80, 100, 130))
         draw.line([(px + 10, ly + 8), (px + 28, ly + 8)], fill=BLACK, width=3)
-        gamma_sn_leg = labels['gamma_sn_leg']
-        img.paste(gamma_sn_leg, (px + 30, ly + 2), gamma_sn_leg)
+        img.alpha_composite(labels['gamma_sn_leg'], (px + 30, ly + 2))
         draw.text((px + 58, ly + 8), "Solid-Nucl", fill=WHITE, anchor="lm", font=f_small)
         draw.line([(px + 10, ly + 22), (px + 28, ly + 22)], fill=WHITE, width=3)
-        gamma_sl_leg = labels['gamma_sl_leg']
-        img.paste(gamma_sl_leg, (px + 30, ly + 16), gamma_sl_leg)
+        img.alpha_composite(labels['gamma_sl_leg'], (px + 30, ly + 16))
         draw.text((px + 58, ly + 22), "Solid-Liq", fill=WHITE, anchor="lm", font=f_small)
         draw.line([(px + 10, ly + 36), (px + 28, ly + 36)], fill=GOLD, width=3)
-        gamma_nl_leg = labels['gamma_nl_leg']
-        img.paste(gamma_nl_leg, (px + 30, ly + 30), gamma_nl_leg)
+        img.alpha_composite(labels['gamma_nl_leg'], (px + 30, ly + 30))
         draw.text((px + 58, ly + 36), "Nucl-Liq", fill=GOLD, anchor="lm", font=f_small)
         draw.text((px + pw - 60, ly + 6), "Young's equation:", fill=GRAY, anchor="rt", font=f_small)
         young = labels['young_eq']
         paste_with_background(img, young, px + pw - young.width - 55, ly + 18, bg_color=(35, 50, 75))
 
-    def draw_shape_factor_panel(img, draw, theta_deg, px, py, pw, ph, fonts, labels):
-        f_small, f_normal, f_medium, f_large, f_title, f_bigtitle = fonts
-        draw.rectangle([px, py, px+pw, py+ph], fill=PANEL_BG, outline=LIGHT_GRAY)
-        draw.text((px + pw//2, py + 18), "SHAPE FACTOR S(θ)", fill=YELLOW, anchor="mm", font=f_bigtitle)
-        sf = S(theta_deg)
-        draw.text((px + pw//2, py + 42), f"S({theta_deg:.0f}°) = {sf:.4f}", fill=CYAN, anchor="mm", font=f_medium)
+    def shape_factor_plot_area(px, py, pw, ph):
         margin = {'l': 55, 'r': 15, 't': 60, 'b': 55}
         plot_x = px + margin['l']
         plot_y = py + margin['t']
@@ -1325,6 +1557,13 @@ def _():
         plot_h = ph - margin['t'] - margin['b']
         def to_x(th): return plot_x + (th / 180) * plot_w
         def to_y(s): return plot_y + plot_h - s * plot_h
+        return plot_x, plot_y, plot_w, plot_h, to_x, to_y
+
+    def draw_shape_factor_background(img, draw, px, py, pw, ph, fonts, labels):
+        f_small, f_normal, f_medium, f_large, f_title, f_bigtitle = fonts
+        draw.rectangle([px, py, px+pw, py+ph], fill=PANEL_BG, outline=LIGHT_GRAY)
+        draw.text((px + pw//2, py + 18), "SHAPE FACTOR S(θ)", fill=YELLOW, anchor="mm", font=f_bigtitle)
+        plot_x, plot_y, plot_w, plot_h, to_x, to_y = shape_factor_plot_area(px, py, pw, ph)
         for s_val in [0.25, 0.5, 0.75]:
             y = to_y(s_val)
             draw.line([(plot_x, y), (plot_x + plot_w, y)], fill=(40, 50, 70), width=1)
@@ -1333,43 +1572,51 @@ def _():
             draw.line([(x, plot_y), (x, plot_y + plot_h)], fill=(40, 50, 70), width=1)
         draw.line([(plot_x, plot_y + plot_h), (plot_x + plot_w, plot_y + plot_h)], fill=WHITE, width=2)
         draw.line([(plot_x, plot_y), (plot_x, plot_y + plot_h)], fill=WHITE, width=2)
-        pts = [(to_x(th), to_y(S(th))) for th in range(0, 181, 2)]
+        th = np.arange(0, 181, 2)
+        pts = list(zip(to_x(th).tolist(), to_y(S(th)).tolist()))
         draw.line(pts, fill=CYAN, width=3)
-        curr_x, curr_y = to_x(theta_deg), to_y(S(theta_deg))
+
+    def draw_shape_factor_overlay(img, draw, theta_deg, px, py, pw, ph, fonts, labels):
+        f_small, f_normal, f_medium, f_large, f_title, f_bigtitle = fonts
+        sf = S(theta_deg)
+        draw.text((px + pw//2, py + 42), f"S({theta_deg:.0f}°) = {sf:.4f}", fill=CYAN, anchor="mm", font=f_medium)
+        plot_x, plot_y, plot_w, plot_h, to_x, to_y = shape_factor_plot_area(px, py, pw, ph)
+        curr_x, curr_y = to_x(theta_deg), to_y(sf)
         draw.ellipse([curr_x-8, curr_y-8, curr_x+8, curr_y+8], fill=GREEN, outline=WHITE, width=2)
         draw_dashed(draw, curr_x, plot_y + plot_h, curr_x, curr_y, GRAY, 4, 3, 1)
         draw_dashed(draw, plot_x, curr_y, curr_x, curr_y, GRAY, 4, 3, 1)
+
+    def draw_shape_factor_foreground(img, draw, px, py, pw, ph, fonts, labels):
+        f_small, f_normal, f_medium, f_large, f_title, f_bigtitle = fonts
+        plot_x, plot_y, plot_w, plot_h, to_x, to_y = shape_factor_plot_area(px, py, pw, ph)
         x_label = labels['x_axis_theta']
-        img.paste(x_label, (plot_x + plot_w//2 - x_label.width//2, plot_y + plot_h + 25), x_label)
+        img.alpha_composite(x_label, (plot_x + plot_w//2 - x_label.width//2, plot_y + plot_h + 25))
         for th_val in [0, 45, 90, 135, 180]:
             x = to_x(th_val)
             draw.text((x, plot_y + plot_h + 14), str(th_val), fill=WHITE, anchor="mm", font=f_normal)
-        y_label = labels['y_axis_s']
-        img.paste(y_label, (px + 5, plot_y - 22), y_label)
+        img.alpha_composite(labels['y_axis_s'], (px + 5, plot_y - 22))
         for s_val in [0, 0.25, 0.5, 0.75, 1.0]:
             y = to_y(s_val)
             draw.text((plot_x - 8, y), f"{s_val:.2f}", fill=WHITE, anchor="rm", font=f_normal)
-        shape_eq = labels['shape_eq']
-        paste_with_background(img, shape_eq, plot_x + 8, plot_y + 8, bg_color=(25, 40, 65))
+        paste_with_background(img, labels['shape_eq'], plot_x + 8, plot_y + 8, bg_color=(25, 40, 65))
 
-    def draw_barrier_panel(img, draw, theta_deg, px, py, pw, ph, fonts, labels):
-        f_small, f_normal, f_medium, f_large, f_title, f_bigtitle = fonts
-        draw.rectangle([px, py, px+pw, py+ph], fill=PANEL_BG, outline=LIGHT_GRAY)
-        draw.text((px + pw//2, py + 18), "NUCLEATION BARRIER ΔG*", fill=YELLOW, anchor="mm", font=f_bigtitle)
-        sf = S(theta_deg)
-        pct_label = get_dynamic_label(sf)
-        img.paste(pct_label, (px + pw//2 - pct_label.width//2, py + 32), pct_label)
+    def barrier_plot_area(px, py, pw, ph):
         margin = {'l': 55, 'r': 15, 't': 60, 'b': 55}
         plot_x = px + margin['l']
         plot_y = py + margin['t']
         plot_w = pw - margin['l'] - margin['r']
         plot_h = ph - margin['t'] - margin['b']
-        def dG(r, s=1): 
-            return s * (3*r**2 - 2*r**3) if r > 0 else 0
         r_max = 1.5
         dg_max = 1.15
         def to_x(r): return plot_x + (r/r_max) * plot_w
-        def to_y(g): return plot_y + (dg_max - max(g, 0)) / dg_max * plot_h
+        def to_y(g): return plot_y + (dg_max - np.maximum(g, 0)) / dg_max * plot_h
+        return plot_x, plot_y, plot_w, plot_h, r_max, dg_max, to_x, to_y
+
+    def draw_barrier_background(img, draw, px, py, pw, ph, fonts, labels):
+        f_small, f_normal, f_medium, f_large, f_title, f_bigtitle = fonts
+        draw.rectangle([px, py, px+pw, py+ph], fill=PANEL_BG, outline=LIGHT_GRAY)
+        draw.text((px + pw//2, py + 18), "NUCLEATION BARRIER ΔG*", fill=YELLOW, anchor="mm", font=f_bigtitle)
+        plot_x, plot_y, plot_w, plot_h, r_max, dg_max, to_x, to_y = barrier_plot_area(px, py, pw, ph)
         zero_y = to_y(0)
         for g_val in [0.25, 0.5, 0.75, 1.0]:
             y = to_y(g_val)
@@ -1379,25 +1626,43 @@ def _():
             draw.line([(x, plot_y), (x, plot_y + plot_h)], fill=(40, 50, 70), width=1)
         draw.line([(plot_x, zero_y), (plot_x + plot_w, zero_y)], fill=WHITE, width=2)
         draw.line([(plot_x, plot_y), (plot_x, plot_y + plot_h)], fill=WHITE, width=2)
+        r = np.arange(101) / 100 * r_max
+        g = dG_het(r, 1.0)
+        xs, ys = to_x(r).tolist(), to_y(g).tolist()
         prev = None
         for i in range(0, 101, 1):
-            r = i/100 * r_max
-            g = dG(r, 1.0)
-            if 0 <= g <= dg_max:
-                pt = (to_x(r), to_y(g))
+            if 0 <= g[i] <= dg_max:
+                pt = (xs[i], ys[i])
                 if prev and i % 3 < 2:
                     draw.line([prev, pt], fill=GRAY, width=2)
                 prev = pt
             else:
                 prev = None
-        het_pts = []
-        for i in range(101):
-            r = i/100 * r_max
-            g = dG(r, sf)
-            if 0 <= g <= dg_max:
-                het_pts.append((to_x(r), to_y(g)))
+
+    def draw_barrier_overlay(img, draw, theta_deg, px, py, pw, ph, fonts, labels, site_names=(), line_tension=None,
+                             energy_sd=None):
+        sf = S(theta_deg)
+        pct_label = get_dynamic_label(sf, labels['pct_atlas'])
+        img.paste(pct_label, (px + pw//2 - pct_label.width//2, py + 32), pct_label)
+        plot_x, plot_y, plot_w, plot_h, r_max, dg_max, to_x, to_y = barrier_plot_area(px, py, pw, ph)
+        zero_y = to_y(0)
+        if energy_sd:
+            overlays.draw_uncertainty_band(img, theta_deg, energy_sd, px, py, pw, ph)
+        r = np.arange(101) / 100 * r_max
+        g = dG_het(r, sf)
+        keep = (g >= 0) & (g <= dg_max)
+        het_pts = list(zip(to_x(r[keep]).tolist(), to_y(g[keep]).tolist()))
         if len(het_pts) >= 2:
             draw.line(het_pts, fill=CYAN, width=3)
+        if site_names:
+            overlays.draw_site_curves(draw, theta_deg, site_names, px, py, pw, ph, fonts)
+        if line_tension is not None:
+            overlays.draw_line_tension_curve(draw, theta_deg, line_tension, px, py, pw, ph, fonts, len(site_names))
+        if energy_sd:
+            offset = (20 * len(site_names) + 6 if site_names else 0) + (46 if line_tension is not None else 0)
+            overlays.draw_uncertainty_legend(draw, theta_deg, energy_sd, px, py, pw, ph, fonts, offset)
+        # the fixed r* guide and homogeneous peak sit above the heterogeneous
+        # curve, so they are redrawn with it
         r_star_x = to_x(1.0)
         hom_peak_y = to_y(1.0)
         het_peak_y = to_y(sf)
@@ -1411,40 +1676,188 @@ def _():
             draw.line([(ax, zero_y-2), (ax, het_peak_y+2)], fill=ORANGE, width=2)
             draw.polygon([(ax, het_peak_y), (ax-4, het_peak_y+8), (ax+4, het_peak_y+8)], fill=ORANGE)
             draw.polygon([(ax, zero_y), (ax-4, zero_y-8), (ax+4, zero_y-8)], fill=ORANGE)
+
+    def draw_barrier_foreground(img, draw, px, py, pw, ph, fonts, labels):
+        f_small, f_normal, f_medium, f_large, f_title, f_bigtitle = fonts
+        plot_x, plot_y, plot_w, plot_h, r_max, dg_max, to_x, to_y = barrier_plot_area(px, py, pw, ph)
+        zero_y = to_y(0)
         lx, ly = plot_x + plot_w - 5, plot_y + 12
         draw.line([(lx-115, ly), (lx-88, ly)], fill=GRAY, width=2)
         draw.text((lx-84, ly), "Homogeneous", fill=WHITE, anchor="lm", font=f_small)
         draw.line([(lx-115, ly+16), (lx-88, ly+16)], fill=CYAN, width=3)
         draw.text((lx-84, ly+16), "Heterogeneous", fill=WHITE, anchor="lm", font=f_small)
         x_label = labels['x_axis_r']
-        img.paste(x_label, (plot_x + plot_w//2 - x_label.width//2, plot_y + plot_h + 25), x_label)
+        img.alpha_composite(x_label, (plot_x + plot_w//2 - x_label.width//2, plot_y + plot_h + 25))
         for r_val in [0, 0.5, 1.0, 1.5]:
             x = to_x(r_val)
             label = "r*" if r_val == 1.0 else f"{r_val:.1f}"
             draw.text((x, zero_y + 14), label, fill=WHITE, anchor="mm", font=f_normal)
-        y_label = labels['y_axis_dg']
-        img.paste(y_label, (px + 2, plot_y - 18), y_label)
+        img.alpha_composite(labels['y_axis_dg'], (px + 2, plot_y - 18))
         for g_val in [0, 0.5, 1.0]:
             y = to_y(g_val)
             draw.text((plot_x - 8, y), f"{g_val:.1f}", fill=WHITE, anchor="rm", font=f_normal)
-        barrier_eq = labels['barrier_eq']
-        paste_with_background(img, barrier_eq, plot_x + 8, plot_y + int(plot_h * 0.25), bg_color=(25, 40, 65))
+        paste_with_background(img, labels['barrier_eq'], plot_x + 8, plot_y + int(plot_h * 0.25), bg_color=(25, 40, 65))
+
+    PANELS = [
+        (draw_geometry_background, draw_geometry_overlay, draw_geometry_foreground),
+        (draw_shape_factor_background, draw_shape_factor_overlay, draw_shape_factor_foreground),
+        (draw_barrier_background, draw_barrier_overlay, draw_barrier_foreground),
+    ]
+
+    def panels_for(substrate_x=None, site_names=(), facets=None, line_tension=None, energy_sd=None):
+        """PANELS, with the geometry panel drawing a curved substrate of radius
+        |substrate_x| r* (a particle if positive, a cavity if negative) or the
+        faceted nucleus of a winterbottom.FACET_SETS name, and the barrier
+        panel overlaying the ΔG(r) curves of ``site_names``, the curve
+        corrected for a reduced line tension κ = ``line_tension`` and the
+        confidence band for surface energies uncertain by ``energy_sd`` γ_NL."""
+        panels = list(PANELS)
+        if substrate_x is not None:
+            panels[0] = tuple(functools.partial(f, substrate_x=substrate_x) for f in PANELS[0])
+        elif facets is not None:
+            background, overlay, foreground = PANELS[0]
+            panels[0] = (background, functools.partial(overlay, facets=facets), foreground)
+        if site_names or line_tension is not None or energy_sd:
+            background, overlay, foreground = PANELS[2]
+            panels[2] = (background, functools.partial(overlay, site_names=tuple(site_names),
+                                                       line_tension=line_tension, energy_sd=energy_sd), foreground)
+        return panels
+
+    class RenderContext:
+        """Kernel-lifetime state for the 3-panel frame.
+
+        Holds the LaTeX labels, fonts, colors, panel geometry and the static
+        background/foreground layers so a slider tick only draws the θ-dependent
+        overlays. Everything is built lazily on first use; ``set_style``
+        rebuilds it only when a style input actually changes, and
+        ``invalidate`` forces a rebuild on the next frame.
+        """
+
+        def __init__(self, width=WIDTH, height=HEIGHT, gap=8,
+                     mathtext_fontset='stix', font_family='STIXGeneral', font_dir=FONT_DIR):
+            self.width = width
+            self.height = height
+            self.gap = gap
+            self.bg_color = BG_COLOR
+            self.style = {'mathtext_fontset': mathtext_fontset,
+                          'font_family': font_family,
+                          'font_dir': font_dir}
+            self._labels = None
+            self._fonts = None
+            self._layers = {}
+
+        def set_style(self, **style):
+            unknown = set(style) - set(self.style)
+            if unknown:
+                raise ValueError(f"Unknown style inputs: {sorted(unknown)}")
+            if any(self.style[k] != v for k, v in style.items()):
+                self.style.update(style)
+                self.invalidate()
+
+        def invalidate(self):
+            self._labels = None
+            self._fonts = None
+            self._layers = {}
+
+        @property
+        def labels(self):
+            if self._labels is None:
+                plt.rcParams['mathtext.fontset'] = self.style['mathtext_fontset']
+                plt.rcParams['font.family'] = self.style['font_family']
+                self._labels = get_latex_labels()
+            return self._labels
+
+        @property
+        def fonts(self):
+            if self._fonts is None:
+                self._fonts = get_fonts(self.style['font_dir'])
+            return self._fonts
+
+        @property
+        def panels(self):
+            """(px, py, pw, ph) for the geometry, shape factor and barrier panels."""
+            gap = self.gap
+            panel_w = (self.width - 4*gap) // 3
+            panel_h = self.height - 2*gap
+            return [(gap*(i + 1) + panel_w*i, gap, panel_w, panel_h) for i in range(3)]
+
+        def static_layers(self, substrate_x=None):
+            """(background, foreground) RGBA layers, rasterized once per style for a
+            flat and once for a curved substrate (the radius is drawn by the overlay)."""
+            key = substrate_x is None
+            if key not in self._layers:
+                fonts, labels = self.fonts, self.labels
+                size = (self.width, self.height)
+                background = Image.new('RGBA', size, self.bg_color + (255,))
+                foreground = Image.new('RGBA', size, (0, 0, 0, 0))
+                bg_draw = ImageDraw.Draw(background)
+                fg_draw = ImageDraw.Draw(foreground)
+                for (draw_bg, _, draw_fg), rect in zip(panels_for(substrate_x), self.panels):
+                    draw_bg(background, bg_draw, *rect, fonts, labels)
+                    draw_fg(foreground, fg_draw, *rect, fonts, labels)
+                self._layers[key] = (background, foreground)
+            return self._layers[key]
+
+        def draw_frame(self, theta_deg, substrate_x=None, site_names=(), facets=None, line_tension=None,
+                       energy_sd=None):
+            background, foreground = self.static_layers(substrate_x)
+            fonts, labels = self.fonts, self.labels
+            img = background.copy()
+            draw = ImageDraw.Draw(img)
+            for (_, draw_overlay, _), rect in zip(panels_for(substrate_x, site_names, facets, line_tension, energy_sd), self.panels):
+                px, py, pw, ph = rect
+                box = (px, py, px + pw + 1, py + ph + 1)
+                # restore this panel's background over anything the previous
+                # panel's overlay spilled into it (e.g. the large cap at θ → 180°)
+                img.paste(background.crop(box), box)
+                draw_overlay(img, draw, theta_deg, *rect, fonts, labels)
+                img.alpha_composite(foreground, (px, py), box)
+            return img.convert('RGB')
+
+    return RenderContext()
+
+render_ctx = _make_render_context()
+
+# Frame-pack mode: if a pack built by `python frame_pack.py` sits next to the
+# notebook, the slider serves pre-encoded frames from a memory map instead of
+# drawing them. Set FRAME_PACK to '' to always draw.
+def _open_frame_pack():
+    import os
+    try:
+        from frame_pack import open_pack, RENDERER
+    except ImportError:
+        return None
+    default = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'frames_3panel.pack')
+    # render_ctx draws the same frames as RENDERER, so only its style has to match
+    return open_pack(os.environ.get('FRAME_PACK', default),
+                     render_ctx.width, render_ctx.height, render_ctx.style, RENDERER)
+
+frame_pack = _open_frame_pack()
+
+
+# ======================= CELL 28: THE WORKING 3-PANEL VISUALIZATION =======================
+def _():
+    import io
+    import base64
 
-    def draw_frame(theta_deg, labels):
-        img = Image.new('RGBA', (WIDTH, HEIGHT), BG_COLOR + (255,))
-        draw = ImageDraw.Draw(img)
-        fonts = get_fonts()
-        gap = 8
-        panel_w = (WIDTH - 4*gap) // 3
-        panel_h = HEIGHT - 2*gap
-        draw_geometry_panel(img, draw, theta_deg, gap, gap, panel_w, panel_h, fonts, labels)
-        draw_shape_factor_panel(img, draw, theta_deg, gap*2 + panel_w, gap, panel_w, panel_h, fonts, labels)
-        draw_barrier_panel(img, draw, theta_deg, gap*3 + panel_w*2, gap, panel_w, panel_h, fonts, labels)
-        return img.convert('RGB')
-
-    labels = get_latex_labels()
     theta = theta_slider.value
-    img = draw_frame(theta, labels)
+    # Fletcher geometry: a sphere of radius R = x r*, negative x for a cavity
+    substrate_x = {"Flat": None,
+                   "Particle (convex)": substrate_radius_slider.value,
+                   "Cavity (concave)": -substrate_radius_slider.value}[substrate_choice.value]
+    site_names = tuple(site_select.value)
+    facets = None if facet_choice.value == "Spherical cap" else facet_choice.value
+    # κ = 0 is the classical barrier: no second curve
+    line_tension = line_tension_slider.value or None
+    # σ = 0: exact energies, no Monte Carlo band
+    energy_sd = energy_sd_slider.value or None
+    if (substrate_x is None and not site_names and facets is None and line_tension is None and energy_sd is None
+            and frame_pack is not None and theta in frame_pack
+            and frame_pack.matches(render_ctx.width, render_ctx.height, render_ctx.style)):
+        img_base64 = base64.b64encode(frame_pack[theta]).decode()
+        return mo.Html(f'<img src="data:{frame_pack.mime};base64,{img_base64}" style="max-width: 100%;">')
+
+    img = render_ctx.draw_frame(theta, substrate_x, site_names, facets, line_tension, energy_sd)
     buffer = io.BytesIO()
     img.save(buffer, format='PNG')
     buffer.seek(0)
@@ -1454,7 +1867,7 @@ def _():
 _()
 
 
-# ======================= CELL 27: KEY TAKEAWAYS =======================
+# ======================= CELL 29: KEY TAKEAWAYS =======================
 mo.md(r"""
 ---
 
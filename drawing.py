@@ -0,0 +1,115 @@
+"""
+Dark-panel palette and PIL drawing helpers shared by the renderers.
+
+generate_gifs.py, ttt.py and overlays.py all use the same colours, fonts,
+dashed/arrow primitives and 3-panel plot areas. This module only imports math, NumPy and
+PIL and does nothing at import time (no output folders, no matplotlib state),
+so a script that just wants the look of the 3-panel figure can import it
+without pulling in the GIF renderer.
+"""
+
+import math
+
+import numpy as np
+from PIL import ImageDraw, ImageFont
+
+# =============================================================================
+# COLORS
+# =============================================================================
+BG_COLOR = (15, 25, 45)
+PANEL_BG = (20, 32, 55)
+SUBSTRATE_COLOR = (70, 100, 140)
+SUBSTRATE_HATCH = (55, 85, 120)
+NUCLEUS_COLOR = (255, 130, 170)
+NUCLEUS_OUTLINE = (255, 80, 130)
+
+WHITE = (255, 255, 255)
+YELLOW = (255, 220, 100)
+ORANGE = (255, 180, 100)
+CYAN = (100, 240, 255)
+GREEN = (100, 255, 150)
+RED = (255, 100, 100)
+GOLD = (255, 215, 0)
+GRAY = (150, 150, 160)
+LIGHT_GRAY = (120, 120, 130)
+BLACK = (0, 0, 0)
+
+FONT_DIR = "/usr/share/fonts/truetype/dejavu"
+
+# =============================================================================
+# HELPER FUNCTIONS
+# =============================================================================
+
+def draw_arrow(draw, x1, y1, x2, y2, color, width=3, arrow_len=10):
+    draw.line([(x1, y1), (x2, y2)], fill=color, width=width)
+    angle = math.atan2(y2 - y1, x2 - x1)
+    al = arrow_len
+    pts = [(x2, y2),
+           (x2 - al*math.cos(angle-0.35), y2 - al*math.sin(angle-0.35)),
+           (x2 - al*math.cos(angle+0.35), y2 - al*math.sin(angle+0.35))]
+    draw.polygon(pts, fill=color)
+
+def draw_dashed(draw, x1, y1, x2, y2, color, dash, gap, width=1):
+    dx, dy = x2 - x1, y2 - y1
+    dist = math.sqrt(dx*dx + dy*dy)
+    if dist < 1:
+        return
+    dx, dy = dx/dist, dy/dist
+    pos = 0
+    while pos < dist:
+        end = min(pos + dash, dist)
+        draw.line([(x1 + dx*pos, y1 + dy*pos), (x1 + dx*end, y1 + dy*end)], fill=color, width=width)
+        pos += dash + gap
+
+def paste_with_background(img, label, x, y, bg_color=(30, 45, 70), padding=4):
+    draw = ImageDraw.Draw(img)
+    w, h = label.size
+    draw.rectangle([x - padding, y - padding, x + w + padding, y + h + padding],
+                   fill=bg_color, outline=(60, 80, 110))
+    # alpha_composite (rather than paste) keeps the label correct on transparent layers
+    img.alpha_composite(label, (x, y))
+
+def get_fonts(font_dir=FONT_DIR):
+    try:
+        f_small = ImageFont.truetype(f"{font_dir}/DejaVuSans.ttf", 11)
+        f_normal = ImageFont.truetype(f"{font_dir}/DejaVuSans.ttf", 13)
+        f_medium = ImageFont.truetype(f"{font_dir}/DejaVuSans-Bold.ttf", 14)
+        f_large = ImageFont.truetype(f"{font_dir}/DejaVuSans-Bold.ttf", 16)
+        f_title = ImageFont.truetype(f"{font_dir}/DejaVuSans-Bold.ttf", 18)
+        f_bigtitle = ImageFont.truetype(f"{font_dir}/DejaVuSans-Bold.ttf", 22)
+    except OSError:
+        f_small = f_normal = f_medium = f_large = f_title = f_bigtitle = ImageFont.load_default()
+    return f_small, f_normal, f_medium, f_large, f_title, f_bigtitle
+
+
+# =============================================================================
+# 3-PANEL LAYOUT
+# =============================================================================
+
+def shape_factor_plot_area(px, py, pw, ph):
+    margin = {'l': 55, 'r': 15, 't': 60, 'b': 55}
+    plot_x = px + margin['l']
+    plot_y = py + margin['t']
+    plot_w = pw - margin['l'] - margin['r']
+    plot_h = ph - margin['t'] - margin['b']
+
+    def to_x(th): return plot_x + (th / 180) * plot_w
+    def to_y(s): return plot_y + plot_h - s * plot_h
+
+    return plot_x, plot_y, plot_w, plot_h, to_x, to_y
+
+
+def barrier_plot_area(px, py, pw, ph):
+    margin = {'l': 55, 'r': 15, 't': 60, 'b': 55}
+    plot_x = px + margin['l']
+    plot_y = py + margin['t']
+    plot_w = pw - margin['l'] - margin['r']
+    plot_h = ph - margin['t'] - margin['b']
+
+    r_max = 1.5
+    dg_max = 1.15
+
+    def to_x(r): return plot_x + (r/r_max) * plot_w
+    def to_y(g): return plot_y + (dg_max - np.maximum(g, 0)) / dg_max * plot_h
+
+    return plot_x, plot_y, plot_w, plot_h, r_max, dg_max, to_x, to_y
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Prebuilt frame pack for the interactive 3-panel view.
+
+The θ slider in app.py only takes integer values 10-170,
+so every possible 3-panel image can be rendered ahead of time. This script
+renders them all (same code as generate_gifs.py) into one file of
+pre-encoded PNG/WebP blobs followed by an offset index. The notebook
+memory-maps the pack and serve the blob for the current θ with no drawing at
+all; the OS page cache backs the pack, so kernel RSS stays flat.
+
+Layout:
+    MAGIC | blob 0 | blob 1 | ... | index (JSON) | index offset, index length (u64, u64) | MAGIC
+
+The JSON index holds the image size, format, the renderer and render style
+that drew the frames and {theta: [offset, length]} for every blob; a reader
+only uses a pack drawn by the renderer and style it would draw itself.
+
+Usage:
+    python frame_pack.py                                # frames_3panel.pack, PNG
+    python frame_pack.py --format webp --workers 4 -o frames_3panel.pack
+"""
+
+import io
+import os
+import json
+import mmap
+import struct
+import argparse
+import multiprocessing
+
+MAGIC = b'NUCPACK1'
+TRAILER = struct.Struct('<QQ')
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'frames_3panel.pack')
+FORMATS = {'png': ('PNG', 'image/png', {}),
+           'webp': ('WEBP', 'image/webp', {'lossless': True, 'method': 4})}
+
+# The renderer that draws the pack; app.py's RenderContext matches it pixel for pixel
+RENDERER = 'generate_gifs.draw_frame'
+
+
+class FramePack:
+    """Read-only, memory-mapped view of a frame pack.
+
+    ``pack[theta]`` is a zero-copy memoryview of the encoded image for that
+    integer θ.
+    """
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        buf = self._mmap
+        tail = len(MAGIC) + TRAILER.size
+        if len(buf) < len(MAGIC) + tail or buf[:len(MAGIC)] != MAGIC or buf[-len(MAGIC):] != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a frame pack")
+        index_offset, index_length = TRAILER.unpack_from(buf, len(buf) - tail)
+        self.meta = json.loads(bytes(buf[index_offset:index_offset + index_length]))
+        self.index = {int(theta): tuple(span) for theta, span in self.meta.pop('frames').items()}
+        self.mime = FORMATS[self.meta['format']][1]
+        self._view = memoryview(buf)
+
+    def __contains__(self, theta):
+        return theta in self.index
+
+    def __len__(self):
+        return len(self.index)
+
+    def __getitem__(self, theta):
+        offset, length = self.index[theta]
+        return self._view[offset:offset + length]
+
+    def matches(self, width, height, style, renderer=RENDERER):
+        """True if the pack was drawn by ``renderer`` at this size and render style."""
+        return ((self.meta['width'], self.meta['height']) == (width, height)
+                and self.meta.get('renderer') == renderer and self.meta['style'] == style)
+
+    def close(self):
+        if getattr(self, '_view', None) is not None:
+            self._view.release()
+            self._view = None
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_pack(path, width, height, style, renderer=RENDERER):
+    """FramePack at ``path`` if it exists and matches the given render, else None."""
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        pack = FramePack(path)
+    except (OSError, ValueError):
+        return None
+    if not pack.matches(width, height, style, renderer):
+        pack.close()
+        return None
+    return pack
+
+
+# =============================================================================
+# BUILD
+# =============================================================================
+
+_worker_state = {}
+
+def _init_worker(fmt):
+    import generate_gifs
+    generate_gifs._init_worker()
+    _worker_state['fmt'] = fmt
+
+def _encode_worker(theta):
+    import generate_gifs
+    state = generate_gifs._worker_state
+    img = generate_gifs.draw_frame(theta, state['labels'], state['fonts'])
+    pil_format, _, params = FORMATS[_worker_state['fmt']]
+    buf = io.BytesIO()
+    img.save(buf, format=pil_format, **params)
+    return theta, buf.getvalue()
+
+
+def render_style():
+    """The style generate_gifs.draw_frame renders with, in RenderContext.style form."""
+    import generate_gifs
+    import drawing
+    return {'mathtext_fontset': generate_gifs.LABEL_STYLE['mathtext.fontset'],
+            'font_family': generate_gifs.LABEL_STYLE['font.family'],
+            'font_dir': drawing.FONT_DIR}
+
+
+def build_pack(path=DEFAULT_PATH, thetas=range(10, 171), fmt='png', workers=1):
+    """Render every θ in ``thetas`` and write the pack to ``path`` atomically."""
+    import generate_gifs
+
+    if fmt not in FORMATS:
+        raise ValueError(f"format must be one of {sorted(FORMATS)}, got {fmt!r}")
+    thetas = list(thetas)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    index = {}
+    try:
+        with open(tmp, 'wb') as f:
+            f.write(MAGIC)
+            if workers <= 1:
+                _init_worker(fmt)
+                blobs = map(_encode_worker, thetas)
+                pool = None
+            else:
+                pool = multiprocessing.Pool(workers, initializer=_init_worker, initargs=(fmt,))
+                blobs = pool.imap(_encode_worker, thetas, chunksize=4)
+            try:
+                for theta, blob in blobs:
+                    index[str(theta)] = [f.tell(), len(blob)]
+                    f.write(blob)
+            finally:
+                if pool is not None:
+                    pool.close()
+                    pool.join()
+            meta = {'width': generate_gifs.WIDTH, 'height': generate_gifs.HEIGHT,
+                    'format': fmt, 'renderer': RENDERER, 'style': render_style(), 'frames': index}
+            index_bytes = json.dumps(meta, separators=(',', ':')).encode('utf-8')
+            index_offset = f.tell()
+            f.write(index_bytes)
+            f.write(TRAILER.pack(index_offset, len(index_bytes)))
+            f.write(MAGIC)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    os.replace(tmp, path)
+    return len(index)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prebuild the 3-panel frame pack")
+    parser.add_argument('--out', '-o', default=DEFAULT_PATH, help=f"pack path (default: {DEFAULT_PATH})")
+    parser.add_argument('--format', choices=sorted(FORMATS), default='png')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="render processes (default: all cores; 1 = serial)")
+    parser.add_argument('--theta-min', type=int, default=10)
+    parser.add_argument('--theta-max', type=int, default=170)
+    args = parser.parse_args()
+
+    n = build_pack(args.out, range(args.theta_min, args.theta_max + 1), args.format, args.workers)
+    print(f"Wrote {n} frames to {args.out} ({os.path.getsize(args.out) / 1e6:.1f} MB)")
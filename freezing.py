@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Freezing curves for a population of sites with a distribution of contact angles.
+
+A real substrate, or a suspension of impurity particles, does not have one
+θ. Each particle (or site) i nucleates at its own rate
+
+    k(θ, T) = A exp(-S(θ) ΔG*_hom(T) / kT)
+
+and the unfrozen fraction of a population with contact-angle density p(θ) is
+
+    isothermal, time t:        P(t) = ∫ p(θ) exp(-k(θ, T) t) dθ
+    cooling at q K/s to T:     P(T) = ∫ p(θ) exp(-∫_T^{T_m} k(θ, T') dT' / q) dθ
+
+The θ integral is a fixed quadrature on a θ grid whose S(θ) table is
+computed once. For a given temperature/time schedule the survival kernel
+E[k, j] = exp(-H(θ_k, j)) is also computed once, so a curve for any
+distribution is just its quadrature weights times E. Many distributions at
+once are a single matrix product, so a fitting loop over thousands of
+candidate curves stays interactive.
+
+Distributions (each returns weights of shape (m, K) for m parameter sets):
+    normal_weights(mean, sd)          truncated to (0°, 180°)
+    lognormal_weights(median, sigma)  ln θ ~ N(ln median, sigma)
+    histogram_weights(edges, counts)  piecewise-constant density
+
+Usage:
+    python freezing.py --mean 60 70 80 --sd 10
+"""
+
+import argparse
+import functools
+from typing import NamedTuple
+
+import numpy as np
+
+import physics
+
+
+class ThetaGrid(NamedTuple):
+    theta: np.ndarray    # (K,) quadrature nodes, degrees
+    weights: np.ndarray  # (K,) trapezoid weights (sum = 180)
+    S: np.ndarray        # (K,) S(θ) table
+
+
+@functools.lru_cache(maxsize=8)
+def theta_grid(points=721):
+    """Uniform θ nodes on [0°, 180°] with trapezoid weights and their S(θ)."""
+    theta = np.linspace(0.0, 180.0, points)
+    weights = np.full(points, 180.0 / (points - 1))
+    weights[[0, -1]] /= 2
+    for a in (theta, weights):
+        a.flags.writeable = False
+    S_table = physics.S(theta)
+    S_table.flags.writeable = False
+    return ThetaGrid(theta, weights, S_table)
+
+
+def _normalize(density, grid):
+    w = density * grid.weights
+    total = w.sum(axis=-1, keepdims=True)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return w / total
+
+
+def normal_weights(mean, sd, grid=None):
+    """Quadrature weights (m, K) of normal θ densities truncated to [0°, 180°].
+
+    An sd much narrower than the grid spacing puts all the weight on the
+    node(s) nearest the mean rather than underflowing to a NaN row.
+    """
+    grid = grid or theta_grid()
+    mean = np.atleast_1d(np.asarray(mean, dtype=float))[:, None]
+    sd = np.atleast_1d(np.asarray(sd, dtype=float))[:, None]
+    if not (sd > 0).all():
+        raise ValueError(f"sd must be positive, got {float(sd.min())}")
+    mean, sd = np.broadcast_arrays(mean, sd)
+    log_density = -0.5 * ((grid.theta - mean) / sd) ** 2
+    log_density -= log_density.max(axis=-1, keepdims=True)
+    return _normalize(np.exp(log_density), grid)
+
+
+def lognormal_weights(median, sigma, grid=None):
+    """Quadrature weights (m, K) of log-normal θ densities (ln θ ~ N(ln median, σ))."""
+    grid = grid or theta_grid()
+    mu = np.log(np.atleast_1d(np.asarray(median, dtype=float)))[:, None]
+    sigma = np.atleast_1d(np.asarray(sigma, dtype=float))[:, None]
+    mu, sigma = np.broadcast_arrays(mu, sigma)
+    theta = np.maximum(grid.theta, 1e-9)
+    density = np.exp(-0.5 * ((np.log(theta) - mu) / sigma) ** 2) / theta
+    density[:, grid.theta <= 0] = 0.0
+    return _normalize(density, grid)
+
+
+def histogram_weights(edges, counts, grid=None):
+    """Quadrature weights (m, K) of piecewise-constant densities.
+
+    ``counts`` is (n_bins,) or (m, n_bins) over the bin ``edges`` (degrees);
+    nodes outside the edges get zero weight.
+    """
+    grid = grid or theta_grid()
+    edges = np.asarray(edges, dtype=float)
+    counts = np.atleast_2d(np.asarray(counts, dtype=float))
+    density = counts / np.diff(edges)
+    b = np.searchsorted(edges, grid.theta, side='right') - 1
+    b[grid.theta == edges[-1]] = edges.size - 2
+    inside = (b >= 0) & (b < edges.size - 1)
+    out = np.zeros((counts.shape[0], grid.theta.size))
+    out[:, inside] = density[:, b[inside]]
+    return _normalize(out, grid)
+
+
+# =============================================================================
+# SURVIVAL KERNELS
+# =============================================================================
+
+def ln_site_rate(T, material, prefactor, grid=None):
+    """ln k(θ_k, T_j) = ln A - S(θ) ΔG*_hom / kT, shape (K, nT)."""
+    grid = grid or theta_grid()
+    T = np.atleast_1d(np.asarray(T, dtype=float))
+    dT = material.T_m - T
+    dGv = np.where(dT > 0, physics.dGv_undercooling(dT, material.L_v, material.T_m), 0.0)
+    with np.errstate(divide='ignore'):
+        barrier_kT = physics.dG_star_hom(material.gamma, dGv) / (physics.K_B * T)
+    with np.errstate(invalid='ignore'):
+        ln_k = np.log(prefactor) - np.multiply.outer(grid.S, barrier_kT)
+    # S = 0 with no undercooling: still no driving force
+    ln_k[np.isnan(ln_k)] = -np.inf
+    return ln_k
+
+
+def isothermal_kernel(t, T, material=physics.MATERIALS['ice'], prefactor=1e10, grid=None):
+    """Survival E[k, j] = exp(-k(θ_k, T) t_j) at one temperature, shape (K, nt)."""
+    ln_k = ln_site_rate(T, material, prefactor, grid)[:, 0]
+    t = np.atleast_1d(np.asarray(t, dtype=float))
+    with np.errstate(over='ignore'):
+        return np.exp(-np.exp(ln_k)[:, None] * t)
+
+
+def cooling_kernel(T, cooling_rate, material=physics.MATERIALS['ice'], prefactor=1e10, grid=None):
+    """Survival E[k, j] after cooling from T_m to T_j at ``cooling_rate`` K/s, shape (K, nT).
+
+    ``T`` must be decreasing. The rate integral uses the trapezoid rule on
+    the T grid, starting from zero rate at T_m.
+    """
+    T = np.atleast_1d(np.asarray(T, dtype=float))
+    T_path = np.concatenate(([material.T_m], T))
+    with np.errstate(over='ignore'):
+        k = np.exp(ln_site_rate(T_path, material, prefactor, grid))
+    k[:, 0] = 0.0
+    dT = -np.diff(T_path)
+    H = np.cumsum((k[:, 1:] + k[:, :-1]) / 2 * dT, axis=1) / cooling_rate
+    return np.exp(-H)
+
+
+def frozen_fraction(weights, kernel):
+    """Fraction frozen for each weight row against a survival kernel: (m, nT)."""
+    return 1.0 - np.atleast_2d(weights) @ kernel
+
+
+def median_temperature(T, frozen):
+    """Temperature at which each curve reaches 50 % frozen (NaN if it never does)."""
+    frozen = np.atleast_2d(frozen)
+    out = np.full(frozen.shape[0], np.nan)
+    for i, f in enumerate(frozen):
+        j = np.searchsorted(f, 0.5)
+        if 0 < j < f.size:
+            out[i] = np.interp(0.5, f[j - 1:j + 1], T[j - 1:j + 1])
+    return out
+
+
+if __name__ == "__main__":
+    import time
+
+    parser = argparse.ArgumentParser(description="Freezing curves for a distribution of contact angles")
+    parser.add_argument('--material', choices=sorted(physics.MATERIALS), default='ice')
+    parser.add_argument('--mean', type=float, nargs='+', default=[50, 60, 70, 80])
+    parser.add_argument('--sd', type=float, nargs='+', default=[10.0])
+    parser.add_argument('--prefactor', type=float, default=1e10, help="per-particle rate prefactor A, 1/s")
+    parser.add_argument('--cooling-rate', type=float, default=1.0, help="K/s (default: %(default)s)")
+    parser.add_argument('--undercooling', type=float, default=60.0, help="deepest ΔT, K (default: %(default)s)")
+    args = parser.parse_args()
+
+    material = physics.MATERIALS[args.material]
+    T = material.T_m - np.linspace(0.1, args.undercooling, 400)
+    kernel = cooling_kernel(T, args.cooling_rate, material, args.prefactor)
+    w = normal_weights(args.mean, args.sd)
+    for mean, sd, T50 in zip(*np.broadcast_arrays(args.mean, args.sd), median_temperature(T, frozen_fraction(w, kernel))):
+        if np.isnan(T50):
+            print(f"θ ~ N({mean:g}°, {sd:g}°): under 50 % frozen by ΔT = {args.undercooling:g} K")
+        else:
+            print(f"θ ~ N({mean:g}°, {sd:g}°): 50 % frozen at {T50:.2f} K (ΔT = {material.T_m - T50:.2f} K)")
+
+    # fitting-loop throughput: many candidate distributions against one kernel
+    means, sds = np.meshgrid(np.linspace(30, 120, 100), np.linspace(2, 30, 50))
+    start = time.perf_counter()
+    frozen_fraction(normal_weights(means.ravel(), sds.ravel()), kernel)
+    print(f"{means.size} curves x {T.size} temperatures in {(time.perf_counter() - start) * 1e3:.1f} ms")
@@ -4,50 +4,68 @@ Uses the exact same rendering code as the marimo notebook.
 """
 
 import math
-from PIL import Image, ImageDraw, ImageFont
+import numpy as np
+from PIL import Image, ImageDraw
 import matplotlib.pyplot as plt
 import matplotlib
 matplotlib.use('Agg')
+from matplotlib.font_manager import FontProperties
+from matplotlib.mathtext import MathTextParser
 import io
 import os
+import hashlib
+import argparse
+import functools
+import multiprocessing
 
-# Create assets folder
-os.makedirs('assets', exist_ok=True)
+import sites
+import overlays
+import winterbottom
+from physics import S, dG_het, h_over_R, a_over_R
+from gif_writer import save_gif, quantize, reuse_frames, unique, PUBLISH_MODES
+from drawing import (BG_COLOR, PANEL_BG, SUBSTRATE_COLOR, SUBSTRATE_HATCH, NUCLEUS_COLOR, NUCLEUS_OUTLINE,
+                     WHITE, YELLOW, ORANGE, CYAN, GREEN, RED, GOLD, GRAY, LIGHT_GRAY, BLACK,
+                     draw_arrow, draw_dashed, paste_with_background, get_fonts,
+                     shape_factor_plot_area, barrier_plot_area)
 
-# =============================================================================
-# COLORS (same as notebook)
-# =============================================================================
 WIDTH = 1100
 HEIGHT = 500
 
-BG_COLOR = (15, 25, 45)
-PANEL_BG = (20, 32, 55)
-SUBSTRATE_COLOR = (70, 100, 140)
-SUBSTRATE_HATCH = (55, 85, 120)
-NUCLEUS_COLOR = (255, 130, 170)
-NUCLEUS_OUTLINE = (255, 80, 130)
-
-WHITE = (255, 255, 255)
-YELLOW = (255, 220, 100)
-ORANGE = (255, 180, 100)
-CYAN = (100, 240, 255)
-GREEN = (100, 255, 150)
-RED = (255, 100, 100)
-GOLD = (255, 215, 0)
-GRAY = (150, 150, 160)
-LIGHT_GRAY = (120, 120, 130)
-BLACK = (0, 0, 0)
-
-plt.rcParams['mathtext.fontset'] = 'stix'
-plt.rcParams['font.family'] = 'STIXGeneral'
+# matplotlib style of the LaTeX labels, applied only while they are rendered
+LABEL_STYLE = {'mathtext.fontset': 'stix', 'font.family': 'STIXGeneral'}
+
+# Rendered labels are cached on disk, keyed by everything that affects the pixels.
+# Set LABEL_CACHE_DIR to '' to disable.
+LABEL_CACHE_VERSION = 1
+LABEL_CACHE_DIR = os.environ.get(
+    'LABEL_CACHE_DIR',
+    os.path.join(os.environ.get('XDG_CACHE_HOME', os.path.expanduser('~/.cache')),
+                 'heterogeneous-nucleation', 'latex'))
 
 # =============================================================================
 # HELPER FUNCTIONS (same as notebook)
 # =============================================================================
 
-def render_latex(latex_str, fontsize=12, color='white'):
+def label_cache_path(latex_str, fontsize, color, dpi):
+    """Content-addressed cache file for one rendered label (None if disabled)"""
+    if not LABEL_CACHE_DIR:
+        return None
+    key = repr((LABEL_CACHE_VERSION, latex_str, fontsize, color, dpi, matplotlib.__version__,
+                plt.rcParams['mathtext.fontset'], plt.rcParams['font.family']))
+    digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+    return os.path.join(LABEL_CACHE_DIR, digest[:2], digest + '.png')
+
+def render_latex(latex_str, fontsize=12, color='white', dpi=100):
     """Render LaTeX string to PIL Image with transparent background"""
-    fig, ax = plt.subplots(figsize=(4, 0.5), dpi=100)
+    cache_path = label_cache_path(latex_str, fontsize, color, dpi)
+    if cache_path and os.path.exists(cache_path):
+        try:
+            img = Image.open(cache_path)
+            img.load()
+            return img
+        except OSError:
+            pass  # unreadable entry: re-render and overwrite it
+    fig, ax = plt.subplots(figsize=(4, 0.5), dpi=dpi)
     fig.patch.set_alpha(0)
     ax.axis('off')
     ax.set_xlim(0, 1)
@@ -56,123 +74,154 @@ def render_latex(latex_str, fontsize=12, color='white'):
                    ha='left', va='center', transform=ax.transAxes)
     buf = io.BytesIO()
     fig.savefig(buf, format='png', transparent=True, bbox_inches='tight', 
-                pad_inches=0.01, dpi=100)
+                pad_inches=0.01, dpi=dpi)
     plt.close(fig)
     buf.seek(0)
     img = Image.open(buf).convert('RGBA')
     bbox = img.getbbox()
     if bbox:
         img = img.crop(bbox)
+    if cache_path:
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            tmp = f"{cache_path}.{os.getpid()}.tmp"
+            img.save(tmp, format='PNG')
+            os.replace(tmp, cache_path)
+        except OSError:
+            pass  # read-only or full disk: caching is best effort
     return img
 
 def get_latex_labels():
-    labels = {}
-    labels['gamma_sn'] = render_latex(r'$\gamma_{SN}$', fontsize=14, color='black')
-    labels['gamma_sl'] = render_latex(r'$\gamma_{SL}$', fontsize=14, color='white')
-    labels['gamma_nl'] = render_latex(r'$\gamma_{NL}$', fontsize=14, color='#FFD700')
-    labels['shape_eq'] = render_latex(r'$S(\theta) = \frac{(2+\cos\theta)(1-\cos\theta)^2}{4}$', fontsize=13, color='#64F0FF')
-    labels['barrier_eq'] = render_latex(r'$\Delta G^*_{het} = S(\theta) \cdot \Delta G^*_{hom}$', fontsize=11, color='#FFB464')
-    labels['young_eq'] = render_latex(r'$\gamma_{SL} = \gamma_{SN} + \gamma_{NL}\cos\theta$', fontsize=10, color='white')
-    labels['y_axis_s'] = render_latex(r'$S(\theta)$', fontsize=12, color='#64F0FF')
-    labels['y_axis_dg'] = render_latex(r'$\Delta G / \Delta G^*_{hom}$', fontsize=10, color='#FFB464')
-    labels['x_axis_theta'] = render_latex(r'Contact Angle $\theta$ (degrees)', fontsize=11, color='#64FF96')
-    labels['x_axis_r'] = render_latex(r'Normalized Radius $r/r^*$', fontsize=11, color='white')
-    labels['gamma_sn_leg'] = render_latex(r'$\gamma_{SN}$', fontsize=10, color='white')
-    labels['gamma_sl_leg'] = render_latex(r'$\gamma_{SL}$', fontsize=10, color='white')
-    labels['gamma_nl_leg'] = render_latex(r'$\gamma_{NL}$', fontsize=10, color='#FFD700')
-    return labels
-
-def get_dynamic_label(sf):
-    return render_latex(rf'$\Delta G^*_{{het}} = {sf*100:.1f}\%$ of $\Delta G^*_{{hom}}$', fontsize=12, color='#FFB464')
-
-def S(theta_deg):
-    theta = math.radians(theta_deg)
-    c = math.cos(theta)
-    return (2 + c) * (1 - c) ** 2 / 4
-
-def draw_arrow(draw, x1, y1, x2, y2, color, width=3, arrow_len=10):
-    draw.line([(x1, y1), (x2, y2)], fill=color, width=width)
-    angle = math.atan2(y2 - y1, x2 - x1)
-    al = arrow_len
-    pts = [(x2, y2),
-           (x2 - al*math.cos(angle-0.35), y2 - al*math.sin(angle-0.35)),
-           (x2 - al*math.cos(angle+0.35), y2 - al*math.sin(angle+0.35))]
-    draw.polygon(pts, fill=color)
-
-def draw_dashed(draw, x1, y1, x2, y2, color, dash, gap, width=1):
-    dx, dy = x2 - x1, y2 - y1
-    dist = math.sqrt(dx*dx + dy*dy)
-    if dist < 1:
-        return
-    dx, dy = dx/dist, dy/dist
-    pos = 0
-    while pos < dist:
-        end = min(pos + dash, dist)
-        draw.line([(x1 + dx*pos, y1 + dy*pos), (x1 + dx*end, y1 + dy*end)], fill=color, width=width)
-        pos += dash + gap
-
-def paste_with_background(img, label, x, y, bg_color=(30, 45, 70), padding=4):
-    draw = ImageDraw.Draw(img)
-    w, h = label.size
-    draw.rectangle([x - padding, y - padding, x + w + padding, y + h + padding], 
-                   fill=bg_color, outline=(60, 80, 110))
-    img.paste(label, (x, y), label)
-
-def get_fonts():
-    try:
-        f_small = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 11)
-        f_normal = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 13)
-        f_medium = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 14)
-        f_large = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 16)
-        f_title = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 18)
-        f_bigtitle = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 22)
-    except:
-        f_small = f_normal = f_medium = f_large = f_title = f_bigtitle = ImageFont.load_default()
-    return f_small, f_normal, f_medium, f_large, f_title, f_bigtitle
+    with plt.rc_context(LABEL_STYLE):
+        labels = {}
+        labels['gamma_sn'] = render_latex(r'$\gamma_{SN}$', fontsize=14, color='black')
+        labels['gamma_sl'] = render_latex(r'$\gamma_{SL}$', fontsize=14, color='white')
+        labels['gamma_nl'] = render_latex(r'$\gamma_{NL}$', fontsize=14, color='#FFD700')
+        labels['shape_eq'] = render_latex(r'$S(\theta) = \frac{(2+\cos\theta)(1-\cos\theta)^2}{4}$', fontsize=13, color='#64F0FF')
+        labels['barrier_eq'] = render_latex(r'$\Delta G^*_{het} = S(\theta) \cdot \Delta G^*_{hom}$', fontsize=11, color='#FFB464')
+        labels['young_eq'] = render_latex(r'$\gamma_{SL} = \gamma_{SN} + \gamma_{NL}\cos\theta$', fontsize=10, color='white')
+        labels['y_axis_s'] = render_latex(r'$S(\theta)$', fontsize=12, color='#64F0FF')
+        labels['y_axis_dg'] = render_latex(r'$\Delta G / \Delta G^*_{hom}$', fontsize=10, color='#FFB464')
+        labels['x_axis_theta'] = render_latex(r'Contact Angle $\theta$ (degrees)', fontsize=11, color='#64FF96')
+        labels['x_axis_r'] = render_latex(r'Normalized Radius $r/r^*$', fontsize=11, color='white')
+        labels['gamma_sn_leg'] = render_latex(r'$\gamma_{SN}$', fontsize=10, color='white')
+        labels['gamma_sl_leg'] = render_latex(r'$\gamma_{SL}$', fontsize=10, color='white')
+        labels['gamma_nl_leg'] = render_latex(r'$\gamma_{NL}$', fontsize=10, color='#FFD700')
+        labels['pct_atlas'] = build_pct_label_atlas(fontsize=12, color='#FFB464')
+        return labels
+
+# The per-frame "ΔG*_het = xx.x% of ΔG*_hom" label is assembled from pre-rendered
+# pieces (static head/tail plus one glyph per digit) so the frame loop never
+# touches matplotlib. Glyph positions come from mathtext's own layout.
+PCT_LABEL_HEAD = r'$\Delta G^*_{het} =$'
+PCT_LABEL_TAIL = r'$\%$ of $\Delta G^*_{hom}$'
+PCT_LABEL_CHARS = '0123456789.'
+
+def render_label_piece(tex, fontsize, color, dpi=100):
+    """Render tex, returning (ink image, x offset, y offset) relative to the text origin"""
+    origin_x, origin_y = 20, 60
+    fig = plt.figure(figsize=(6, 1.2), dpi=dpi)
+    fig.patch.set_alpha(0)
+    w, h = fig.canvas.get_width_height()
+    fig.text(origin_x / w, 1 - origin_y / h, tex, fontsize=fontsize, color=color,
+             ha='left', va='baseline')
+    fig.canvas.draw()
+    img = Image.frombuffer('RGBA', (w, h), bytes(fig.canvas.buffer_rgba()), 'raw', 'RGBA', 0, 1)
+    plt.close(fig)
+    bbox = img.getbbox()
+    return img.crop(bbox), bbox[0] - origin_x, bbox[1] - origin_y
+
+def build_pct_label_atlas(fontsize=12, color='#FFB464', dpi=100):
+    parser = MathTextParser('path')
+    prop = FontProperties(size=fontsize)
+    advance = {}
+    for c in '0123456789':
+        # Laying out "cc.c%" gives the head width and the digit and dot advances
+        layout = parser.parse(PCT_LABEL_HEAD[:-1] + f' {c}{c}.{c}' + PCT_LABEL_TAIL[1:],
+                              dpi=dpi, prop=prop)
+        x = [g[-2] for g in layout.glyphs if chr(g[2]) in PCT_LABEL_CHARS + '%'][:5]
+        start = x[0]
+        advance[c] = x[1] - x[0]
+        advance['.'] = x[3] - x[2]
+    pieces = {'head': render_label_piece(PCT_LABEL_HEAD, fontsize, color, dpi),
+              'tail': render_label_piece(PCT_LABEL_TAIL, fontsize, color, dpi)}
+    for c in PCT_LABEL_CHARS:
+        pieces[c] = render_label_piece(f'${c}$', fontsize, color, dpi)
+    return {'pieces': pieces, 'start': start, 'advance': advance}
+
+def get_dynamic_label(sf, atlas):
+    placed = [('head', 0)]
+    x = atlas['start']
+    for c in f'{sf*100:.1f}':
+        placed.append((c, int(x)))
+        x += atlas['advance'][c]
+    placed.append(('tail', int(x)))
+    boxes = [(atlas['pieces'][k], dx + atlas['pieces'][k][1], atlas['pieces'][k][2]) for k, dx in placed]
+    left = min(x0 for _, x0, _ in boxes)
+    top = min(y0 for _, _, y0 in boxes)
+    right = max(x0 + piece[0].width for piece, x0, _ in boxes)
+    bottom = max(y0 + piece[0].height for piece, _, y0 in boxes)
+    label = Image.new('RGBA', (right - left, bottom - top), (0, 0, 0, 0))
+    for piece, x0, y0 in boxes:
+        label.alpha_composite(piece[0], (x0 - left, y0 - top))
+    return label
 
 # =============================================================================
 # PANEL DRAWING FUNCTIONS (same as notebook)
 # =============================================================================
 
 def draw_nucleus(draw, cx, baseY, theta_deg, a=60):
-    theta_rad = math.radians(theta_deg)
-    sin_t = max(math.sin(theta_rad), 0.05)
-    cos_t = math.cos(theta_rad)
+    sin_t = max(a_over_R(theta_deg), 0.05)
     R = a / sin_t
     R = min(R, 400)
-    Cy = baseY + R * cos_t
+    h = R * h_over_R(theta_deg)
+    Cy = baseY - h + R  # apex is h above the substrate, centre R below the apex
     alpha_R = math.atan2(baseY - Cy, a)
     alpha_L = math.atan2(baseY - Cy, -a)
     if alpha_L <= alpha_R:
         span = alpha_R - alpha_L
     else:
         span = alpha_R - (alpha_L - 2*math.pi)
-    arc_pts = []
-    for i in range(61):
-        t = i / 60
-        angle = alpha_R - t * span
-        px = cx + R * math.cos(angle)
-        py = Cy + R * math.sin(angle)
-        if py <= baseY + 1:
-            arc_pts.append((px, py))
+    angles = alpha_R - np.arange(61) / 60 * span
+    arc_x = cx + R * np.cos(angles)
+    arc_y = Cy + R * np.sin(angles)
+    keep = arc_y <= baseY + 1
+    arc_pts = list(zip(arc_x[keep].tolist(), arc_y[keep].tolist()))
     if len(arc_pts) >= 2:
         poly = [(cx - a, baseY)] + arc_pts + [(cx + a, baseY)]
         draw.polygon(poly, fill=NUCLEUS_COLOR, outline=NUCLEUS_OUTLINE)
         draw.line(arc_pts, fill=NUCLEUS_OUTLINE, width=3)
-    h = R * (1 - cos_t)
     return (h, Cy, R)
 
-def draw_geometry_panel(img, draw, theta_deg, px, py, pw, ph, fonts, labels):
+# Each panel is split into three layers, drawn in the same order as the
+# original single-pass panels:
+#   background - θ-independent content underneath the moving parts
+#   overlay    - θ-dependent content, redrawn every frame
+#   foreground - θ-independent content that sits on top of the moving parts
+# Background and foreground are rasterized once by get_static_layers().
+
+def draw_geometry_background(img, draw, px, py, pw, ph, fonts, labels, substrate_x=None):
     f_small, f_normal, f_medium, f_large, f_title, f_bigtitle = fonts
     draw.rectangle([px, py, px+pw, py+ph], fill=PANEL_BG, outline=LIGHT_GRAY)
     draw.text((px + pw//2, py + 18), "NUCLEUS GEOMETRY", fill=YELLOW, anchor="mm", font=f_bigtitle)
-    cx = px + pw//2
+    if substrate_x is not None:
+        return  # the curved substrate is drawn with the nucleus
     baseY = py + int(ph * 0.58)
     substrate_top = baseY
     substrate_bottom = baseY + 35
     draw.rectangle([px+5, substrate_top, px+pw-5, substrate_bottom], fill=SUBSTRATE_COLOR)
     for i in range(px, px+pw, 8):
         draw.line([(i, substrate_top), (i+12, substrate_bottom)], fill=SUBSTRATE_HATCH, width=1)
+
+
+def draw_geometry_overlay(img, draw, theta_deg, px, py, pw, ph, fonts, labels, substrate_x=None, facets=None):
+    if substrate_x is not None:
+        return overlays.draw_curved_geometry(img, draw, theta_deg, substrate_x, px, py, pw, ph, fonts)
+    if facets is not None:
+        return overlays.draw_faceted_geometry(img, draw, theta_deg, facets, px, py, pw, ph, fonts)
+    f_small, f_normal, f_medium, f_large, f_title, f_bigtitle = fonts
+    cx = px + pw//2
+    baseY = py + int(ph * 0.58)
     a = 55
     h, Cy, R = draw_nucleus(draw, cx, baseY, theta_deg, a)
     theta_rad = math.radians(theta_deg)
@@ -235,9 +284,6 @@ def draw_geometry_panel(img, draw, theta_deg, px, py, pw, ph, fonts, labels):
     img.paste(gamma_sl, (int(tpX + L + 5), int(tpY - 30)), gamma_sl)
     img.paste(gamma_nl, (int(nlX - gamma_nl.width - 5), int(nlY - 20)), gamma_nl)
     
-    # Text labels
-    draw.text((cx, substrate_bottom - 12), "Substrate", fill=WHITE, anchor="mm", font=f_small)
-    draw.text((px + 12, py + 42), "Liquid", fill=WHITE, font=f_normal)
     if h > 20:
         draw.text((cx, baseY - min(h*0.5, 50)), "Nucleus", fill=WHITE, anchor="mm", font=f_normal)
     
@@ -258,6 +304,17 @@ def draw_geometry_panel(img, draw, theta_deg, px, py, pw, ph, fonts, labels):
     else:
         wetting, wcolor = "Non-wetting", RED
     draw.text((px + 12, py + 108), wetting, fill=wcolor, font=f_small)
+
+
+def draw_geometry_foreground(img, draw, px, py, pw, ph, fonts, labels, substrate_x=None):
+    f_small, f_normal, f_medium, f_large, f_title, f_bigtitle = fonts
+    cx = px + pw//2
+    substrate_bottom = py + int(ph * 0.58) + 35
+    
+    # Text labels
+    if substrate_x is None:
+        draw.text((cx, substrate_bottom - 12), "Substrate", fill=WHITE, anchor="mm", font=f_small)
+    draw.text((px + 12, py + 42), "Liquid", fill=WHITE, font=f_normal)
     
     # Legend box
     ly = py + ph - 55
@@ -265,18 +322,15 @@ def draw_geometry_panel(img, draw, theta_deg, px, py, pw, ph, fonts, labels):
     draw.rectangle(legend_box, fill=(45, 65, 95), outline=(80, 100, 130))
     
     draw.line([(px + 10, ly + 8), (px + 28, ly + 8)], fill=BLACK, width=3)
-    gamma_sn_leg = labels['gamma_sn_leg']
-    img.paste(gamma_sn_leg, (px + 30, ly + 2), gamma_sn_leg)
+    img.alpha_composite(labels['gamma_sn_leg'], (px + 30, ly + 2))
     draw.text((px + 58, ly + 8), "Solid-Nucl", fill=WHITE, anchor="lm", font=f_small)
     
     draw.line([(px + 10, ly + 22), (px + 28, ly + 22)], fill=WHITE, width=3)
-    gamma_sl_leg = labels['gamma_sl_leg']
-    img.paste(gamma_sl_leg, (px + 30, ly + 16), gamma_sl_leg)
+    img.alpha_composite(labels['gamma_sl_leg'], (px + 30, ly + 16))
     draw.text((px + 58, ly + 22), "Solid-Liq", fill=WHITE, anchor="lm", font=f_small)
     
     draw.line([(px + 10, ly + 36), (px + 28, ly + 36)], fill=GOLD, width=3)
-    gamma_nl_leg = labels['gamma_nl_leg']
-    img.paste(gamma_nl_leg, (px + 30, ly + 30), gamma_nl_leg)
+    img.alpha_composite(labels['gamma_nl_leg'], (px + 30, ly + 30))
     draw.text((px + 58, ly + 36), "Nucl-Liq", fill=GOLD, anchor="lm", font=f_small)
     
     draw.text((px + pw - 60, ly + 6), "Young's equation:", fill=GRAY, anchor="rt", font=f_small)
@@ -284,22 +338,11 @@ def draw_geometry_panel(img, draw, theta_deg, px, py, pw, ph, fonts, labels):
     paste_with_background(img, young, px + pw - young.width - 55, ly + 18, bg_color=(35, 50, 75))
 
 
-def draw_shape_factor_panel(img, draw, theta_deg, px, py, pw, ph, fonts, labels):
+def draw_shape_factor_background(img, draw, px, py, pw, ph, fonts, labels):
     f_small, f_normal, f_medium, f_large, f_title, f_bigtitle = fonts
     draw.rectangle([px, py, px+pw, py+ph], fill=PANEL_BG, outline=LIGHT_GRAY)
     draw.text((px + pw//2, py + 18), "SHAPE FACTOR S(θ)", fill=YELLOW, anchor="mm", font=f_bigtitle)
-    
-    sf = S(theta_deg)
-    draw.text((px + pw//2, py + 42), f"S({theta_deg:.0f}°) = {sf:.4f}", fill=CYAN, anchor="mm", font=f_medium)
-    
-    margin = {'l': 55, 'r': 15, 't': 60, 'b': 55}
-    plot_x = px + margin['l']
-    plot_y = py + margin['t']
-    plot_w = pw - margin['l'] - margin['r']
-    plot_h = ph - margin['t'] - margin['b']
-    
-    def to_x(th): return plot_x + (th / 180) * plot_w
-    def to_y(s): return plot_y + plot_h - s * plot_h
+    plot_x, plot_y, plot_w, plot_h, to_x, to_y = shape_factor_plot_area(px, py, pw, ph)
     
     # Grid
     for s_val in [0.25, 0.5, 0.75]:
@@ -314,60 +357,52 @@ def draw_shape_factor_panel(img, draw, theta_deg, px, py, pw, ph, fonts, labels)
     draw.line([(plot_x, plot_y), (plot_x, plot_y + plot_h)], fill=WHITE, width=2)
     
     # Curve
-    pts = [(to_x(th), to_y(S(th))) for th in range(0, 181, 2)]
+    th = np.arange(0, 181, 2)
+    pts = list(zip(to_x(th).tolist(), to_y(S(th)).tolist()))
     draw.line(pts, fill=CYAN, width=3)
+
+
+def draw_shape_factor_overlay(img, draw, theta_deg, px, py, pw, ph, fonts, labels):
+    f_small, f_normal, f_medium, f_large, f_title, f_bigtitle = fonts
+    sf = S(theta_deg)
+    draw.text((px + pw//2, py + 42), f"S({theta_deg:.0f}°) = {sf:.4f}", fill=CYAN, anchor="mm", font=f_medium)
+    plot_x, plot_y, plot_w, plot_h, to_x, to_y = shape_factor_plot_area(px, py, pw, ph)
     
     # Current point
-    curr_x, curr_y = to_x(theta_deg), to_y(S(theta_deg))
+    curr_x, curr_y = to_x(theta_deg), to_y(sf)
     draw.ellipse([curr_x-8, curr_y-8, curr_x+8, curr_y+8], fill=GREEN, outline=WHITE, width=2)
     draw_dashed(draw, curr_x, plot_y + plot_h, curr_x, curr_y, GRAY, 4, 3, 1)
     draw_dashed(draw, plot_x, curr_y, curr_x, curr_y, GRAY, 4, 3, 1)
+
+
+def draw_shape_factor_foreground(img, draw, px, py, pw, ph, fonts, labels):
+    f_small, f_normal, f_medium, f_large, f_title, f_bigtitle = fonts
+    plot_x, plot_y, plot_w, plot_h, to_x, to_y = shape_factor_plot_area(px, py, pw, ph)
     
     # X-axis label
     x_label = labels['x_axis_theta']
-    img.paste(x_label, (plot_x + plot_w//2 - x_label.width//2, plot_y + plot_h + 25), x_label)
+    img.alpha_composite(x_label, (plot_x + plot_w//2 - x_label.width//2, plot_y + plot_h + 25))
     
     for th_val in [0, 45, 90, 135, 180]:
         x = to_x(th_val)
         draw.text((x, plot_y + plot_h + 14), str(th_val), fill=WHITE, anchor="mm", font=f_normal)
     
     # Y-axis label
-    y_label = labels['y_axis_s']
-    img.paste(y_label, (px + 5, plot_y - 22), y_label)
+    img.alpha_composite(labels['y_axis_s'], (px + 5, plot_y - 22))
     
     for s_val in [0, 0.25, 0.5, 0.75, 1.0]:
         y = to_y(s_val)
         draw.text((plot_x - 8, y), f"{s_val:.2f}", fill=WHITE, anchor="rm", font=f_normal)
     
     # Equation
-    shape_eq = labels['shape_eq']
-    paste_with_background(img, shape_eq, plot_x + 8, plot_y + 8, bg_color=(25, 40, 65))
+    paste_with_background(img, labels['shape_eq'], plot_x + 8, plot_y + 8, bg_color=(25, 40, 65))
 
 
-def draw_barrier_panel(img, draw, theta_deg, px, py, pw, ph, fonts, labels):
+def draw_barrier_background(img, draw, px, py, pw, ph, fonts, labels):
     f_small, f_normal, f_medium, f_large, f_title, f_bigtitle = fonts
     draw.rectangle([px, py, px+pw, py+ph], fill=PANEL_BG, outline=LIGHT_GRAY)
     draw.text((px + pw//2, py + 18), "NUCLEATION BARRIER ΔG*", fill=YELLOW, anchor="mm", font=f_bigtitle)
-    
-    sf = S(theta_deg)
-    pct_label = get_dynamic_label(sf)
-    img.paste(pct_label, (px + pw//2 - pct_label.width//2, py + 32), pct_label)
-    
-    margin = {'l': 55, 'r': 15, 't': 60, 'b': 55}
-    plot_x = px + margin['l']
-    plot_y = py + margin['t']
-    plot_w = pw - margin['l'] - margin['r']
-    plot_h = ph - margin['t'] - margin['b']
-    
-    def dG(r, s=1): 
-        return s * (3*r**2 - 2*r**3) if r > 0 else 0
-    
-    r_max = 1.5
-    dg_max = 1.15
-    
-    def to_x(r): return plot_x + (r/r_max) * plot_w
-    def to_y(g): return plot_y + (dg_max - max(g, 0)) / dg_max * plot_h
-    
+    plot_x, plot_y, plot_w, plot_h, r_max, dg_max, to_x, to_y = barrier_plot_area(px, py, pw, ph)
     zero_y = to_y(0)
     
     # Grid
@@ -383,29 +418,47 @@ def draw_barrier_panel(img, draw, theta_deg, px, py, pw, ph, fonts, labels):
     draw.line([(plot_x, plot_y), (plot_x, plot_y + plot_h)], fill=WHITE, width=2)
     
     # Homogeneous curve (dashed)
+    r = np.arange(101) / 100 * r_max
+    g = dG_het(r, 1.0)
+    xs, ys = to_x(r).tolist(), to_y(g).tolist()
     prev = None
     for i in range(0, 101, 1):
-        r = i/100 * r_max
-        g = dG(r, 1.0)
-        if 0 <= g <= dg_max:
-            pt = (to_x(r), to_y(g))
+        if 0 <= g[i] <= dg_max:
+            pt = (xs[i], ys[i])
             if prev and i % 3 < 2:
                 draw.line([prev, pt], fill=GRAY, width=2)
             prev = pt
         else:
             prev = None
+
+
+def draw_barrier_overlay(img, draw, theta_deg, px, py, pw, ph, fonts, labels, site_names=(), line_tension=None,
+                         energy_sd=None):
+    sf = S(theta_deg)
+    pct_label = get_dynamic_label(sf, labels['pct_atlas'])
+    img.paste(pct_label, (px + pw//2 - pct_label.width//2, py + 32), pct_label)
+    plot_x, plot_y, plot_w, plot_h, r_max, dg_max, to_x, to_y = barrier_plot_area(px, py, pw, ph)
+    zero_y = to_y(0)
+    if energy_sd:
+        overlays.draw_uncertainty_band(img, theta_deg, energy_sd, px, py, pw, ph)
     
     # Heterogeneous curve
-    het_pts = []
-    for i in range(101):
-        r = i/100 * r_max
-        g = dG(r, sf)
-        if 0 <= g <= dg_max:
-            het_pts.append((to_x(r), to_y(g)))
+    r = np.arange(101) / 100 * r_max
+    g = dG_het(r, sf)
+    keep = (g >= 0) & (g <= dg_max)
+    het_pts = list(zip(to_x(r[keep]).tolist(), to_y(g[keep]).tolist()))
     if len(het_pts) >= 2:
         draw.line(het_pts, fill=CYAN, width=3)
-    
-    # Critical points
+    if site_names:
+        overlays.draw_site_curves(draw, theta_deg, site_names, px, py, pw, ph, fonts)
+    if line_tension is not None:
+        overlays.draw_line_tension_curve(draw, theta_deg, line_tension, px, py, pw, ph, fonts, len(site_names))
+    if energy_sd:
+        offset = (20 * len(site_names) + 6 if site_names else 0) + (46 if line_tension is not None else 0)
+        overlays.draw_uncertainty_legend(draw, theta_deg, energy_sd, px, py, pw, ph, fonts, offset)
+    
+    # Critical points (the fixed r* guide and homogeneous peak sit above
+    # the heterogeneous curve, so they are redrawn with it)
     r_star_x = to_x(1.0)
     hom_peak_y = to_y(1.0)
     het_peak_y = to_y(sf)
@@ -422,6 +475,12 @@ def draw_barrier_panel(img, draw, theta_deg, px, py, pw, ph, fonts, labels):
         draw.line([(ax, zero_y-2), (ax, het_peak_y+2)], fill=ORANGE, width=2)
         draw.polygon([(ax, het_peak_y), (ax-4, het_peak_y+8), (ax+4, het_peak_y+8)], fill=ORANGE)
         draw.polygon([(ax, zero_y), (ax-4, zero_y-8), (ax+4, zero_y-8)], fill=ORANGE)
+
+
+def draw_barrier_foreground(img, draw, px, py, pw, ph, fonts, labels):
+    f_small, f_normal, f_medium, f_large, f_title, f_bigtitle = fonts
+    plot_x, plot_y, plot_w, plot_h, r_max, dg_max, to_x, to_y = barrier_plot_area(px, py, pw, ph)
+    zero_y = to_y(0)
     
     # Legend
     lx, ly = plot_x + plot_w - 5, plot_y + 12
@@ -432,7 +491,7 @@ def draw_barrier_panel(img, draw, theta_deg, px, py, pw, ph, fonts, labels):
     
     # X-axis label
     x_label = labels['x_axis_r']
-    img.paste(x_label, (plot_x + plot_w//2 - x_label.width//2, plot_y + plot_h + 25), x_label)
+    img.alpha_composite(x_label, (plot_x + plot_w//2 - x_label.width//2, plot_y + plot_h + 25))
     
     for r_val in [0, 0.5, 1.0, 1.5]:
         x = to_x(r_val)
@@ -440,74 +499,183 @@ def draw_barrier_panel(img, draw, theta_deg, px, py, pw, ph, fonts, labels):
         draw.text((x, zero_y + 14), label, fill=WHITE, anchor="mm", font=f_normal)
     
     # Y-axis label
-    y_label = labels['y_axis_dg']
-    img.paste(y_label, (px + 2, plot_y - 18), y_label)
+    img.alpha_composite(labels['y_axis_dg'], (px + 2, plot_y - 18))
     
     for g_val in [0, 0.5, 1.0]:
         y = to_y(g_val)
         draw.text((plot_x - 8, y), f"{g_val:.1f}", fill=WHITE, anchor="rm", font=f_normal)
     
     # Equation
-    barrier_eq = labels['barrier_eq']
-    paste_with_background(img, barrier_eq, plot_x + 8, plot_y + int(plot_h * 0.25), bg_color=(25, 40, 65))
+    paste_with_background(img, labels['barrier_eq'], plot_x + 8, plot_y + int(plot_h * 0.25), bg_color=(25, 40, 65))
 
 
-def draw_frame(theta_deg, labels, fonts):
-    img = Image.new('RGBA', (WIDTH, HEIGHT), BG_COLOR + (255,))
-    draw = ImageDraw.Draw(img)
-    
+def panel_layout():
+    """(px, py, pw, ph) for the geometry, shape factor and barrier panels."""
     gap = 8
     panel_w = (WIDTH - 4*gap) // 3
     panel_h = HEIGHT - 2*gap
+    return [(gap*(i + 1) + panel_w*i, gap, panel_w, panel_h) for i in range(3)]
+
+
+PANELS = [
+    (draw_geometry_background, draw_geometry_overlay, draw_geometry_foreground),
+    (draw_shape_factor_background, draw_shape_factor_overlay, draw_shape_factor_foreground),
+    (draw_barrier_background, draw_barrier_overlay, draw_barrier_foreground),
+]
+
+
+def panels_for(substrate_x=None, site_names=(), facets=None, line_tension=None, energy_sd=None):
+    """PANELS, with the geometry panel drawing a curved substrate of radius
+    |substrate_x| r* (a particle if positive, a cavity if negative) or the
+    faceted nucleus of a winterbottom.FACET_SETS name, and the barrier
+    panel overlaying the ΔG(r) curves of ``site_names``, the curve
+    corrected for a reduced line tension κ = ``line_tension`` and the
+    confidence band for surface energies uncertain by ``energy_sd`` γ_NL."""
+    panels = list(PANELS)
+    if substrate_x is not None:
+        panels[0] = tuple(functools.partial(f, substrate_x=substrate_x) for f in PANELS[0])
+    elif facets is not None:
+        background, overlay, foreground = PANELS[0]
+        panels[0] = (background, functools.partial(overlay, facets=facets), foreground)
+    if site_names or line_tension is not None or energy_sd:
+        background, overlay, foreground = PANELS[2]
+        panels[2] = (background, functools.partial(overlay, site_names=tuple(site_names),
+                                                   line_tension=line_tension, energy_sd=energy_sd), foreground)
+    return panels
+
+
+_static_layers = {}
+
+def get_static_layers(labels, fonts, substrate_x=None):
+    """Rasterize the θ-independent background and foreground layers once per (size, style).
+
+    The style is identified by the labels/fonts objects themselves; they are kept
+    alive in the cache entry so their ids cannot be reused by a different style.
+    The layers only tell a flat substrate from a curved one (the radius is drawn
+    by the overlay), so they are keyed on ``substrate_x is None``.
+    """
+    key = (WIDTH, HEIGHT, id(labels), id(fonts), substrate_x is None)
+    if key not in _static_layers:
+        background = Image.new('RGBA', (WIDTH, HEIGHT), BG_COLOR + (255,))
+        foreground = Image.new('RGBA', (WIDTH, HEIGHT), (0, 0, 0, 0))
+        bg_draw = ImageDraw.Draw(background)
+        fg_draw = ImageDraw.Draw(foreground)
+        for (draw_bg, _, draw_fg), rect in zip(panels_for(substrate_x), panel_layout()):
+            draw_bg(background, bg_draw, *rect, fonts, labels)
+            draw_fg(foreground, fg_draw, *rect, fonts, labels)
+        _static_layers[key] = (background, foreground, labels, fonts)
+    background, foreground, _, _ = _static_layers[key]
+    return background, foreground
+
+
+def draw_frame(theta_deg, labels, fonts, substrate_x=None, site_names=(), facets=None, line_tension=None,
+               energy_sd=None):
+    background, foreground = get_static_layers(labels, fonts, substrate_x)
+    img = background.copy()
+    draw = ImageDraw.Draw(img)
     
-    draw_geometry_panel(img, draw, theta_deg, gap, gap, panel_w, panel_h, fonts, labels)
-    draw_shape_factor_panel(img, draw, theta_deg, gap*2 + panel_w, gap, panel_w, panel_h, fonts, labels)
-    draw_barrier_panel(img, draw, theta_deg, gap*3 + panel_w*2, gap, panel_w, panel_h, fonts, labels)
+    for (_, draw_overlay, _), rect in zip(panels_for(substrate_x, site_names, facets, line_tension, energy_sd), panel_layout()):
+        px, py, pw, ph = rect
+        box = (px, py, px + pw + 1, py + ph + 1)
+        # Restore this panel's background over anything the previous panel's
+        # overlay spilled into it (e.g. the large cap at θ → 180°)
+        img.paste(background.crop(box), box)
+        draw_overlay(img, draw, theta_deg, *rect, fonts, labels)
+        img.alpha_composite(foreground, (px, py), box)
     
     return img.convert('RGB')
 
 
+# =============================================================================
+# FRAME RENDERING (serial or process pool)
+# =============================================================================
+
+_worker_state = {}
+
+def _init_worker(substrate_x=None, site_names=(), facets=None, line_tension=None, energy_sd=None):
+    """Build labels and fonts once per worker process."""
+    _worker_state['labels'] = get_latex_labels()
+    _worker_state['fonts'] = get_fonts()
+    _worker_state['options'] = (substrate_x, site_names, facets, line_tension, energy_sd)
+
+def _render_worker(theta):
+    return quantize(draw_frame(theta, _worker_state['labels'], _worker_state['fonts'],
+                               *_worker_state['options']))
+
+def render_frames(angles, workers=1, substrate_x=None, site_names=(), facets=None, line_tension=None,
+                  energy_sd=None):
+    """Yield the palette-quantized draw_frame() for each angle, in order.
+
+    With workers > 1 the frames are rendered by a process pool; each worker
+    builds its own labels, fonts and static layers once. Rendering is
+    deterministic, so the frames (and the encoded GIF) are identical to the
+    serial path.
+    """
+    if workers <= 1:
+        labels = get_latex_labels()
+        fonts = get_fonts()
+        for theta in angles:
+            yield quantize(draw_frame(theta, labels, fonts, substrate_x, site_names, facets, line_tension, energy_sd))
+        return
+    with multiprocessing.Pool(workers, initializer=_init_worker,
+                              initargs=(substrate_x, site_names, facets, line_tension, energy_sd)) as pool:
+        yield from pool.imap(_render_worker, angles, chunksize=4)
+
+
 # =============================================================================
 # MAIN - Generate GIF
 # =============================================================================
 if __name__ == "__main__":
-    print("Generating 3-panel visualization GIF...")
-    print("Pre-rendering LaTeX labels...")
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="render processes (default: all cores; 1 = serial)")
+    parser.add_argument('--output', '-o', action='append', dest='outputs',
+                        help="output GIF path, may be repeated (default: "
+                             "assets/heterogeneous_nucleation.gif and the root copy)")
+    parser.add_argument('--publish', choices=PUBLISH_MODES, default='copy',
+                        help="how the single encode reaches each output (default: copy)")
+    parser.add_argument('--substrate', type=float, default=None, metavar='X',
+                        help="draw a curved substrate of radius |X| r*: a particle if X > 0, "
+                             "a cavity if X < 0 (default: flat)")
+    parser.add_argument('--sites', nargs='+', default=(), choices=list(sites.SITES), metavar='SITE',
+                        help="overlay the barrier curves of these nucleation sites "
+                             f"({', '.join(sites.SITES)})")
+    parser.add_argument('--facets', choices=sorted(winterbottom.FACET_SETS), default=None,
+                        help="draw a faceted (Winterbottom) nucleus instead of the spherical cap")
+    parser.add_argument('--line-tension', type=float, default=None, metavar='KAPPA',
+                        help="overlay the barrier corrected for line tension κ = τ / (γ r*)")
+    parser.add_argument('--energy-sd', type=float, default=None, metavar='SIGMA',
+                        help="overlay the Monte Carlo barrier band for surface energies uncertain by SIGMA γ_NL")
+    args = parser.parse_args()
     
-    labels = get_latex_labels()
-    fonts = get_fonts()
-    
-    frames = []
+    print("Generating 3-panel visualization GIF...")
+    print(f"Pre-rendering LaTeX labels ({args.workers} worker{'s' if args.workers != 1 else ''})...")
     
     # Sweep from 15° to 165° and back
     angles = list(range(15, 166, 2)) + list(range(164, 14, -2))
     
-    print(f"Rendering {len(angles)} frames...")
-    
-    for i, theta in enumerate(angles):
-        if i % 20 == 0:
-            print(f"  Frame {i+1}/{len(angles)} (θ = {theta}°)")
-        frame = draw_frame(theta, labels, fonts)
-        frames.append(frame)
-    
-    print("Saving GIF...")
-    frames[0].save(
-        'assets/heterogeneous_nucleation.gif',
-        save_all=True,
-        append_images=frames[1:],
-        duration=60,  # ms per frame
-        loop=0
-    )
-    
-    # Also save to root for backward compatibility
-    frames[0].save(
-        'heterogeneous_nucleation.gif',
-        save_all=True,
-        append_images=frames[1:],
-        duration=60,
-        loop=0
-    )
+    # Up on odd angles, back on even ones: all 151 angles are distinct, so the
+    # dedup is a no-op here; it only pays off for schedules that repeat angles
+    distinct = unique(angles)
+    print(f"Rendering {len(distinct)} distinct frames, encoding {len(angles)}...")
+    
+    # The root copy is kept for backward compatibility
+    outputs = args.outputs or ['assets/heterogeneous_nucleation.gif',
+                               'heterogeneous_nucleation.gif']
+    
+    def progress(frames):
+        for i, frame in enumerate(frames):
+            if i % 20 == 0:
+                print(f"  Frame {i+1}/{len(angles)} (θ = {angles[i]}°)")
+            yield frame
+    
+    # Frames are streamed into a single encode (60 ms per frame), then published
+    frames = reuse_frames(angles, render_frames(distinct, args.workers, args.substrate,
+                                                   tuple(args.sites), args.facets, args.line_tension,
+                                                   args.energy_sd))
+    save_gif(progress(frames), outputs,
+             duration=60, loop=0, mode=args.publish)
     
     print(f"\nDone! Created:")
-    print(f"  - assets/heterogeneous_nucleation.gif")
-    print(f"  - heterogeneous_nucleation.gif")
+    for path in outputs:
+        print(f"  - {path}")
@@ -6,8 +6,12 @@ With proper axis labels, units, and high-contrast colors
 """
 
 import math
+import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 
+from physics import S, dG_het, h_over_R, a_over_R
+from gif_writer import save_gif, quantize, reuse_frames, unique
+
 WIDTH = 1100
 HEIGHT = 500
 
@@ -31,13 +35,6 @@ GRAY = (150, 150, 160)
 LIGHT_GRAY = (120, 120, 130)
 
 
-def S(theta_deg):
-    """Shape factor S(θ) = (2 + cosθ)(1 - cosθ)² / 4"""
-    theta = math.radians(theta_deg)
-    c = math.cos(theta)
-    return (2 + c) * (1 - c) ** 2 / 4
-
-
 def draw_arrow(draw, x1, y1, x2, y2, color, width=3, arrow_len=10):
     draw.line([(x1, y1), (x2, y2)], fill=color, width=width)
     angle = math.atan2(y2 - y1, x2 - x1)
@@ -76,13 +73,12 @@ def get_fonts():
 
 def draw_nucleus(draw, cx, baseY, theta_deg, a=60):
     """Draw spherical cap nucleus. Returns (height, center_y, R)."""
-    theta_rad = math.radians(theta_deg)
-    sin_t = max(math.sin(theta_rad), 0.05)
-    cos_t = math.cos(theta_rad)
+    sin_t = max(a_over_R(theta_deg), 0.05)
     
     R = a / sin_t
     R = min(R, 400)
-    Cy = baseY + R * cos_t
+    h = R * h_over_R(theta_deg)
+    Cy = baseY - h + R  # apex is h above the substrate, centre R below the apex
     
     alpha_R = math.atan2(baseY - Cy, a)
     alpha_L = math.atan2(baseY - Cy, -a)
@@ -92,14 +88,11 @@ def draw_nucleus(draw, cx, baseY, theta_deg, a=60):
     else:
         span = alpha_R - (alpha_L - 2*math.pi)
     
-    arc_pts = []
-    for i in range(61):
-        t = i / 60
-        angle = alpha_R - t * span
-        px = cx + R * math.cos(angle)
-        py = Cy + R * math.sin(angle)
-        if py <= baseY + 1:
-            arc_pts.append((px, py))
+    angles = alpha_R - np.arange(61) / 60 * span
+    arc_x = cx + R * np.cos(angles)
+    arc_y = Cy + R * np.sin(angles)
+    keep = arc_y <= baseY + 1
+    arc_pts = list(zip(arc_x[keep].tolist(), arc_y[keep].tolist()))
     
     if len(arc_pts) >= 2:
         poly = [(cx - a, baseY)] + arc_pts + [(cx + a, baseY)]
@@ -107,19 +100,17 @@ def draw_nucleus(draw, cx, baseY, theta_deg, a=60):
         if len(arc_pts) >= 2:
             draw.line(arc_pts, fill=NUCLEUS_OUTLINE, width=3)
     
-    h = R * (1 - cos_t)
     return (h, Cy, R)
 
 
-def draw_geometry_panel(draw, theta_deg, px, py, pw, ph, fonts):
-    """Left panel: nucleus geometry with surface tensions"""
+def draw_geometry_background(draw, px, py, pw, ph, fonts):
+    """Left panel, static layer: panel, title and substrate"""
     f_small, f_normal, f_medium, f_large, f_title, f_bigtitle = fonts
     
     # Panel background
     draw.rectangle([px, py, px+pw, py+ph], fill=PANEL_BG, outline=LIGHT_GRAY)
     draw.text((px + pw//2, py + 18), "NUCLEUS GEOMETRY", fill=YELLOW, anchor="mm", font=f_bigtitle)
     
-    cx = px + pw//2
     baseY = py + int(ph * 0.58)  # Position for nucleus
     
     # Substrate - very thin strip (1/4 of previous height)
@@ -128,6 +119,14 @@ def draw_geometry_panel(draw, theta_deg, px, py, pw, ph, fonts):
     draw.rectangle([px+5, substrate_top, px+pw-5, substrate_bottom], fill=SUBSTRATE_COLOR)
     for i in range(px, px+pw, 8):
         draw.line([(i, substrate_top), (i+12, substrate_bottom)], fill=SUBSTRATE_HATCH, width=1)
+
+
+def draw_geometry_overlay(draw, theta_deg, px, py, pw, ph, fonts):
+    """Left panel, moving layer: nucleus, surface tensions and θ readout"""
+    f_small, f_normal, f_medium, f_large, f_title, f_bigtitle = fonts
+    
+    cx = px + pw//2
+    baseY = py + int(ph * 0.58)  # Position for nucleus
     
     # Nucleus
     a = 55
@@ -248,9 +247,7 @@ def draw_geometry_panel(draw, theta_deg, px, py, pw, ph, fonts):
     draw.text((tpX + L + 10, tpY - 24), "γₛₗ", fill=WHITE, font=f_title)
     draw.text((nlX - 36, nlY - 14), "γₙₗ", fill=GOLD, font=f_title)
     
-    # Region labels
-    draw.text((cx, substrate_bottom - 12), "Substrate", fill=WHITE, anchor="mm", font=f_small)
-    draw.text((px + 12, py + 42), "Liquid", fill=WHITE, font=f_normal)
+    # Nucleus label
     if h > 20:
         draw.text((cx, baseY - min(h*0.5, 50)), "Nucleus", fill=WHITE, anchor="mm", font=f_normal)
     
@@ -273,6 +270,18 @@ def draw_geometry_panel(draw, theta_deg, px, py, pw, ph, fonts):
     else:
         wetting, wcolor = "Non-wetting", RED
     draw.text((px + 12, py + 108), wetting, fill=wcolor, font=f_small)
+
+
+def draw_geometry_foreground(draw, px, py, pw, ph, fonts):
+    """Left panel, static layer drawn over the nucleus: region labels and legend"""
+    f_small, f_normal, f_medium, f_large, f_title, f_bigtitle = fonts
+    
+    cx = px + pw//2
+    substrate_bottom = py + int(ph * 0.58) + 35
+    
+    # Region labels
+    draw.text((cx, substrate_bottom - 12), "Substrate", fill=WHITE, anchor="mm", font=f_small)
+    draw.text((px + 12, py + 42), "Liquid", fill=WHITE, font=f_normal)
     
     # Surface tension legend at bottom - with LIGHT BLUE BACKGROUND box
     ly = py + ph - 55
@@ -294,17 +303,7 @@ def draw_geometry_panel(draw, theta_deg, px, py, pw, ph, fonts):
     draw.text((px + pw - 8, ly + 26), "γₛₗ = γₛₙ + γₙₗ·cosθ", fill=WHITE, anchor="rt", font=f_normal)
 
 
-def draw_shape_factor_panel(draw, theta_deg, px, py, pw, ph, fonts):
-    """Middle panel: S(θ) vs θ curve with proper axes"""
-    f_small, f_normal, f_medium, f_large, f_title, f_bigtitle = fonts
-    
-    draw.rectangle([px, py, px+pw, py+ph], fill=PANEL_BG, outline=LIGHT_GRAY)
-    draw.text((px + pw//2, py + 18), "SHAPE FACTOR S(θ)", fill=YELLOW, anchor="mm", font=f_bigtitle)
-    
-    # Current value annotation - TOP CENTER, CYAN to match the curve
-    sf = S(theta_deg)
-    draw.text((px + pw//2, py + 42), f"S({theta_deg:.0f}°) = {sf:.4f}", fill=CYAN, anchor="mm", font=f_medium)
-    
+def shape_factor_plot_area(px, py, pw, ph):
     # Plot area - more space now that equation moves inside
     margin = {'l': 55, 'r': 15, 't': 60, 'b': 55}
     plot_x = px + margin['l']
@@ -315,6 +314,18 @@ def draw_shape_factor_panel(draw, theta_deg, px, py, pw, ph, fonts):
     def to_x(th): return plot_x + (th / 180) * plot_w
     def to_y(s): return plot_y + plot_h - s * plot_h
     
+    return plot_x, plot_y, plot_w, plot_h, to_x, to_y
+
+
+def draw_shape_factor_background(draw, px, py, pw, ph, fonts):
+    """Middle panel, static layer: grid, axes and the full S(θ) curve"""
+    f_small, f_normal, f_medium, f_large, f_title, f_bigtitle = fonts
+    
+    draw.rectangle([px, py, px+pw, py+ph], fill=PANEL_BG, outline=LIGHT_GRAY)
+    draw.text((px + pw//2, py + 18), "SHAPE FACTOR S(θ)", fill=YELLOW, anchor="mm", font=f_bigtitle)
+    
+    plot_x, plot_y, plot_w, plot_h, to_x, to_y = shape_factor_plot_area(px, py, pw, ph)
+    
     # Grid lines
     for s_val in [0.25, 0.5, 0.75]:
         y = to_y(s_val)
@@ -328,16 +339,35 @@ def draw_shape_factor_panel(draw, theta_deg, px, py, pw, ph, fonts):
     draw.line([(plot_x, plot_y), (plot_x, plot_y + plot_h)], fill=WHITE, width=2)
     
     # S(θ) curve - CYAN
-    pts = [(to_x(th), to_y(S(th))) for th in range(0, 181, 2)]
+    th = np.arange(0, 181, 2)
+    pts = list(zip(to_x(th).tolist(), to_y(S(th)).tolist()))
     draw.line(pts, fill=CYAN, width=3)
+
+
+def draw_shape_factor_overlay(draw, theta_deg, px, py, pw, ph, fonts):
+    """Middle panel, moving layer: current S(θ) value and point"""
+    f_small, f_normal, f_medium, f_large, f_title, f_bigtitle = fonts
+    
+    # Current value annotation - TOP CENTER, CYAN to match the curve
+    sf = S(theta_deg)
+    draw.text((px + pw//2, py + 42), f"S({theta_deg:.0f}°) = {sf:.4f}", fill=CYAN, anchor="mm", font=f_medium)
+    
+    plot_x, plot_y, plot_w, plot_h, to_x, to_y = shape_factor_plot_area(px, py, pw, ph)
     
     # Current point - GREEN to match θ color everywhere
-    curr_x, curr_y = to_x(theta_deg), to_y(S(theta_deg))
+    curr_x, curr_y = to_x(theta_deg), to_y(sf)
     draw.ellipse([curr_x-8, curr_y-8, curr_x+8, curr_y+8], fill=GREEN, outline=WHITE, width=2)
     
     # Dashed lines to current point
     draw_dashed(draw, curr_x, plot_y + plot_h, curr_x, curr_y, GRAY, 4, 3, 1)
     draw_dashed(draw, plot_x, curr_y, curr_x, curr_y, GRAY, 4, 3, 1)
+
+
+def draw_shape_factor_foreground(draw, px, py, pw, ph, fonts):
+    """Middle panel, static layer drawn over the current point: labels and equation"""
+    f_small, f_normal, f_medium, f_large, f_title, f_bigtitle = fonts
+    
+    plot_x, plot_y, plot_w, plot_h, to_x, to_y = shape_factor_plot_area(px, py, pw, ph)
     
     # X-axis label - GREEN for θ - LARGER
     draw.text((plot_x + plot_w//2, plot_y + plot_h + 32), "Contact Angle θ (degrees)", 
@@ -362,18 +392,7 @@ def draw_shape_factor_panel(draw, theta_deg, px, py, pw, ph, fonts):
     draw.text((eq_x, eq_y), "S(θ) = (2+cosθ)(1−cosθ)²/4", fill=CYAN, anchor="mm", font=f_normal)
 
 
-def draw_barrier_panel(draw, theta_deg, px, py, pw, ph, fonts):
-    """Right panel: ΔG vs r with barrier comparison"""
-    f_small, f_normal, f_medium, f_large, f_title, f_bigtitle = fonts
-    
-    draw.rectangle([px, py, px+pw, py+ph], fill=PANEL_BG, outline=LIGHT_GRAY)
-    draw.text((px + pw//2, py + 18), "NUCLEATION BARRIER ΔG*", fill=YELLOW, anchor="mm", font=f_bigtitle)
-    
-    sf = S(theta_deg)
-    
-    # Barrier percentage annotation - TOP CENTER, ORANGE for ΔG
-    draw.text((px + pw//2, py + 42), f"ΔG*ₕₑₜ = {sf*100:.1f}% of ΔG*ₕₒₘ", fill=ORANGE, anchor="mm", font=f_medium)
-    
+def barrier_plot_area(px, py, pw, ph):
     # Plot area - more space now that equation moves inside
     margin = {'l': 55, 'r': 15, 't': 60, 'b': 55}
     plot_x = px + margin['l']
@@ -381,16 +400,23 @@ def draw_barrier_panel(draw, theta_deg, px, py, pw, ph, fonts):
     plot_w = pw - margin['l'] - margin['r']
     plot_h = ph - margin['t'] - margin['b']
     
-    def dG(r, s=1): 
-        return s * (3*r**2 - 2*r**3) if r > 0 else 0
-    
     r_max = 1.5
     dg_max = 1.15
-    dg_min = 0
     
     def to_x(r): return plot_x + (r/r_max) * plot_w
-    def to_y(g): return plot_y + (dg_max - max(g, 0)) / dg_max * plot_h
+    def to_y(g): return plot_y + (dg_max - np.maximum(g, 0)) / dg_max * plot_h
     
+    return plot_x, plot_y, plot_w, plot_h, r_max, dg_max, to_x, to_y
+
+
+def draw_barrier_background(draw, px, py, pw, ph, fonts):
+    """Right panel, static layer: grid, axes and the homogeneous curve"""
+    f_small, f_normal, f_medium, f_large, f_title, f_bigtitle = fonts
+    
+    draw.rectangle([px, py, px+pw, py+ph], fill=PANEL_BG, outline=LIGHT_GRAY)
+    draw.text((px + pw//2, py + 18), "NUCLEATION BARRIER ΔG*", fill=YELLOW, anchor="mm", font=f_bigtitle)
+    
+    plot_x, plot_y, plot_w, plot_h, r_max, dg_max, to_x, to_y = barrier_plot_area(px, py, pw, ph)
     zero_y = to_y(0)
     
     # Grid lines
@@ -406,29 +432,42 @@ def draw_barrier_panel(draw, theta_deg, px, py, pw, ph, fonts):
     draw.line([(plot_x, plot_y), (plot_x, plot_y + plot_h)], fill=WHITE, width=2)
     
     # Homogeneous curve (dashed gray) - S=1, only where ΔG >= 0
+    r = np.arange(101) / 100 * r_max
+    g = dG_het(r, 1.0)
+    xs, ys = to_x(r).tolist(), to_y(g).tolist()
     prev = None
     for i in range(0, 101, 1):
-        r = i/100 * r_max
-        g = dG(r, 1.0)
-        if 0 <= g <= dg_max:
-            pt = (to_x(r), to_y(g))
+        if 0 <= g[i] <= dg_max:
+            pt = (xs[i], ys[i])
             if prev and i % 3 < 2:
                 draw.line([prev, pt], fill=GRAY, width=2)
             prev = pt
         else:
             prev = None
+
+
+def draw_barrier_overlay(draw, theta_deg, px, py, pw, ph, fonts):
+    """Right panel, moving layer: heterogeneous curve and barrier markers"""
+    f_small, f_normal, f_medium, f_large, f_title, f_bigtitle = fonts
+    
+    sf = S(theta_deg)
+    
+    # Barrier percentage annotation - TOP CENTER, ORANGE for ΔG
+    draw.text((px + pw//2, py + 42), f"ΔG*ₕₑₜ = {sf*100:.1f}% of ΔG*ₕₒₘ", fill=ORANGE, anchor="mm", font=f_medium)
+    
+    plot_x, plot_y, plot_w, plot_h, r_max, dg_max, to_x, to_y = barrier_plot_area(px, py, pw, ph)
+    zero_y = to_y(0)
     
     # Heterogeneous curve (solid cyan) - current S(θ), only where ΔG >= 0
-    het_pts = []
-    for i in range(101):
-        r = i/100 * r_max
-        g = dG(r, sf)
-        if 0 <= g <= dg_max:
-            het_pts.append((to_x(r), to_y(g)))
+    r = np.arange(101) / 100 * r_max
+    g = dG_het(r, sf)
+    keep = (g >= 0) & (g <= dg_max)
+    het_pts = list(zip(to_x(r[keep]).tolist(), to_y(g[keep]).tolist()))
     if len(het_pts) >= 2:
         draw.line(het_pts, fill=CYAN, width=3)
     
-    # Critical point markers
+    # Critical point markers (the r* guide and homogeneous peak are fixed, but
+    # they sit above the heterogeneous curve so they are redrawn with it)
     r_star_x = to_x(1.0)
     hom_peak_y = to_y(1.0)
     het_peak_y = to_y(sf)
@@ -451,6 +490,14 @@ def draw_barrier_panel(draw, theta_deg, px, py, pw, ph, fonts):
         draw.line([(ax, zero_y-2), (ax, het_peak_y+2)], fill=ORANGE, width=2)
         draw.polygon([(ax, het_peak_y), (ax-4, het_peak_y+8), (ax+4, het_peak_y+8)], fill=ORANGE)
         draw.polygon([(ax, zero_y), (ax-4, zero_y-8), (ax+4, zero_y-8)], fill=ORANGE)
+
+
+def draw_barrier_foreground(draw, px, py, pw, ph, fonts):
+    """Right panel, static layer drawn over the curves: legend, labels and equation"""
+    f_small, f_normal, f_medium, f_large, f_title, f_bigtitle = fonts
+    
+    plot_x, plot_y, plot_w, plot_h, r_max, dg_max, to_x, to_y = barrier_plot_area(px, py, pw, ph)
+    zero_y = to_y(0)
     
     # Legend - spelled out, positioned in top right with enough space
     lx, ly = plot_x + plot_w - 5, plot_y + 12
@@ -483,38 +530,76 @@ def draw_barrier_panel(draw, theta_deg, px, py, pw, ph, fonts):
     draw.text((eq_x, eq_y), "ΔG*ₕₑₜ = S(θ)·ΔG*ₕₒₘ", fill=ORANGE, anchor="mm", font=f_medium)
 
 
-def draw_frame(theta_deg):
-    img = Image.new('RGB', (WIDTH, HEIGHT), BG_COLOR)
-    draw = ImageDraw.Draw(img)
-    fonts = get_fonts()
-    
+# Each panel is split into three layers, drawn in the original panel order:
+# background (static, under the moving parts), overlay (redrawn per frame) and
+# foreground (static, on top of the moving parts).
+PANELS = [
+    (draw_geometry_background, draw_geometry_overlay, draw_geometry_foreground),
+    (draw_shape_factor_background, draw_shape_factor_overlay, draw_shape_factor_foreground),
+    (draw_barrier_background, draw_barrier_overlay, draw_barrier_foreground),
+]
+
+
+def panel_layout():
+    """(px, py, pw, ph) for the geometry, shape factor and barrier panels."""
     gap = 12
     pw = (WIDTH - 4*gap) // 3
     ph = HEIGHT - 2*gap
+    return [(gap*(i + 1) + pw*i, gap, pw, ph) for i in range(3)]
+
+
+_static_layers = {}
+
+
+def get_static_layers():
+    """Fonts plus the θ-independent background and foreground layers, built once per size."""
+    key = (WIDTH, HEIGHT)
+    if key not in _static_layers:
+        fonts = get_fonts()
+        background = Image.new('RGBA', (WIDTH, HEIGHT), BG_COLOR + (255,))
+        foreground = Image.new('RGBA', (WIDTH, HEIGHT), (0, 0, 0, 0))
+        bg_draw = ImageDraw.Draw(background)
+        fg_draw = ImageDraw.Draw(foreground)
+        for (draw_bg, _, draw_fg), rect in zip(PANELS, panel_layout()):
+            draw_bg(bg_draw, *rect, fonts)
+            draw_fg(fg_draw, *rect, fonts)
+        _static_layers[key] = (background, foreground, fonts)
+    return _static_layers[key]
+
+
+def draw_frame(theta_deg):
+    background, foreground, fonts = get_static_layers()
+    img = background.copy()
+    draw = ImageDraw.Draw(img)
     
-    draw_geometry_panel(draw, theta_deg, gap, gap, pw, ph, fonts)
-    draw_shape_factor_panel(draw, theta_deg, 2*gap + pw, gap, pw, ph, fonts)
-    draw_barrier_panel(draw, theta_deg, 3*gap + 2*pw, gap, pw, ph, fonts)
+    for (_, draw_overlay, _), (px, py, pw, ph) in zip(PANELS, panel_layout()):
+        box = (px, py, px + pw + 1, py + ph + 1)
+        # Restore this panel's background over anything the previous panel's
+        # overlay spilled into it (e.g. the large cap at θ → 180°)
+        img.paste(background.crop(box), box)
+        draw_overlay(draw, theta_deg, px, py, pw, ph, fonts)
+        img.alpha_composite(foreground, (px, py), box)
     
-    return img
+    return img.convert('RGB')
 
 
 def main():
-    # Generate preview images
+    # Generate preview images (kept for the GIF, which sweeps through them too)
+    previews = {}
     for th in [20, 60, 90, 120, 160]:
         img = draw_frame(th)
         img.save(f'preview_{th}.png')
         print(f'Saved preview_{th}.png')
+        previews[th] = img
     
-    # Generate GIF
-    frames = []
+    # Generate GIF: each distinct angle is drawn and quantized once, then
+    # reused on the way back down
     angles = list(range(10, 171, 2)) + list(range(170, 9, -2))
-    print(f"Generating {len(angles)} frames...")
-    for theta in angles:
-        frames.append(draw_frame(theta))
-    
-    frames[0].save('heterogeneous_nucleation.gif', save_all=True, 
-                   append_images=frames[1:], duration=50, loop=0)
+    distinct = unique(angles)
+    print(f"Generating {len(distinct)} frames ({len(angles)} in the sweep)...")
+    frames = (quantize(previews.pop(theta, None) or draw_frame(theta)) for theta in distinct)
+    save_gif(reuse_frames(angles, frames), 'heterogeneous_nucleation.gif',
+             duration=50, loop=0)
     print('Saved heterogeneous_nucleation.gif')
 
 
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Streaming animated-GIF writer.
+
+PIL's ``frames[0].save(..., save_all=True, append_images=frames[1:])`` needs
+every frame up front and keeps every quantized frame in memory until the
+file is written. GifWriter takes frames one at a time (e.g. straight from a
+render generator), quantizes each one and appends it to the open file, so
+peak memory is a couple of frames regardless of sweep length.
+
+The per-frame steps follow Pillow's own multi-frame GIF encoder (adaptive
+palette, delta bounding box, transparent fill of unchanged pixels, merging
+of identical consecutive frames), so the bytes match what ``save_all``
+produces for the same frames (checked in test_gif_writer.py). They call
+private GifImagePlugin helpers; on a Pillow without them STREAMING is False
+and GifWriter buffers the frames and hands them to ``save_all`` instead.
+
+save_gif() encodes once into a temporary file and then publishes the result
+to any number of output paths (copy, hardlink or rename), each replaced
+atomically so a reader never sees a half-written GIF.
+
+Usage:
+    with GifWriter('out.gif', duration=60, loop=0) as gif:
+        for frame in frames:
+            gif.append(frame)
+
+    save_gif(frames, ['assets/out.gif', 'out.gif'], duration=60, mode='hardlink')
+
+Sweeps that revisit the same frame (e.g. θ up then back down) can render and
+quantize each distinct frame once:
+
+    keys = list(range(10, 171, 2)) + list(range(170, 9, -2))
+    frames = (quantize(draw_frame(k)) for k in unique(keys))
+    save_gif(reuse_frames(keys, frames), 'out.gif', duration=50)
+"""
+
+import os
+import pickle
+import shutil
+import tempfile
+import zlib
+
+from PIL import Image, ImageChops, GifImagePlugin
+
+PUBLISH_MODES = ("copy", "hardlink", "rename")
+
+# Private encoder steps of GifImagePlugin that GifWriter drives one frame at a time
+_ENCODER_HOOKS = ("_normalize_mode", "_normalize_palette", "_get_global_header", "_write_frame_data")
+STREAMING = all(hasattr(GifImagePlugin, name) for name in _ENCODER_HOOKS)
+
+
+def _changed_mask(delta):
+    """'L' mask that is 255 where ``delta`` is zero (pixel unchanged)."""
+    if delta.mode == "RGBA":
+        r, g, b, a = delta.split()
+        delta = ImageChops.lighter(ImageChops.lighter(r, g), ImageChops.lighter(b, a))
+    elif delta.mode == "P":
+        # Compare raw indices, not palette colours
+        delta = Image.frombytes("L", delta.size, delta.tobytes())
+    return delta.point(lambda v: 0 if v else 255)
+
+
+def quantize(frame):
+    """Palette-quantize ``frame`` exactly as GifWriter.append() would.
+
+    Doing it up front (e.g. in a render worker, or once for a frame that is
+    reused) makes the quantization inside append() a no-op; the GIF bytes are
+    unchanged.
+    """
+    return GifImagePlugin._normalize_mode(frame) if STREAMING else frame
+
+
+def unique(keys):
+    """Distinct keys in order of first appearance."""
+    return list(dict.fromkeys(keys))
+
+
+def reuse_frames(keys, frames):
+    """Expand one frame per distinct key over a schedule where keys repeat.
+
+    ``frames`` must yield a frame for each key of unique(keys), in that order,
+    so it can be a lazy or parallel render. A key must capture everything that
+    affects the frame (θ, plus any style/size state). A frame that is used
+    again later is kept zlib-compressed until its last use: the flat panels
+    compress about 15x, so a palindromic 81-frame sweep holds ~3 MB
+    instead of ~45 MB, for one decompression per repeat.
+    """
+    keys = list(keys)
+    last_use = {key: i for i, key in enumerate(keys)}
+    frames = iter(frames)
+    memo = {}
+    for i, key in enumerate(keys):
+        if key in memo:
+            data = memo.pop(key) if last_use[key] == i else memo[key]
+            yield pickle.loads(zlib.decompress(data))
+            continue
+        frame = next(frames)
+        if last_use[key] > i:
+            memo[key] = zlib.compress(pickle.dumps(frame), 1)
+        yield frame
+
+
+class GifWriter:
+    """Append frames to an animated GIF without buffering the whole sweep.
+
+    One frame is always held back so that a run of identical frames can be
+    collapsed into a single frame with the summed duration before it is
+    written; everything else goes to disk as soon as it arrives.
+    """
+
+    def __init__(self, path, duration=None, loop=0):
+        self.path = path
+        self.duration = duration
+        self.loop = loop
+        self.frame_count = 0
+        self._fp = None
+        self._info = None       # encoder info shared by all frames
+        self._first = None      # original first frame (single-frame fallback)
+        self._previous = None   # last quantized frame, for delta bboxes
+        self._pending = None    # (image, bbox, encoderinfo) not yet written
+        self._frames = None if STREAMING else []   # save_all fallback
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        elif self._fp is not None:
+            self._fp.close()
+
+    def append(self, frame):
+        """Quantize ``frame`` and queue it for writing."""
+        if self._frames is not None:
+            self._frames.append(frame.copy())
+            self.frame_count += 1
+            return
+        if self._fp is None:
+            self._fp = open(self.path, "wb")
+        im = GifImagePlugin._normalize_mode(frame.copy())
+        if self._info is None:
+            self._first = frame.copy()
+            self._info = {"duration": self.duration, "loop": self.loop,
+                          "optimize": True}
+            for k, v in im.info.items():
+                if isinstance(k, str) and k != "transparency":
+                    self._info.setdefault(k, v)
+
+        info = self._info.copy()
+        if "transparency" in im.info:
+            info.setdefault("transparency", im.info["transparency"])
+        im = GifImagePlugin._normalize_palette(im, None, info)
+        self.frame_count += 1
+
+        if self._previous is None:
+            self._previous = im
+            self._pending = (im, None, info)
+            return
+
+        previous = self._previous
+        if bytes(previous.palette.palette) != bytes(im.palette.palette):
+            delta = ImageChops.subtract_modulo(im.convert("RGBA"), previous.convert("RGBA"))
+        else:
+            delta = ImageChops.subtract_modulo(im, previous)
+        bbox = delta.getbbox(alpha_only=False)
+        if not bbox:
+            # Identical to the previous frame: extend its duration instead
+            if info.get("duration"):
+                self._pending[2]["duration"] += info["duration"]
+            return
+
+        out = im
+        if im.mode != "1":
+            if "transparency" not in info:
+                try:
+                    info["transparency"] = im.palette._new_color_index(im)
+                except ValueError:
+                    pass
+            if "transparency" in info:
+                # Unchanged pixels become transparent so they compress away
+                out = im.copy()
+                fill = Image.new("P", im.size, info["transparency"])
+                out.paste(fill, mask=_changed_mask(delta))
+
+        self._flush()
+        self._previous = im
+        self._pending = (out, bbox, info)
+
+    def _flush(self):
+        im, bbox, info = self._pending
+        if bbox is None:
+            for s in GifImagePlugin._get_global_header(im, info):
+                self._fp.write(s)
+            offset = (0, 0)
+        else:
+            info["include_color_table"] = True
+            if bbox != (0, 0) + im.size:
+                im = im.crop(bbox)
+            offset = bbox[:2]
+        GifImagePlugin._write_frame_data(self._fp, im, offset, info)
+        self._pending = None
+
+    def close(self):
+        """Write the held-back frame and the GIF trailer."""
+        if self._frames:
+            frames, self._frames = self._frames, []
+            frames[0].save(self.path, save_all=True, append_images=frames[1:],
+                           duration=self.duration, loop=self.loop)
+            return
+        if self._fp is None:
+            return
+        if self._pending is not None and self._pending[1] is None:
+            # Only one distinct frame: write a plain (non-animated) GIF
+            self._fp.close()
+            self._first.save(self.path, duration=self._pending[2]["duration"],
+                             loop=self.loop)
+        else:
+            self._flush()
+            self._fp.write(b";")
+            self._fp.close()
+        self._fp = None
+        self._first = self._previous = self._pending = None
+
+
+def _temp_path(path):
+    """Fresh temporary file in the same directory as ``path``."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=os.path.splitext(path)[1])
+    os.close(fd)
+    # mkstemp creates 0600 files; published outputs get normal permissions
+    umask = os.umask(0)
+    os.umask(umask)
+    os.chmod(tmp, 0o666 & ~umask)
+    return tmp
+
+
+def _place(src, dest, mode):
+    """Atomically make ``dest`` a copy / hardlink of ``src``."""
+    tmp = _temp_path(dest)
+    try:
+        if mode == "hardlink":
+            os.unlink(tmp)
+            try:
+                os.link(src, tmp)
+            except OSError:
+                # Different filesystem (or no hardlink support): fall back to a copy
+                shutil.copyfile(src, tmp)
+        else:
+            shutil.copyfile(src, tmp)
+        os.replace(tmp, dest)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def publish(src, outputs, mode="copy"):
+    """Publish the finished file ``src`` to every path in ``outputs``.
+
+    ``mode`` is how each destination is produced: "copy", "hardlink" (falls
+    back to copying across filesystems) or "rename", which copies ``src`` to
+    the other destinations and then moves it into the first one. Every destination is
+    replaced atomically. ``src`` is consumed in all modes.
+    """
+    if mode not in PUBLISH_MODES:
+        raise ValueError(f"mode must be one of {PUBLISH_MODES}, got {mode!r}")
+    outputs = [outputs] if isinstance(outputs, (str, os.PathLike)) else list(outputs)
+    if not outputs:
+        raise ValueError("no output paths given")
+    try:
+        for dest in outputs[1:]:
+            _place(src, dest, "copy" if mode == "rename" else mode)
+        if mode == "rename":
+            try:
+                os.replace(src, outputs[0])
+            except OSError:
+                _place(src, outputs[0], "copy")
+        else:
+            _place(src, outputs[0], mode)
+    finally:
+        if os.path.exists(src):
+            os.unlink(src)
+    return outputs
+
+
+def save_gif(frames, outputs, duration=None, loop=0, mode="copy"):
+    """Stream an iterable of frames into one encode and publish it.
+
+    ``outputs`` is a path or a list of paths; the GIF is encoded once into a
+    temporary file next to the first one and then published to all of them
+    (see publish()). Returns the number of frames consumed.
+    """
+    outputs = [outputs] if isinstance(outputs, (str, os.PathLike)) else list(outputs)
+    if not outputs:
+        raise ValueError("no output paths given")
+    tmp = _temp_path(outputs[0])
+    try:
+        with GifWriter(tmp, duration=duration, loop=loop) as gif:
+            for frame in frames:
+                gif.append(frame)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    publish(tmp, outputs, mode)
+    return gif.frame_count
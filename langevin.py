@@ -0,0 +1,129 @@
+"""
+Overdamped Langevin trajectories on the nucleus-fate landscape.
+
+CELL 9 of the notebook gives a deterministic verdict from the slope of
+ΔG(r): shrink below r*, grow above. With thermal noise a nucleus near r*
+can go either way. In reduced units x = r/r*, energy in units of ΔG*_hom
+and time in units of r*²/D, each trajectory follows
+
+    dx = -β U'(x) dt + sqrt(2 dt) ξ,    U(x) = S(θ)(3x² - 2x³),  β = ΔG*_hom / kT
+
+until it is absorbed as dissolved (x <= x_lo) or grown (x >= x_hi). A
+step that ends inside can still have crossed a boundary in between; with
+step variance 2dt the Brownian bridge from x to x' crosses b with
+probability exp(-(x - b)(x' - b) / dt), and such runs are absorbed too.
+Without this test the committor is biased whenever the noise step √(2dt)
+is not small against x_lo (0.065 instead of 0.054 at β = 1, x0 = 0.2). All
+trajectories of a batch, for every starting radius, are stepped together as
+one NumPy array, and only running counts are kept (absorption-time
+histograms, sums of first-passage times, a snapshot histogram of x), so
+memory does not grow with the number of trajectories.
+
+Estimates per starting radius:
+    committor   P(grow before dissolving), with its binomial standard error
+    survival    P(not yet dissolved by time t) on a time grid
+    mean_fpt    mean time to either boundary
+
+committor_exact() gives the 1-D committor by quadrature,
+p(x0) = ∫_{x_lo}^{x0} e^{βU} dx / ∫_{x_lo}^{x_hi} e^{βU} dx, for checking.
+"""
+
+import math
+from typing import NamedTuple
+
+import numpy as np
+
+import physics
+
+
+class LangevinStats(NamedTuple):
+    x0: np.ndarray              # (n_starts,) starting radii, units of r*
+    committor: np.ndarray       # (n_starts,) P(reach x_hi before x_lo)
+    committor_err: np.ndarray   # (n_starts,) binomial standard error
+    t: np.ndarray               # (n_times,) right edges of the time bins
+    survival: np.ndarray        # (n_starts, n_times) P(not dissolved by t)
+    mean_fpt: np.ndarray        # (n_starts,) mean first-passage time of absorbed runs
+    unresolved: np.ndarray      # (n_starts,) fraction still unabsorbed at t_max
+    hist_edges: np.ndarray      # (bins + 1,) radius bins over [0, x_hi]
+    hist: np.ndarray            # (n_starts, bins) fraction of runs per bin at t_snapshot
+    n_traj: int
+
+
+def committor_exact(x, beta, s=1.0, x_lo=0.05, x_hi=2.0, points=4001):
+    """1-D committor P(reach x_hi before x_lo) from x by quadrature."""
+    grid = np.linspace(x_lo, x_hi, points)
+    u = beta * physics.dG_het(grid, s)
+    w = np.exp(u - u.max())
+    cum = np.concatenate(([0.0], np.cumsum((w[1:] + w[:-1]) / 2 * np.diff(grid))))
+    return np.interp(x, grid, cum / cum[-1])
+
+
+def simulate(x0, n_traj=10_000, beta=5.0, s=1.0, t_max=5.0, dt=None, x_lo=0.05, x_hi=2.0,
+             n_times=100, bins=40, t_snapshot=None, batch=4096, seed=None):
+    """Run ``n_traj`` trajectories from each radius in ``x0`` and return LangevinStats.
+
+    Trajectories are run ``batch`` per start at a time. ``dt`` defaults to
+    a step well inside the stability limit of the drift; the bridge test
+    takes care of the noise step. The snapshot
+    histogram is taken at ``t_snapshot`` (default t_max / 4); runs already
+    dissolved or grown by then count in the first and last bins.
+    """
+    x0 = np.atleast_1d(np.asarray(x0, dtype=float))
+    n_starts = x0.size
+    if dt is None:
+        dt = min(1e-3, 0.02 / (6.0 * beta * s + 1.0))
+    n_steps = int(math.ceil(t_max / dt))
+    snap_step = min(n_steps, max(1, int(round((t_max / 4 if t_snapshot is None else t_snapshot) / dt))))
+    edges = np.linspace(0.0, x_hi, bins + 1)
+    rng = np.random.default_rng(seed)
+    noise = math.sqrt(2.0 * dt)
+    drift = -6.0 * beta * s * dt        # -β U'(x) dt = drift · x(1 - x)
+
+    # running totals per start; nothing here scales with n_traj
+    grown = np.zeros(n_starts)
+    absorbed = np.zeros(n_starts)
+    fpt_sum = np.zeros(n_starts)
+    dissolved_at = np.zeros((n_starts, n_times))
+    hist = np.zeros((n_starts, bins))
+
+    done = 0
+    while done < n_traj:
+        size = min(batch, n_traj - done)
+        start = np.repeat(np.arange(n_starts), size)
+        x = np.repeat(x0, size)
+        for step in range(1, n_steps + 1):
+            x_new = x + drift * x * (1.0 - x) + noise * rng.standard_normal(x.size)
+            with np.errstate(over='ignore'):
+                p_low = np.exp(-np.maximum((x - x_lo) * (x_new - x_lo), 0.0) / dt)
+                p_high = np.exp(-np.maximum((x_hi - x) * (x_hi - x_new), 0.0) / dt)
+            u = rng.random(x.size)
+            x = x_new
+            low = (x <= x_lo) | (u < p_low)
+            high = ~low & ((x >= x_hi) | (u < p_low + p_high))
+            hit = low | high
+            if hit.any():
+                n_low = np.bincount(start[low], minlength=n_starts)
+                n_high = np.bincount(start[high], minlength=n_starts)
+                absorbed += n_low + n_high
+                fpt_sum += step * dt * (n_low + n_high)
+                grown += n_high
+                dissolved_at[:, min(n_times - 1, (step - 1) * n_times // n_steps)] += n_low
+                if step <= snap_step:
+                    hist[:, 0] += n_low
+                    hist[:, -1] += n_high
+                keep = ~hit
+                x, start = x[keep], start[keep]
+            if step == snap_step and x.size:
+                b = np.clip(np.searchsorted(edges, x, side='right') - 1, 0, bins - 1)
+                hist += np.bincount(start * bins + b, minlength=n_starts * bins).reshape(n_starts, bins)
+            if x.size == 0:
+                break
+        done += size
+
+    p = grown / n_traj
+    with np.errstate(invalid='ignore'):
+        mean_fpt = fpt_sum / absorbed
+    return LangevinStats(x0, p, np.sqrt(p * (1 - p) / n_traj),
+                         np.arange(1, n_times + 1) * (n_steps * dt / n_times),
+                         1.0 - np.cumsum(dissolved_at, axis=1) / n_traj, mean_fpt,
+                         1.0 - absorbed / n_traj, edges, hist / n_traj, n_traj)
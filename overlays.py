@@ -0,0 +1,247 @@
+"""
+Optional overlays of the 3-panel figure, shared by generate_gifs.py and the
+notebook.
+
+Geometry panel (replaces the spherical cap on a flat substrate):
+    draw_curved_geometry    nucleus on a particle or in a cavity (Fletcher)
+    draw_faceted_geometry   Winterbottom section of a faceted nucleus
+
+Barrier panel (drawn over the classical ΔG(r) curve):
+    draw_site_curves         ΔG(r) of grain-boundary, edge and corner sites
+    draw_line_tension_curve  ΔG(r) with line tension
+    draw_uncertainty_band    Monte Carlo band and barrier histogram
+    draw_uncertainty_legend  CI ticks at r* and their legend
+
+Every function draws into the panel rectangle (px, py, pw, ph) it is given,
+with the fonts tuple of drawing.get_fonts(), so both renderers call the same
+code and produce the same pixels.
+"""
+
+import math
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+import sites
+import uncertainty
+import winterbottom
+from physics import S, S_curved, dG_het, dG_line_tension, line_tension_barrier
+from drawing import (SUBSTRATE_COLOR, SUBSTRATE_HATCH, NUCLEUS_COLOR, NUCLEUS_OUTLINE, WHITE, CYAN, GREEN,
+                     GOLD, GRAY, draw_dashed, barrier_plot_area)
+
+
+# =============================================================================
+# GEOMETRY PANEL
+# =============================================================================
+
+def _circle_arc(cx, cy, r, start, stop, n=90):
+    """Points (cx + r sin t, cy + r cos t) for t from start to stop (radians)."""
+    t = np.linspace(start, stop, n)
+    return list(zip((cx + r * np.sin(t)).tolist(), (cy + r * np.cos(t)).tolist()))
+
+
+def draw_curved_geometry(img, draw, theta_deg, substrate_x, px, py, pw, ph, fonts, r=50):
+    """Nucleus of radius r* (``r`` px) on a spherical particle of radius
+    x r* (substrate_x = x > 0) or in a spherical cavity (substrate_x = -x).
+
+    The two circles are placed so the contact line sits at the flat
+    panel's substrate level; everything is drawn on a layer clipped to the
+    panel interior above the legend.
+    """
+    f_small, f_normal, f_medium, f_large, f_title, f_bigtitle = fonts
+    x = abs(substrate_x)
+    concave = substrate_x < 0
+    m = math.cos(math.radians(theta_deg))
+    R = x * r
+    d = r * math.sqrt(max(1 + x*x + (2 if concave else -2) * m * x, 0.0))
+    ox, oy = px + 5, py + 35
+    layer = Image.new('RGBA', (pw - 9, ph - 95), (0, 0, 0, 0))
+    ld = ImageDraw.Draw(layer)
+    cx = layer.width / 2
+    baseY = int(ph * 0.58) - 35
+
+    # Half-angles of the two arcs that bound the nucleus, seen from each centre
+    def half_angle(a, b):
+        if d < 1e-9:
+            return math.pi
+        return math.acos(min(1.0, max(-1.0, (a*a + d*d - b*b) / (2 * a * d))))
+    a_n = half_angle(r, R)
+    a_s = half_angle(R, r)
+    if concave:
+        Cy = baseY - R * math.cos(a_s)          # cavity centre, nucleus centre d below it
+        Ny = Cy + d
+        ld.rectangle([0, baseY - 30, layer.width, layer.height], fill=SUBSTRATE_COLOR + (255,))
+        ld.ellipse([cx - R, Cy - R, cx + R, Cy + R], fill=(0, 0, 0, 0))
+        nucleus = _circle_arc(cx, Ny, r, math.pi + a_n, math.pi - a_n) + _circle_arc(cx, Cy, R, a_s, -a_s)
+        tangent = math.degrees(math.atan2(math.sin(a_s), -math.cos(a_s)))
+        ld.text((cx, layer.height - 14), "Substrate (cavity)", fill=WHITE, anchor="mm", font=f_small)
+    else:
+        Cy = baseY + R * math.cos(a_s)          # particle centre, nucleus centre d above it
+        Ny = Cy - d
+        ld.ellipse([cx - R, Cy - R, cx + R, Cy + R], fill=SUBSTRATE_COLOR + (255,), outline=SUBSTRATE_HATCH + (255,), width=2)
+        nucleus = _circle_arc(cx, Ny, r, a_n, 2 * math.pi - a_n) + _circle_arc(cx, Cy, R, math.pi + a_s, math.pi - a_s)
+        tangent = math.degrees(math.atan2(-math.sin(a_s), -math.cos(a_s)))
+        if Cy < layer.height:
+            ld.text((cx, min(Cy, layer.height - 14)), "Particle", fill=WHITE, anchor="mm", font=f_small)
+    if S_curved(theta_deg, x, concave) > 1e-6:
+        ld.polygon(nucleus, fill=NUCLEUS_COLOR + (255,), outline=NUCLEUS_OUTLINE + (255,))
+        ld.line(nucleus, fill=NUCLEUS_OUTLINE + (255,), width=3)
+    # Dashed full sphere of radius r*
+    ring = _circle_arc(cx, Ny, r, 0, 2 * math.pi, 65)
+    for i in range(0, 64, 2):
+        ld.line([ring[i], ring[i + 1]], fill=(150, 170, 200, 255), width=1)
+    ld.ellipse([cx - 4, Ny - 4, cx + 4, Ny + 4], fill=WHITE, outline=(100, 100, 120))
+
+    # Contact angle at the right-hand contact point
+    tpX = cx + R * math.sin(a_s)
+    ar = 30
+    ld.arc([tpX - ar, baseY - ar, tpX + ar, baseY + ar], start=tangent, end=tangent + theta_deg, fill=GREEN, width=4)
+    ld.ellipse([tpX - 5, baseY - 5, tpX + 5, baseY + 5], fill=WHITE, outline=GREEN, width=2)
+    img.alpha_composite(layer, (ox, oy))
+
+    kind = "cavity" if concave else "particle"
+    draw.text((px + 12, py + 65), f"θ = {theta_deg:.0f}°", fill=GREEN, font=f_large)
+    draw.text((px + 12, py + 88), f"f(m, x) = {float(S_curved(theta_deg, x, concave)):.4f}", fill=CYAN, font=f_normal)
+    draw.text((px + 12, py + 108), f"flat S(θ) = {float(S(theta_deg)):.4f}", fill=GRAY, font=f_small)
+    draw.text((px + pw - 12, py + 65), f"{kind} R = {x:g} r*", fill=WHITE, anchor="ra", font=f_normal)
+
+
+def draw_faceted_geometry(img, draw, theta_deg, facets, px, py, pw, ph, fonts, size=70):
+    """x-z cross-section of the Winterbottom shape of the ``facets`` set
+    (a winterbottom.FACET_SETS name) on the flat substrate, with the free
+    Wulff section dashed. The widest Wulff half-extent is ``size`` px."""
+    f_small, f_normal, f_medium, f_large, f_title, f_bigtitle = fonts
+    cx = px + pw//2
+    baseY = py + int(ph * 0.58)
+    free = winterbottom.cross_section(facets, 180.0)
+    cut = winterbottom.cross_section(facets, theta_deg)
+    normals, energies = winterbottom.facet_set(winterbottom.FACET_SETS[facets])
+    z0 = -float(winterbottom.theta_dgamma(normals, energies, theta_deg))   # substrate plane
+    scale = size / np.abs(free).max()
+
+    def to_px(poly):
+        return list(zip((cx + scale * poly[:, 0]).tolist(), (baseY - scale * (poly[:, 1] - z0)).tolist()))
+
+    ring = to_px(free)
+    for p, q in zip(ring, ring[1:] + ring[:1]):
+        draw_dashed(draw, *p, *q, (150, 170, 200), 5, 4, 1)
+    if len(cut) >= 3:
+        draw.polygon(to_px(cut), fill=NUCLEUS_COLOR, outline=NUCLEUS_OUTLINE)
+        draw.line(to_px(cut) + to_px(cut)[:1], fill=NUCLEUS_OUTLINE, width=3)
+    centre_y = baseY + scale * z0
+    if py + 45 < centre_y < baseY + 60:
+        draw.ellipse([cx-4, centre_y-4, cx+4, centre_y+4], fill=WHITE, outline=(100,100,120))
+
+    s_w = float(winterbottom.shape_factor(facets, theta_deg))
+    draw.text((px + 12, py + 65), f"θ = {theta_deg:.0f}°", fill=GREEN, font=f_large)
+    draw.text((px + 12, py + 88), f"S_W(θ) = {s_w:.4f}", fill=CYAN, font=f_normal)
+    draw.text((px + 12, py + 108), f"isotropic S(θ) = {float(S(theta_deg)):.4f}", fill=GRAY, font=f_small)
+    draw.text((px + pw - 12, py + 65), f"{facets} (x-z section)", fill=WHITE, anchor="ra", font=f_normal)
+
+
+# =============================================================================
+# BARRIER PANEL
+# =============================================================================
+
+def draw_site_curves(draw, theta_deg, site_names, px, py, pw, ph, fonts):
+    """ΔG(r) for several nucleation sites at once, with a legend of their
+    cross-sections under the barrier equation (θ is the half dihedral
+    angle for the grain sites)."""
+    f_small = fonts[0]
+    plot_x, plot_y, plot_w, plot_h, r_max, dg_max, to_x, to_y = barrier_plot_area(px, py, pw, ph)
+    r = np.arange(101) / 100 * r_max
+    factors = sites.shape_factors(theta_deg, site_names)
+    curves = np.multiply.outer(factors, dG_het(r, 1.0))   # every site in one array op
+    xs = to_x(r)
+    ys = to_y(curves)
+    keep = (curves >= 0) & (curves <= dg_max)
+    for k, name in enumerate(site_names):
+        color = sites.SITES[name].color
+        pts = list(zip(xs[keep[k]].tolist(), ys[k][keep[k]].tolist()))
+        if len(pts) >= 2:
+            draw.line(pts, fill=color, width=2)
+        peak_y = to_y(factors[k])
+        draw.ellipse([to_x(1.0) - 4, peak_y - 4, to_x(1.0) + 4, peak_y + 4], fill=color, outline=WHITE)
+
+    # Legend box under the barrier equation
+    lx, ly = plot_x + 8, plot_y + int(plot_h * 0.25) + 48
+    draw.rectangle([lx, ly - 11, lx + 158, ly + 20 * len(site_names) - 9], fill=(25, 40, 65), outline=(80, 100, 130))
+    for k, name in enumerate(site_names):
+        color = sites.SITES[name].color
+        y = ly + 20 * k
+        sites.draw_site(draw, name, lx + 14, y, theta_deg, 6)
+        draw.text((lx + 28, y), sites.SITES[name].label, fill=color, anchor="lm", font=f_small)
+        draw.text((lx + 152, y), f"{factors[k]:.3f}", fill=color, anchor="rm", font=f_small)
+
+
+def draw_line_tension_curve(draw, theta_deg, kappa, px, py, pw, ph, fonts, legend_row=0):
+    """ΔG(r) with line tension κ = τ / (γ r*), θ following the modified Young
+    relation, beside the classical curve; its legend sits below ``legend_row``
+    rows of the site legend."""
+    f_small = fonts[0]
+    plot_x, plot_y, plot_w, plot_h, r_max, dg_max, to_x, to_y = barrier_plot_area(px, py, pw, ph)
+    r = np.arange(101) / 100 * r_max
+    g = dG_line_tension(r, theta_deg, kappa)
+    keep = (g >= 0) & (g <= dg_max)
+    pts = list(zip(to_x(r[keep]).tolist(), to_y(g[keep]).tolist()))
+    if len(pts) >= 2:
+        draw.line(pts, fill=GOLD, width=2)
+    g_star, x_star = line_tension_barrier(theta_deg, kappa)
+    if g_star <= dg_max:
+        cx, cy = to_x(x_star), to_y(g_star)
+        draw.ellipse([cx - 5, cy - 5, cx + 5, cy + 5], fill=GOLD, outline=WHITE)
+
+    lx, ly = plot_x + 8, plot_y + int(plot_h * 0.25) + 48 + 20 * legend_row + (6 if legend_row else 0)
+    draw.rectangle([lx, ly - 11, lx + 158, ly + 29], fill=(25, 40, 65), outline=(80, 100, 130))
+    draw.line([(lx + 6, ly), (lx + 22, ly)], fill=GOLD, width=2)
+    draw.text((lx + 28, ly), f"Line tension κ = {kappa:+.2f}", fill=GOLD, anchor="lm", font=f_small)
+    draw.text((lx + 28, ly + 18), "ΔG*", fill=WHITE, anchor="lm", font=f_small)
+    draw.text((lx + 152, ly + 18), f"{float(S(theta_deg)):.3f} → {float(g_star):.3f}", fill=GOLD, anchor="rm", font=f_small)
+
+
+def draw_uncertainty_band(img, theta_deg, sigma, px, py, pw, ph):
+    """Confidence band of ΔG(r) and the histogram of ΔG* at r* (bars to the
+    left of the r* line) when every surface energy has standard deviation
+    ``sigma`` γ_NL; drawn translucent, under the curves."""
+    plot_x, plot_y, plot_w, plot_h, r_max, dg_max, to_x, to_y = barrier_plot_area(px, py, pw, ph)
+    barrier = uncertainty.contact_angle_propagation(float(theta_deg), float(sigma)).barrier
+    layer = Image.new('RGBA', (pw + 1, ph + 1), (0, 0, 0, 0))
+    ldraw = ImageDraw.Draw(layer)
+    r = np.arange(101) / 100 * r_max
+    xs = (to_x(r) - px).tolist()
+    upper = (to_y(np.minimum(dG_het(r, barrier.hi), dg_max)) - py).tolist()
+    lower = (to_y(np.minimum(dG_het(r, barrier.lo), dg_max)) - py).tolist()
+    ldraw.polygon(list(zip(xs, upper)) + list(zip(xs[::-1], lower[::-1])), fill=CYAN + (45,))
+
+    # Sample histogram, one bar per pixel row, widest bar 60 px
+    centers = (barrier.edges[:-1] + barrier.edges[1:]) / 2
+    inside = centers <= dg_max
+    rows = (to_y(centers[inside]) - py).astype(int)
+    with np.errstate(invalid='ignore'):
+        density = np.nan_to_num(np.bincount(rows, weights=barrier.counts[inside], minlength=ph + 1)
+                                / np.bincount(rows, minlength=ph + 1))
+    if density.max() > 0:
+        x0 = to_x(1.0) - px - 3
+        for y in np.flatnonzero(density).tolist():
+            ldraw.line([(x0 - 60 * density[y] / density.max(), y), (x0, y)], fill=CYAN + (110,))
+    img.alpha_composite(layer, (px, py))
+
+
+def draw_uncertainty_legend(draw, theta_deg, sigma, px, py, pw, ph, fonts, legend_offset=0):
+    """CI ticks at r* and a legend box ``legend_offset`` px below the
+    barrier equation's default legend position."""
+    f_small = fonts[0]
+    plot_x, plot_y, plot_w, plot_h, r_max, dg_max, to_x, to_y = barrier_plot_area(px, py, pw, ph)
+    p = uncertainty.contact_angle_propagation(float(theta_deg), float(sigma))
+    barrier = p.barrier
+    r_star_x = to_x(1.0)
+    for g in (barrier.lo, barrier.hi):
+        if g <= dg_max:
+            draw.line([(r_star_x - 8, to_y(g)), (r_star_x + 8, to_y(g))], fill=WHITE, width=1)
+
+    lx, ly = plot_x + 8, plot_y + int(plot_h * 0.25) + 48 + legend_offset
+    draw.rectangle([lx, ly - 11, lx + 158, ly + 29], fill=(25, 40, 65), outline=(80, 100, 130))
+    draw.rectangle([lx + 6, ly - 4, lx + 22, ly + 4], fill=(50, 100, 130))
+    draw.text((lx + 28, ly), f"Energies ± {sigma:.2f} γNL", fill=CYAN, anchor="lm", font=f_small)
+    draw.text((lx + 28, ly + 18), f"{p.level:.0%} CI", fill=WHITE, anchor="lm", font=f_small)
+    draw.text((lx + 152, ly + 18), f"{barrier.lo:.3f} – {barrier.hi:.3f}", fill=CYAN, anchor="rm", font=f_small)
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Batch screening of substrate / inoculant candidates with Young's equation.
+
+Reads a table of interfacial energies (γ_SL, γ_SN, γ_NL), one candidate per
+row, and writes each row back with its contact angle θ, shape factor S(θ),
+barrier ratio ΔG*_het/ΔG*_hom, wetting regime and rank within its chunk
+(1 = lowest barrier). The input is processed in fixed-size chunks and every
+chunk is written before the next is read, so memory stays flat however
+large the file is. Other input columns (names, notes, ...) are passed through.
+
+CSV is always supported; Parquet in or out needs pyarrow. A file output goes
+to a temporary file next to the destination and is renamed into place at the
+end, so an interrupted run never leaves a truncated table behind.
+
+Usage:
+    python screen.py candidates.csv -o screened.csv
+    python screen.py candidates.parquet -o screened.parquet --chunk-size 500000
+    python screen.py pairs.csv --columns SL SN NL -o -      # CSV to stdout
+"""
+
+import os
+import sys
+import csv
+import argparse
+import itertools
+
+import numpy as np
+
+import physics
+
+DEFAULT_COLUMNS = ('gamma_sl', 'gamma_sn', 'gamma_nl')
+DEFAULT_CHUNK = 100_000
+RESULT_COLUMNS = ('theta_deg', 'S', 'barrier_ratio', 'regime', 'rank')
+
+
+def _is_parquet(path):
+    return path != '-' and path.lower().endswith(('.parquet', '.pq'))
+
+
+def _to_float(values):
+    """Column of strings -> float64; blanks and junk become NaN (flagged invalid)."""
+    try:
+        return np.array(values, dtype=float)
+    except ValueError:
+        out = np.empty(len(values))
+        for i, v in enumerate(values):
+            try:
+                out[i] = float(v)
+            except ValueError:
+                out[i] = np.nan
+        return out
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        sys.exit("error: Parquet input/output needs pyarrow (pip install pyarrow)")
+    return pyarrow
+
+
+# =============================================================================
+# READERS: yield (header, passthrough rows/columns, source rows, γ_SL, γ_SN, γ_NL)
+# per chunk; the source rows are where each row sits in the input (CSV: file
+# line, Parquet: 1-based row), for messages
+# =============================================================================
+
+def read_csv_chunks(path, columns=DEFAULT_COLUMNS, chunk_size=DEFAULT_CHUNK):
+    """Yield (header, rows, lines, sl, sn, nl) for each ``chunk_size`` rows of a CSV.
+
+    Blank lines are skipped; a row with more fields than the header is an error.
+    """
+    with open(path, newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            raise ValueError(f"{path}: empty file")
+        missing = [c for c in columns if c not in header]
+        if missing:
+            raise ValueError(f"{path}: missing column(s) {', '.join(missing)}")
+        idx = [header.index(c) for c in columns]
+        # Re-screening a screened file replaces its result columns
+        keep = [i for i, name in enumerate(header) if name not in RESULT_COLUMNS]
+        passthrough = [header[i] for i in keep]
+        for n in itertools.count():
+            rows, lines, read = [], [], 0
+            for r in itertools.islice(reader, chunk_size):
+                read += 1
+                if not r:
+                    continue
+                if len(r) > len(header):
+                    raise ValueError(f"{path}, line {reader.line_num}: {len(r)} fields, "
+                                     f"the header has {len(header)}")
+                # Short rows are padded so the result columns line up under their names
+                rows.append(r + [''] * (len(header) - len(r)))
+                lines.append(reader.line_num)
+            # A header-only file still gives one empty chunk, so its output keeps the header
+            if not read and n:
+                return
+            gammas = [_to_float([r[i] for r in rows]) for i in idx]
+            if len(keep) < len(header):
+                rows = [[r[i] for i in keep] for r in rows]
+            yield passthrough, rows, np.array(lines, dtype=np.int64), *gammas
+
+
+def read_parquet_chunks(path, columns=DEFAULT_COLUMNS, chunk_size=DEFAULT_CHUNK):
+    """Yield (schema names, record batch, rows, sl, sn, nl) for each Parquet batch."""
+    pa = _require_pyarrow()
+    pf = pa.parquet.ParquetFile(path)
+    header = pf.schema_arrow.names
+    missing = [c for c in columns if c not in header]
+    if missing:
+        raise ValueError(f"{path}: missing column(s) {', '.join(missing)}")
+    passthrough = [name for name in header if name not in RESULT_COLUMNS]
+    done = 0
+    for batch in pf.iter_batches(batch_size=chunk_size):
+        gammas = []
+        for c in columns:
+            col = batch.column(c)
+            if pa.types.is_string(col.type) or pa.types.is_large_string(col.type):
+                gammas.append(_to_float([v or '' for v in col.to_pylist()]))
+            else:
+                gammas.append(col.cast(pa.float64()).fill_null(np.nan).to_numpy(zero_copy_only=False))
+        yield passthrough, batch.select(passthrough), np.arange(done + 1, done + batch.num_rows + 1), *gammas
+        done += batch.num_rows
+
+
+# =============================================================================
+# SCREENING
+# =============================================================================
+
+def chunk_rank(barrier):
+    """1-based rank of each entry by ascending barrier; 0 where it is NaN."""
+    order = np.argsort(barrier, kind='stable')   # NaNs sort last
+    rank = np.empty(barrier.size, dtype=np.int64)
+    rank[order] = np.arange(1, barrier.size + 1)
+    rank[np.isnan(barrier)] = 0
+    return rank
+
+
+def screen_chunk(sl, sn, nl):
+    """θ, S, ΔG*_het/ΔG*_hom, regime name and in-chunk rank for one chunk."""
+    y = physics.young(sl, sn, nl)
+    # ΔG*_het/ΔG*_hom is S(θ) itself; kept as its own column for the spreadsheets
+    barrier = y.S
+    regime = np.array(physics.WETTING_REGIMES, dtype=object)[y.regime]
+    return y.theta, y.S, barrier, regime, chunk_rank(barrier)
+
+
+class CsvSink:
+    def __init__(self, fp):
+        self._fp = fp
+        self._writer = csv.writer(fp)
+        self._header_written = False
+
+    def write(self, header, rows, results):
+        if not self._header_written:
+            self._writer.writerow(list(header) + list(RESULT_COLUMNS))
+            self._header_written = True
+        if not isinstance(rows, list):
+            rows = [list(r.values()) for r in rows.to_pylist()]
+        theta, s, barrier, regime, rank = results
+        out = zip(rows, np.round(theta, 6).tolist(), np.round(s, 8).tolist(),
+                  np.round(barrier, 8).tolist(), regime.tolist(), rank.tolist())
+        self._writer.writerows(
+            r + ['' if t != t else t, '' if v != v else v, '' if b != b else b, g, k or '']
+            for r, t, v, b, g, k in out)
+
+    def close(self):
+        pass
+
+
+class ParquetSink:
+    def __init__(self, path):
+        self._pa = _require_pyarrow()
+        self._path = path
+        self._writer = None
+
+    def write(self, header, rows, results):
+        pa = self._pa
+        if isinstance(rows, list):
+            table = {name: [r[i] if i < len(r) else None for r in rows] for i, name in enumerate(header)}
+            batch = pa.table(table)
+        else:
+            batch = pa.Table.from_batches([rows])
+        theta, s, barrier, regime, rank = results
+        for name, col in zip(RESULT_COLUMNS, (theta, s, barrier, regime.astype(str), rank)):
+            batch = batch.append_column(name, pa.array(col))
+        if self._writer is None:
+            self._writer = pa.parquet.ParquetWriter(self._path, batch.schema)
+        self._writer.write_table(batch)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def screen(src, dest, columns=DEFAULT_COLUMNS, chunk_size=DEFAULT_CHUNK):
+    """Screen ``src`` into ``dest`` chunk by chunk; returns (rows, invalid rows, best).
+
+    ``best`` is (barrier ratio, θ, source row) of the lowest barrier seen, or
+    None if no row was valid; the source row is the line of a CSV input and
+    the 1-based row of a Parquet one. ``dest`` may be '-' for CSV on stdout.
+    """
+    reader = read_parquet_chunks if _is_parquet(src) else read_csv_chunks
+    chunks = reader(src, columns, chunk_size)
+
+    # Regular files are written to a temporary name and renamed into place;
+    # pipes and devices (/dev/stdout, a FIFO, ...) are written directly
+    atomic = dest != '-' and (not os.path.exists(dest) or os.path.isfile(dest))
+    target = f"{dest}.{os.getpid()}.tmp" if atomic else dest
+    fp = None
+    if _is_parquet(dest):
+        sink = ParquetSink(target)
+    else:
+        fp = sys.stdout if dest == '-' else open(target, 'w', newline='')
+        sink = CsvSink(fp)
+
+    n_rows = n_invalid = 0
+    best = None
+    try:
+        for header, rows, where, sl, sn, nl in chunks:
+            results = screen_chunk(sl, sn, nl)
+            sink.write(header, rows, results)
+            barrier = results[2]
+            valid = ~np.isnan(barrier)
+            n_invalid += int(barrier.size - valid.sum())
+            if valid.any():
+                i = int(np.nanargmin(barrier))
+                if best is None or barrier[i] < best[0]:
+                    best = (float(barrier[i]), float(results[0][i]), int(where[i]))
+            n_rows += barrier.size
+        sink.close()
+    except BaseException:
+        if fp not in (None, sys.stdout):
+            fp.close()
+        if atomic and os.path.exists(target):
+            os.unlink(target)
+        raise
+    if fp is sys.stdout:
+        fp.flush()
+    elif fp is not None:
+        fp.close()
+    if atomic:
+        os.replace(target, dest)
+    return n_rows, n_invalid, best
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Screen substrate candidates with Young's equation and S(θ)")
+    parser.add_argument('input', help="CSV or Parquet (.parquet/.pq, needs pyarrow) table of interfacial energies")
+    parser.add_argument('--output', '-o', required=True,
+                        help="output CSV or Parquet path ('-' for CSV on stdout)")
+    parser.add_argument('--columns', nargs=3, metavar=('SL', 'SN', 'NL'), default=list(DEFAULT_COLUMNS),
+                        help="column names of γ_SL, γ_SN, γ_NL (default: %(default)s)")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK,
+                        help="rows per chunk; ranks are within a chunk (default: %(default)s)")
+    args = parser.parse_args()
+
+    n_rows, n_invalid, best = screen(args.input, args.output, tuple(args.columns), args.chunk_size)
+    summary = f"Screened {n_rows} rows ({n_invalid} invalid)"
+    if best is not None:
+        summary += f"; lowest barrier {best[0]:.4f} ΔG*_hom at θ = {best[1]:.1f}° "
+        summary += f"({'row' if _is_parquet(args.input) else 'line'} {best[2]})"
+    print(summary, file=sys.stderr)
@@ -0,0 +1,28 @@
+"""Checks of the tridiagonal solver and the steady flux in cluster_dynamics.py."""
+
+import numpy as np
+import pytest
+
+import cluster_dynamics
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 4, 5, 8, 17, 64, 1001])
+def test_tridiagonal_matches_dense_solve(size):
+    rng = np.random.default_rng(size)
+    lower, upper = rng.uniform(-1, 1, size), rng.uniform(-1, 1, size)
+    diag = 2.5 + rng.uniform(0, 1, size)        # diagonally dominant, like I - dt·A
+    dense = np.diag(diag) + np.diag(lower[1:], -1) + np.diag(upper[:-1], 1)
+    solver = cluster_dynamics.Tridiagonal(lower, diag, upper)
+    for _ in range(2):                          # the factorization is reused
+        rhs = rng.normal(size=size)
+        np.testing.assert_allclose(solver.solve(rhs), np.linalg.solve(dense, rhs), rtol=1e-12, atol=1e-12)
+
+
+@pytest.mark.parametrize("theta", [60.0, 90.0, 180.0])
+def test_steady_flux_matches_zeldovich(theta):
+    # n* ≈ 152 and ΔG*/kT from 12 to 76, where the CNT continuum limit holds
+    model = cluster_dynamics.cluster_model(theta, sizes=2000, dmu=1.0, sigma=8.0)
+    c = cluster_dynamics.steady_state(model)
+    J_ss = cluster_dynamics.flux(model, c, int(np.ceil(model.n_star)))
+    J_cl, _ = cluster_dynamics.classical(model)
+    assert J_ss == pytest.approx(J_cl, rel=0.02)
@@ -0,0 +1,37 @@
+"""Checks of the contact-angle quadrature in freezing.py."""
+
+import numpy as np
+import pytest
+
+import freezing
+import physics
+
+
+def _fine_average(f, mean, sd):
+    # direct trapezoid integral of the truncated density on a 2000x finer grid
+    theta = np.linspace(0.0, 180.0, 1_440_001)
+    density = np.exp(-0.5 * ((theta - mean) / sd) ** 2)
+    return np.trapezoid(density * f(theta), theta) / np.trapezoid(density, theta)
+
+
+@pytest.mark.parametrize("mean, sd", [(60.0, 10.0), (90.0, 30.0), (5.0, 8.0), (170.0, 2.0), (45.1, 1.0)])
+def test_normal_quadrature_matches_fine_integral(mean, sd):
+    grid = freezing.theta_grid()
+    w = freezing.normal_weights(mean, sd)
+    assert w.shape == (1, grid.theta.size)
+    assert w.sum() == pytest.approx(1.0, rel=1e-12)
+    for f in (physics.S, np.radians):
+        assert (w @ f(grid.theta))[0] == pytest.approx(_fine_average(f, mean, sd), rel=1e-4)
+
+
+def test_normal_narrower_than_the_grid():
+    w = freezing.normal_weights([60.1, 60.125, 0.0], 1e-4)
+    np.testing.assert_allclose(w.sum(axis=1), 1.0)
+    theta = freezing.theta_grid().theta
+    np.testing.assert_allclose(w @ theta, [60.0, 60.125, 0.0])   # nearest node, or split between two
+
+
+@pytest.mark.parametrize("sd", [0.0, -1.0, np.nan])
+def test_normal_rejects_non_positive_sd(sd):
+    with pytest.raises(ValueError, match="sd must be positive"):
+        freezing.normal_weights([60.0, 70.0], [5.0, sd])
@@ -0,0 +1,15 @@
+"""Checks of the GIF frame renderer in generate_gifs.py."""
+
+import generate_gifs
+
+
+def test_parallel_frames_identical_to_serial():
+    angles = [15, 60, 91, 165]
+    options = dict(site_names=('grain_boundary',), line_tension=0.1)
+    serial = list(generate_gifs.render_frames(angles, workers=1, **options))
+    parallel = list(generate_gifs.render_frames(angles, workers=2, **options))
+    assert len(parallel) == len(angles)
+    for a, b in zip(serial, parallel):
+        assert a.mode == b.mode and a.size == b.size
+        assert a.tobytes() == b.tobytes()
+        assert a.getpalette() == b.getpalette()
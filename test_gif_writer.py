@@ -0,0 +1,44 @@
+"""Checks of the streaming GIF writer in gif_writer.py against Pillow's save_all."""
+
+import pytest
+from PIL import Image, ImageDraw
+
+import gif_writer
+
+
+def _sweep():
+    frames = []
+    for i in range(8):
+        img = Image.new("RGB", (120, 80), (15, 25, 45))
+        draw = ImageDraw.Draw(img)
+        draw.ellipse([10 + 8 * i, 20, 40 + 8 * i, 50], fill=(255, 130, 170), outline=(255, 80, 130))
+        draw.line([(0, 60), (119, 60)], fill=(100, 240, 255), width=2)
+        frames.append(img)
+    # a repeated frame is merged into the previous one
+    return frames[:4] + [frames[3]] + frames[4:]
+
+
+def _save_all(frames, path):
+    frames[0].save(path, save_all=True, append_images=frames[1:], duration=60, loop=0)
+    return path.read_bytes()
+
+
+@pytest.mark.parametrize("streaming", [True, False])
+def test_bytes_match_save_all(tmp_path, monkeypatch, streaming):
+    if streaming and not gif_writer.STREAMING:
+        pytest.skip("this Pillow lacks the private GIF encoder hooks")
+    monkeypatch.setattr(gif_writer, "STREAMING", streaming)
+    frames = _sweep()
+    with gif_writer.GifWriter(tmp_path / "w.gif", duration=60, loop=0) as gif:
+        for frame in frames:
+            gif.append(frame)
+    assert gif.frame_count == len(frames)
+    assert (tmp_path / "w.gif").read_bytes() == _save_all(frames, tmp_path / "s.gif")
+
+
+def test_reused_frames_encode_like_rendered_ones(tmp_path):
+    frames = _sweep()[:4]
+    keys = [0, 1, 2, 3, 2, 1, 0]
+    reused = gif_writer.reuse_frames(keys, (gif_writer.quantize(f) for f in frames))
+    gif_writer.save_gif(reused, str(tmp_path / "r.gif"), duration=60)
+    assert (tmp_path / "r.gif").read_bytes() == _save_all([frames[k] for k in keys], tmp_path / "s.gif")
@@ -0,0 +1,44 @@
+"""Checks of the Fenwick tree and the event clock in kmc.py."""
+
+import math
+
+import numpy as np
+import pytest
+
+import kmc
+
+
+@pytest.mark.parametrize("size", [1, 2, 7, 64, 1000])
+def test_find_matches_searchsorted(size):
+    rng = np.random.default_rng(size)
+    # integer weights (some zero, like blocked sites) keep every prefix sum exact
+    weights = rng.integers(0, 5, size).astype(float)
+    weights[0] = 1.0
+    tree = kmc.FenwickTree(weights)
+    cum = np.cumsum(weights)
+    u = np.concatenate([rng.uniform(0, cum[-1], 200), cum[:-1]])   # including exact boundaries
+    u = u[u < cum[-1]]                                                # run() draws u in [0, total)
+    found = [tree.find(v) for v in u]
+    np.testing.assert_array_equal(found, np.searchsorted(cum, u, side='right'))
+
+
+def test_set_many_keeps_the_total():
+    rng = np.random.default_rng(0)
+    tree = kmc.FenwickTree(rng.uniform(0, 1, 513))
+    for _ in range(50):
+        idx = rng.choice(513, 20, replace=False)
+        tree.set_many(idx, rng.uniform(0, 1, 20) * (rng.random(20) < 0.7))
+        tree.set(int(rng.integers(513)), float(rng.random()))
+        assert tree.total() == pytest.approx(tree.weights.sum(), rel=1e-12)
+        assert tree.prefix(100) == pytest.approx(tree.weights[:100].sum(), rel=1e-12)
+
+
+def test_huge_barrier_waiting_times():
+    theta = np.full((8, 8), 179.0)      # S·barrier_kT ≈ 1000: e^-ln_scale overflows
+    snaps = list(kmc.run(theta, barrier_kT=1000.0, max_events=3, t_max=1e300, seed=0))
+    assert snaps[-1].t == 1e300 and snaps[-1].events == 0
+    with pytest.raises(ValueError, match="overflows"):
+        list(kmc.run(theta, barrier_kT=1000.0, max_events=3, seed=0))
+    # still representable: times of order e^700 come out finite
+    last = list(kmc.run(theta, barrier_kT=700.0, max_events=3, seed=0))[-1]
+    assert last.events == 3 and math.isfinite(last.t) and last.t > 1e300
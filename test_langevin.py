@@ -0,0 +1,21 @@
+"""Checks of the Langevin simulator in langevin.py against the exact committor."""
+
+import numpy as np
+import pytest
+
+import langevin
+
+
+@pytest.mark.parametrize("beta, x0", [(1.0, [0.2, 1.0, 1.3]), (5.0, [0.8, 1.0, 1.2])])
+def test_committor_agrees_with_quadrature(beta, x0):
+    runs = langevin.simulate(x0, n_traj=20_000, beta=beta, seed=0)
+    exact = langevin.committor_exact(x0, beta)
+    assert (runs.unresolved == 0).all()
+    assert (np.abs(runs.committor - exact) <= 4 * runs.committor_err).all()
+
+
+def test_running_counts_are_consistent():
+    runs = langevin.simulate([0.5, 1.5], n_traj=2000, beta=2.0, t_max=2.0, seed=1)
+    assert (np.diff(runs.survival, axis=1) <= 0).all()
+    np.testing.assert_allclose(runs.hist.sum(axis=1), 1.0)
+    assert (runs.mean_fpt > 0).all()
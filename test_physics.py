@@ -0,0 +1,163 @@
+"""Checks of the physics.py kernels against their closed forms."""
+
+import numpy as np
+import pytest
+
+import physics
+
+
+# =============================================================================
+# CURVED SUBSTRATE
+# =============================================================================
+
+@pytest.mark.parametrize("concave", [False, True])
+def test_fletcher_table_within_its_error_bound(concave):
+    table = physics.FletcherTable(points=65, concave=concave)
+    rng = np.random.default_rng(0)
+    m = rng.uniform(-1, 1, 100_000)
+    x = np.exp(rng.uniform(-5, 5, 100_000))
+    err = np.abs(table(m, x) - physics.fletcher_f(m, x, concave))
+    assert err.max() <= table.error_bound
+
+
+def test_fletcher_limits():
+    theta = np.linspace(0, 180, 37)
+    m = np.cos(np.radians(theta))
+    np.testing.assert_allclose(physics.fletcher_f(m, np.inf), physics.S(theta), atol=1e-15)
+    np.testing.assert_allclose(physics.fletcher_f(m, 1e6), physics.S(theta), atol=1e-5)
+    np.testing.assert_allclose(physics.fletcher_f(m, 1e6, concave=True), physics.S(theta), atol=1e-5)
+    np.testing.assert_allclose(physics.fletcher_f(m, 0.0), 1.0, atol=1e-15)
+
+
+# =============================================================================
+# INVERSE SHAPE FACTOR
+# =============================================================================
+
+def test_theta_from_S_round_trips():
+    s = np.concatenate([np.geomspace(1e-300, 1, 1000), np.linspace(0, 1, 10_001)])
+    back = physics.S(physics.theta_from_S(s))
+    np.testing.assert_allclose(back, s, rtol=physics.error_bound(), atol=0)
+    # θ itself is ill-conditioned near 180°, where S is flat
+    theta = np.linspace(0, 170, 1701)
+    np.testing.assert_allclose(physics.theta_from_S(physics.S(theta)), theta, atol=1e-9)
+
+
+def test_theta_from_S_outside_unit_interval_is_nan():
+    assert np.isnan(physics.theta_from_S([-0.1, 1.1])).all()
+
+
+def test_young_gamma_sn_gives_the_target_angle():
+    theta = physics.theta_from_S(0.25)
+    assert theta == pytest.approx(69.678, abs=1e-3)
+    gamma_sn = physics.young_gamma_sn(theta, 50, 40)
+    assert physics.young(50, gamma_sn, 40).theta == pytest.approx(theta, rel=1e-12)
+
+
+# =============================================================================
+# PRECISION MODES
+# =============================================================================
+
+def _theta_grid(tiny, dtype):
+    theta = np.concatenate([np.geomspace(tiny, 1, 2000), np.linspace(1, 180, 17_901)]).astype(dtype)
+    return theta, np.sin(np.radians(theta.astype(np.longdouble)) / 2)
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+def test_kernels_within_error_bound(dtype):
+    # down to angles where S is still a normal number
+    theta, s = _theta_grid(1e-6 if dtype == np.float32 else 1e-60, dtype)
+    exact = {physics.S: s**4 * (3 - 2 * s * s), physics.h_over_R: 2 * s * s}
+    for kernel, ref in exact.items():
+        got = kernel(theta)
+        assert got.dtype == dtype
+        rel = np.abs(got.astype(np.longdouble) - ref) / ref
+        assert rel.max() <= physics.error_bound(dtype), kernel.__name__
+
+    theta, s = _theta_grid(1e-30 if dtype == np.float32 else 1e-290, dtype)
+    ref = 4 * np.log(s) + np.log(3 - 2 * s * s)
+    err = np.abs(physics.ln_S(theta).astype(np.longdouble) - ref)
+    assert (err <= physics.error_bound(dtype) * np.maximum(1, np.abs(ref))).all()
+
+
+def test_float32_inputs_stay_float32():
+    theta = np.linspace(0, 180, 5, dtype=np.float32)
+    for kernel in (physics.S, physics.ln_S, physics.h_over_R, physics.a_over_R, physics.V_cap):
+        assert kernel(theta).dtype == np.float32, kernel.__name__
+    assert physics.S(theta, dtype=np.float64).dtype == np.float64
+    assert physics.S(90).dtype == np.float64
+
+
+# =============================================================================
+# LINE TENSION
+# =============================================================================
+
+def test_line_tension_root_satisfies_modified_young():
+    theta_inf = np.linspace(10, 170, 17)[:, None, None]
+    x = np.geomspace(0.05, 100, 60)[None, :, None]
+    kappa = np.array([-0.3, -0.1, -0.01, 0.01, 0.1, 0.3])
+    r = physics.line_tension_theta(theta_inf, x, kappa)
+    assert r.attached.any() and not r.attached.all()
+    t = np.radians(r.theta)
+    with np.errstate(divide='ignore'):      # sin θ = 0 on the spread entries
+        residual = np.cos(t) - np.cos(np.radians(theta_inf)) + kappa / (x * np.sin(t))
+    assert np.abs(residual[r.attached]).max() < 1e-10
+    # positive line tension raises the angle, negative lowers it
+    raised = r.theta >= np.broadcast_to(theta_inf, r.theta.shape)
+    np.testing.assert_array_equal(raised, np.broadcast_to(kappa > 0, r.theta.shape))
+
+
+def test_line_tension_detach_and_spread():
+    x = np.array([0.01, 0.02])
+    detached = physics.line_tension_theta(90.0, x, 0.3)
+    assert not detached.attached.any()
+    np.testing.assert_array_equal(detached.theta, 180.0)
+    spread = physics.line_tension_theta(90.0, x, -0.3)
+    assert not spread.attached.any()
+    np.testing.assert_array_equal(spread.theta, 0.0)
+
+
+def test_zero_line_tension_reproduces_S():
+    theta = np.array([20.0, 40.0, 90.0, 140.0, 170.0])
+    r = physics.line_tension_theta(theta[:, None], np.geomspace(0.1, 10, 7), 0.0)
+    assert r.attached.all()
+    np.testing.assert_allclose(r.theta, np.broadcast_to(theta[:, None], r.theta.shape), rtol=1e-12)
+    x = np.linspace(0.1, 1.9, 19)
+    np.testing.assert_allclose(physics.dG_line_tension(x, theta[:, None], 0.0),
+                               physics.S(theta)[:, None] * (3 * x**2 - 2 * x**3), rtol=1e-12, atol=1e-15)
+    barrier, x_star = physics.line_tension_barrier(theta, 0.0)
+    np.testing.assert_allclose(barrier, physics.S(theta), rtol=1e-12)
+    np.testing.assert_allclose(x_star, 1.0)
+
+
+# =============================================================================
+# YOUNG'S EQUATION
+# =============================================================================
+
+def test_young_regimes_and_flags():
+    nan = np.nan
+    #            complete  exactly 0  moderate  exactly 180  non-wetting  γ_NL=0  γ_NL<0  NaN   negative γ_SL
+    gamma_sl = [90.0,     80.0,      50.0,     10.0,        0.0,         50.0,   50.0,   nan,  -1.0]
+    gamma_sn = [10.0,     40.0,      30.0,     50.0,        90.0,        30.0,   30.0,   30.0, 30.0]
+    gamma_nl = [40.0,     40.0,      40.0,     40.0,        40.0,        0.0,    -40.0,  40.0, 40.0]
+    r = physics.young(gamma_sl, gamma_sn, gamma_nl)
+    np.testing.assert_array_equal(r.valid, [True] * 5 + [False] * 4)
+    np.testing.assert_array_equal(r.complete_wetting, [True, True] + [False] * 7)
+    np.testing.assert_array_equal(r.non_wetting, [False] * 3 + [True, True] + [False] * 4)
+    np.testing.assert_array_equal(r.regime, [physics.COMPLETE_WETTING] * 2 + [3] + [physics.NON_WETTING] * 2
+                                  + [physics.INVALID] * 4)
+    assert physics.WETTING_REGIMES[r.regime[2]] == 'moderate'
+    np.testing.assert_allclose(r.theta[:5], [0.0, 0.0, 60.0, 180.0, 180.0], atol=1e-12)
+    np.testing.assert_allclose(r.S[:5], [0.0, 0.0, physics.S(60.0), 1.0, 1.0], atol=1e-15)
+    np.testing.assert_allclose(r.cos_theta[:5], [1.0, 1.0, 0.5, -1.0, -1.0], atol=1e-15)
+    for field in (r.theta, r.S, r.cos_theta):
+        assert np.isnan(field[5:]).all()
+
+
+def test_young_chunked_equals_unchunked():
+    rng = np.random.default_rng(0)
+    energies = rng.uniform(-5, 100, (3, 1000))
+    energies[:, rng.integers(0, 1000, 20)] = np.nan
+    whole = physics.young(*energies)
+    for chunk in (1, 7, 999):
+        for a, b in zip(physics.young(*energies, chunk=chunk), whole):
+            np.testing.assert_array_equal(a, b)
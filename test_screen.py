@@ -0,0 +1,40 @@
+"""Checks of the CSV path of screen.py."""
+
+import csv
+
+import pytest
+
+import screen
+
+
+def _screen(tmp_path, text, chunk_size=2):
+    src = tmp_path / "in.csv"
+    src.write_text(text)
+    dest = tmp_path / "out.csv"
+    result = screen.screen(str(src), str(dest), chunk_size=chunk_size)
+    with open(dest, newline='') as f:
+        return result, list(csv.reader(f))
+
+
+def test_short_rows_padded_and_lines_counted(tmp_path):
+    (n, invalid, best), rows = _screen(tmp_path, "name,gamma_sl,gamma_sn,gamma_nl,note\n\n"
+                                                 "a,50,30,40\n\nb,50,20,40,x\nc,50\n")
+    assert (n, invalid) == (3, 1)
+    assert rows[0][5:] == list(screen.RESULT_COLUMNS)
+    assert rows[1][:5] == ['a', '50', '30', '40', ''] and rows[1][8] == 'moderate'
+    assert rows[3][8] == 'invalid'
+    assert best[2] == 5     # b is on line 5 of the file
+
+
+def test_header_only_and_empty_inputs(tmp_path):
+    (n, _, best), rows = _screen(tmp_path, "gamma_sl,gamma_sn,gamma_nl\n")
+    assert (n, best) == (0, None)
+    assert rows == [['gamma_sl', 'gamma_sn', 'gamma_nl', *screen.RESULT_COLUMNS]]
+    with pytest.raises(ValueError, match="empty file"):
+        _screen(tmp_path, "")
+
+
+def test_long_rows_rejected(tmp_path):
+    with pytest.raises(ValueError, match="line 3"):
+        _screen(tmp_path, "gamma_sl,gamma_sn,gamma_nl\n50,30,40\n50,30,40,extra\n")
+    assert not (tmp_path / "out.csv").exists()
@@ -0,0 +1,37 @@
+"""Checks of the nucleation-site shape factors in sites.py."""
+
+import math
+
+import numpy as np
+
+import physics
+import sites
+
+
+def test_lens_from_cone_quadrature_is_twice_the_cap():
+    # two half-space grains, the same ray integral the edge and corner use
+    theta = np.linspace(0, 90, 91)
+    dirs, weights = sites._wedge_rule(90.0)
+    lens = sites.cone_shape_factor(theta, dirs, weights, np.array([-1.0, 0.0, 0.0]), 1.0, 2)
+    np.testing.assert_allclose(lens, 2 * physics.S(theta), atol=1e-8)
+    np.testing.assert_allclose(sites.SITES['grain_boundary'].shape_factor(theta), 2 * physics.S(theta))
+
+
+def test_grain_sites_wet_below_their_threshold():
+    edge = sites.SITES['triple_junction'].shape_factor
+    corner = sites.SITES['grain_corner'].shape_factor
+    assert edge(29.9) == 0
+    assert edge(30.5) > 0
+    corner_wets = math.degrees(math.acos(math.sqrt(2 / 3)))     # 35.26°
+    assert corner(corner_wets - 0.1) == 0
+    assert corner(corner_wets + 0.5) > 0
+
+
+def test_grain_sites_ordered_and_homogeneous_at_90():
+    theta = np.linspace(0, 120, 241)
+    gb, edge, corner = sites.shape_factors(theta, ['grain_boundary', 'triple_junction', 'grain_corner'])
+    assert (corner <= edge + 1e-8).all()    # quadrature accuracy
+    assert (edge <= gb + 1e-8).all()
+    np.testing.assert_allclose([gb[-1], edge[-1], corner[-1]], 1.0)
+    np.testing.assert_allclose(sites.shape_factors(90.0, ['grain_boundary', 'triple_junction', 'grain_corner']),
+                               1.0, atol=1e-9)
@@ -0,0 +1,36 @@
+"""Checks of the streaming statistics in uncertainty.py."""
+
+import numpy as np
+
+import physics
+import uncertainty
+
+
+def test_streaming_quantiles_within_one_bin():
+    rng = np.random.default_rng(0)
+    x = np.concatenate([rng.normal(0.3, 0.1, 150_000), rng.exponential(0.05, 50_000)])
+    x[::1000] = np.nan
+    hist = uncertainty.StreamingHistogram(0.0, 1.0, bins=256)
+    for part in np.array_split(x, 7):
+        hist.add(part)
+    x = x[~np.isnan(x)]
+    q = np.array([0.01, 0.025, 0.5, 0.975, 0.99])
+    width = (hist.hi - hist.lo) / hist.bins
+    assert (np.abs(hist.quantile(q) - np.quantile(x, q)) <= width).all()
+    assert hist.n == x.size
+    assert hist.below == (x < 0).sum()
+    np.testing.assert_allclose([hist.mean, hist.sd], [x.mean(), x.std(ddof=1)], rtol=1e-12)
+
+
+def test_propagate_matches_the_samples():
+    model = uncertainty.energy_model([50, 30, 40], [3, 3, 2], [0.5, 0, 0])
+    p = uncertainty.propagate(model, n=100_000, chunk=100_000, bins=1024, seed=3)
+    sl, sn, nl = uncertainty.sample_energies(model, 100_000, np.random.default_rng(3))
+    y = physics.young(sl, sn, nl)
+    theta = y.theta[y.valid]
+    assert p.valid == theta.size
+    width = 180 / 1024
+    assert abs(p.theta.median - np.median(theta)) <= width
+    assert abs(p.theta.lo - np.quantile(theta, 0.025)) <= width
+    assert abs(p.theta.hi - np.quantile(theta, 0.975)) <= width
+    np.testing.assert_allclose(p.theta.mean, theta.mean(), rtol=1e-12)
@@ -0,0 +1,42 @@
+"""Checks of the Wulff / Winterbottom construction in winterbottom.py."""
+
+import numpy as np
+import pytest
+
+import winterbottom
+
+
+@pytest.mark.parametrize("facets", sorted(winterbottom.FACET_SETS))
+def test_shape_factor_ends_and_symmetry(facets):
+    ends = winterbottom.shape_factor(facets, [0.0, 90.0, 180.0])
+    np.testing.assert_allclose(ends, [0.0, 0.5, 1.0], atol=1e-12)
+    # every preset is centrosymmetric, so cutting at Δγ and -Δγ splits W in two
+    theta = np.array([20.0, 45.0, 70.0])
+    np.testing.assert_allclose(winterbottom.shape_factor(facets, theta)
+                               + winterbottom.shape_factor(facets, 180 - theta), 1.0, atol=1e-12)
+
+
+def test_coplanar_substrate_face_counts_once():
+    normals, energies = winterbottom.facet_set(winterbottom.FACET_SETS['cube'])
+    full = winterbottom.winterbottom(normals, energies, winterbottom.theta_dgamma(normals, energies, 180.0))
+    assert full.shape_factor == pytest.approx(1.0)
+    assert full.area_ratio == pytest.approx(1.0)
+    assert full.substrate_ratio == 0
+    empty = winterbottom.winterbottom(normals, energies, winterbottom.theta_dgamma(normals, energies, 0.0))
+    assert (empty.shape_factor, empty.area_ratio, empty.substrate_ratio) == (0, 0, 0)
+
+
+@pytest.mark.parametrize("theta", [30.0, 90.0, 150.0])
+def test_energy_is_three_volumes(theta):
+    normals, energies = winterbottom.facet_set(winterbottom.FACET_SETS['cuboctahedron'])
+    dgamma = winterbottom.theta_dgamma(normals, energies, theta)
+    shape = winterbottom.winterbottom(normals, energies, dgamma).shape
+    assert shape.areas[:-1] @ energies + dgamma * shape.areas[-1] == pytest.approx(3 * shape.volume)
+
+
+def test_cuboctahedron_preset():
+    normals, energies = winterbottom.facet_set(winterbottom.FACET_SETS['cuboctahedron'])
+    w = winterbottom.wulff(normals, energies)
+    faces = [len(f) for f in w.faces]
+    assert len(w.vertices) == 12
+    assert sorted(faces) == [3] * 8 + [4] * 6
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+TTT / CCT diagrams from heterogeneous nucleation + JMAK (Avrami) kinetics.
+
+The barrier panel shows how much a substrate lowers ΔG*; this turns that into
+when a melt actually transforms. The nucleation rate is the heterogeneous
+one from physics.rate_map(), I = J0 exp(-Q/RT) exp(-S(θ)ΔG*_hom/kT), and
+nuclei grow as spheres at
+
+    u(T) = u0 exp(-Q/RT) (1 - exp(-ΔGv Ω / kT))
+
+Isothermal (TTT): with constant I and u the JMAK transformed fraction is
+X(t) = 1 - exp(-(π/3) I u³ t⁴), so the time to reach X is closed-form:
+
+    ln t_X = [ln(-3 ln(1 - X) / π) - ln I - 3 ln u] / 4
+
+Continuous cooling (CCT) at rate φ from T_m: the extended volume
+X_ext(t) = (4π/3) ∫ I(τ) (∫_τ^t u ds)³ dτ is integrated on a time grid and
+the time and temperature where X = 1 - exp(-X_ext) reaches each fraction
+are interpolated.
+
+Each temperature (TTT) and each cooling rate (CCT) is an independent work
+item, so sweeps run over a process pool. Everything stays in log space until
+a time is needed, so nothing overflows far from the nose.
+
+Usage:
+    python ttt.py                                    # Cu, writes ttt.png
+    python ttt.py --theta 30 60 90 --fractions 0.01 0.99 --temps 500 --workers 8
+"""
+
+import os
+import math
+import argparse
+import multiprocessing
+from typing import NamedTuple
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+import physics
+from drawing import (get_fonts, draw_dashed, BG_COLOR, PANEL_BG, WHITE, YELLOW,
+                     ORANGE, CYAN, GREEN, RED, GRAY, LIGHT_GRAY)
+
+R_GAS = 8.314462618  # J/(mol K)
+
+
+class Kinetics(NamedTuple):
+    Q: float       # activation energy for atomic transport, J/mol
+    u0: float      # growth-rate prefactor, m/s
+    omega: float   # atomic volume, m³
+
+
+# Order-of-magnitude liquid-metal transport values
+KINETICS = {
+    'Cu': Kinetics(Q=40e3, u0=1.0, omega=1.18e-29),
+    'ice': Kinetics(Q=20e3, u0=1.0, omega=3.0e-29),
+}
+
+
+def ln_nucleation_rate(theta_deg, T, material, kinetics):
+    """ln I (m⁻³ s⁻¹) on the (θ × T) grid: heterogeneous ln J minus Q/RT."""
+    T = np.atleast_1d(np.asarray(T, dtype=float))
+    rates = physics.rate_map(theta_deg, material.T_m - T, material)
+    return rates.ln_J - kinetics.Q / (R_GAS * T)
+
+
+def ln_growth_rate(T, material, kinetics):
+    """ln u (m/s) of a growing nucleus at temperature T."""
+    T = np.atleast_1d(np.asarray(T, dtype=float))
+    dGv = np.where(T < material.T_m, physics.dGv_undercooling(material.T_m - T, material.L_v, material.T_m), 0.0)
+    with np.errstate(divide='ignore'):
+        return (math.log(kinetics.u0) - kinetics.Q / (R_GAS * T)
+                + np.log(-np.expm1(-dGv * kinetics.omega / (physics.K_B * T))))
+
+
+def ln_time_to_fraction(ln_I, ln_u, fractions):
+    """Isothermal JMAK ln t_X; ``ln_I`` and ``ln_u`` broadcast, fractions go last."""
+    ln_c = np.log(-3 * np.log1p(-np.asarray(fractions, dtype=float)) / math.pi)
+    return (ln_c - np.asarray(ln_I)[..., None] - 3 * np.asarray(ln_u)[..., None]) / 4
+
+
+# =============================================================================
+# WORK ITEMS (one temperature / one cooling rate each)
+# =============================================================================
+
+_worker_state = {}
+
+def _init_worker(theta, fractions, material, kinetics, steps):
+    _worker_state.update(theta=np.asarray(theta, dtype=float), fractions=np.asarray(fractions, dtype=float),
+                         material=material, kinetics=kinetics, steps=steps)
+
+def _ttt_worker(T):
+    """(nθ, nX) ln t_X at one temperature."""
+    s = _worker_state
+    ln_I = ln_nucleation_rate(s['theta'], T, s['material'], s['kinetics'])[:, 0]
+    ln_u = ln_growth_rate(T, s['material'], s['kinetics'])[0]
+    with np.errstate(invalid='ignore'):
+        return ln_time_to_fraction(ln_I, ln_u, s['fractions'])
+
+def _cct_worker(rate):
+    """(nθ, nX) times and temperatures at which each fraction is reached when
+    cooling from T_m at ``rate`` K/s (NaN if not reached above T_min)."""
+    s = _worker_state
+    material, fractions = s['material'], s['fractions']
+    T_min, n = s['steps']
+    T = np.linspace(material.T_m, T_min, n)
+    t = (material.T_m - T) / rate
+    dt = np.gradient(t)
+    I = np.exp(ln_nucleation_rate(s['theta'], T, material, s['kinetics']))     # (nθ, n)
+    u = np.exp(ln_growth_rate(T, material, s['kinetics']))
+    G = np.concatenate(([0.0], np.cumsum((u[1:] + u[:-1]) / 2 * np.diff(t))))  # radius grown since t=0
+    # X_ext(t_k) = 4π/3 Σ_j I_j dt_j (G_k - G_j)³ over nuclei born before t_k
+    reach = np.maximum(G[:, None] - G[None, :], 0.0) ** 3                        # (n, n)
+    X_ext = 4 * math.pi / 3 * (reach @ (I * dt).T).T                             # (nθ, n)
+    out_t = np.full((len(s['theta']), len(fractions)), np.nan)
+    out_T = np.full_like(out_t, np.nan)
+    targets = -np.log1p(-fractions)
+    for i, x in enumerate(X_ext):
+        k = np.searchsorted(x, targets)     # X_ext is non-decreasing
+        for j, (kk, target) in enumerate(zip(k, targets)):
+            if 0 < kk < n:
+                lo, hi = np.log(max(x[kk - 1], 1e-300)), np.log(x[kk])
+                w = (math.log(target) - lo) / (hi - lo) if hi > lo else 1.0
+                out_t[i, j] = t[kk - 1] + w * (t[kk] - t[kk - 1])
+                out_T[i, j] = T[kk - 1] + w * (T[kk] - T[kk - 1])
+    return out_t, out_T
+
+
+def _map(worker, items, init_args, workers):
+    if workers <= 1:
+        _init_worker(*init_args)
+        return [worker(item) for item in items]
+    with multiprocessing.Pool(workers, initializer=_init_worker, initargs=init_args) as pool:
+        return pool.map(worker, items, chunksize=max(1, len(items) // (4 * workers)))
+
+
+def ttt_curves(theta, fractions, temperatures, material, kinetics, workers=1):
+    """Isothermal times to each fraction: array (nT, nθ, nX) in seconds."""
+    init = (theta, fractions, material, kinetics, None)
+    ln_t = np.array(_map(_ttt_worker, list(temperatures), init, workers))
+    with np.errstate(over='ignore'):
+        return np.exp(ln_t)
+
+
+def cct_curves(theta, fractions, rates, material, kinetics, T_min, steps=1500, workers=1):
+    """Continuous-cooling times and temperatures, each (n_rates, nθ, nX)."""
+    init = (theta, fractions, material, kinetics, (T_min, steps))
+    results = _map(_cct_worker, list(rates), init, workers)
+    return np.array([r[0] for r in results]), np.array([r[1] for r in results])
+
+
+# =============================================================================
+# PLOTTING (dark panel style of drawing.py)
+# =============================================================================
+
+CURVE_COLORS = [CYAN, GREEN, YELLOW, ORANGE, RED, (170, 140, 255), (255, 130, 170)]
+
+
+def _log_range(times, decades=14):
+    """Decade window starting at the fastest time, at most ``decades`` wide
+    (times near T_m run off to astronomically long values)."""
+    finite = np.log10(times[np.isfinite(times) & (times > 0)])
+    if finite.size == 0:
+        return -2, 6
+    lo = math.floor(finite.min())
+    return lo, min(math.ceil(finite.max()), lo + decades)
+
+
+def draw_time_panel(img, draw, px, py, pw, ph, fonts, title, curves, T_range, fractions, theta, t_range):
+    """One log-time / temperature panel.
+
+    ``curves`` is a list of (θ index, fraction index, times, temperatures).
+    Later fractions are drawn dashed.
+    """
+    f_small, f_normal, f_medium, f_large, f_title, f_bigtitle = fonts
+    draw.rectangle([px, py, px + pw, py + ph], fill=PANEL_BG, outline=LIGHT_GRAY)
+    draw.text((px + pw // 2, py + 18), title, fill=YELLOW, anchor="mm", font=f_bigtitle)
+
+    plot_x, plot_y = px + 70, py + 50
+    plot_w, plot_h = pw - 90, ph - 100
+    lo, hi = t_range
+    T_lo, T_hi = T_range
+
+    def to_x(t):
+        return plot_x + (np.log10(t) - lo) / (hi - lo) * plot_w
+
+    def to_y(T):
+        return plot_y + plot_h - (np.asarray(T) - T_lo) / (T_hi - T_lo) * plot_h
+
+    for decade in range(lo, hi + 1, max(1, (hi - lo) // 7)):
+        x = to_x(10.0 ** decade)
+        draw.line([(x, plot_y), (x, plot_y + plot_h)], fill=(40, 50, 70), width=1)
+        draw.text((x, plot_y + plot_h + 12), f"1e{decade}", fill=WHITE, anchor="mm", font=f_small)
+    for T_tick in np.linspace(T_lo, T_hi, 6):
+        y = to_y(T_tick)
+        draw.line([(plot_x, y), (plot_x + plot_w, y)], fill=(40, 50, 70), width=1)
+        draw.text((plot_x - 8, y), f"{T_tick:.0f}", fill=WHITE, anchor="rm", font=f_small)
+    draw.line([(plot_x, plot_y + plot_h), (plot_x + plot_w, plot_y + plot_h)], fill=WHITE, width=2)
+    draw.line([(plot_x, plot_y), (plot_x, plot_y + plot_h)], fill=WHITE, width=2)
+    draw.text((plot_x + plot_w // 2, plot_y + plot_h + 32), "time (s)", fill=WHITE, anchor="mm", font=f_normal)
+    draw.text((px + 8, plot_y - 26), "T (K)", fill=WHITE, font=f_normal)
+
+    for i, j, t, T in curves:
+        ok = np.isfinite(t) & (t > 0) & np.isfinite(T)
+        pts = list(zip(to_x(t[ok]).tolist(), to_y(T[ok]).tolist()))
+        pts = [(x, y) for x, y in pts if plot_x <= x <= plot_x + plot_w]
+        color = CURVE_COLORS[i % len(CURVE_COLORS)]
+        if j == 0:
+            if len(pts) >= 2:
+                draw.line(pts, fill=color, width=2)
+        else:
+            for (x1, y1), (x2, y2) in zip(pts, pts[1:]):
+                draw_dashed(draw, x1, y1, x2, y2, color, 3 + 2 * j, 3)
+
+    # Legend: colour = θ, dash = fraction
+    lx = plot_x + plot_w - 110
+    ly = plot_y + plot_h - 12 - 15 * (len(theta) + len(fractions)) - 4
+    for i, th in enumerate(theta):
+        color = CURVE_COLORS[i % len(CURVE_COLORS)]
+        draw.line([(lx, ly + 15 * i), (lx + 24, ly + 15 * i)], fill=color, width=2)
+        draw.text((lx + 30, ly + 15 * i), f"θ = {th:g}°", fill=WHITE, anchor="lm", font=f_small)
+    ly += 15 * len(theta) + 4
+    for j, X in enumerate(fractions):
+        if j == 0:
+            draw.line([(lx, ly + 15 * j), (lx + 24, ly + 15 * j)], fill=GRAY, width=2)
+        else:
+            draw_dashed(draw, lx, ly + 15 * j, lx + 24, ly + 15 * j, GRAY, 3 + 2 * j, 3)
+        draw.text((lx + 30, ly + 15 * j), f"X = {X:g}", fill=WHITE, anchor="lm", font=f_small)
+
+
+def plot_ttt_cct(path, theta, fractions, temperatures, ttt, rates, cct_t, cct_T, material_name,
+                 width=1100, height=500):
+    """Side-by-side TTT and CCT panels written to ``path``."""
+    fonts = get_fonts()
+    img = Image.new('RGB', (width, height), BG_COLOR)
+    draw = ImageDraw.Draw(img)
+    T_range = (float(np.min(temperatures)), float(np.max(temperatures)))
+    gap = 8
+    pw, ph = (width - 3 * gap) // 2, height - 2 * gap
+
+    t_range = _log_range(ttt)
+    curves = [(i, j, ttt[:, i, j], np.asarray(temperatures))
+              for j in range(len(fractions)) for i in range(len(theta))]
+    draw_time_panel(img, draw, gap, gap, pw, ph, fonts, f"TTT  ({material_name}, isothermal)",
+                    curves, T_range, fractions, theta, t_range)
+
+    t_range = _log_range(cct_t)
+    curves = [(i, j, cct_t[:, i, j], cct_T[:, i, j])
+              for j in range(len(fractions)) for i in range(len(theta))]
+    draw_time_panel(img, draw, 2 * gap + pw, gap, pw, ph, fonts, f"CCT  ({material_name}, cooling)",
+                    curves, T_range, fractions, theta, t_range)
+    img.save(path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="TTT/CCT diagrams from heterogeneous nucleation + JMAK kinetics")
+    parser.add_argument('--material', choices=sorted(physics.MATERIALS), default='Cu')
+    parser.add_argument('--theta', type=float, nargs='+', default=[20, 40, 60, 90, 120],
+                        help="contact angles, degrees (default: %(default)s)")
+    parser.add_argument('--fractions', type=float, nargs='+', default=[0.01, 0.99],
+                        help="transformed fractions (default: %(default)s)")
+    parser.add_argument('--temps', type=int, default=300, help="TTT temperatures (default: %(default)s)")
+    parser.add_argument('--t-min-frac', type=float, default=0.3,
+                        help="lowest temperature as a fraction of T_m (default: %(default)s)")
+    parser.add_argument('--rates', type=float, nargs='+', default=list(np.logspace(-2, 8, 60)),
+                        help="CCT cooling rates, K/s (default: 60 rates from 1e-2 to 1e8)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="worker processes (default: all cores; 1 = serial)")
+    parser.add_argument('--output', '-o', default='ttt.png')
+    args = parser.parse_args()
+
+    material = physics.MATERIALS[args.material]
+    kinetics = KINETICS[args.material]
+    T_min = args.t_min_frac * material.T_m
+    temperatures = np.linspace(material.T_m - 1.0, T_min, args.temps)
+
+    ttt = ttt_curves(args.theta, args.fractions, temperatures, material, kinetics, args.workers)
+    cct_t, cct_T = cct_curves(args.theta, args.fractions, args.rates, material, kinetics, T_min,
+                              workers=args.workers)
+    plot_ttt_cct(args.output, args.theta, args.fractions, temperatures, ttt, args.rates, cct_t, cct_T,
+                 args.material)
+    nose = temperatures[np.nanargmin(np.where(np.isfinite(ttt[:, 0, 0]), ttt[:, 0, 0], np.inf))]
+    print(f"Wrote {args.output}: {args.temps} temperatures x {len(args.theta)} contact angles, "
+          f"{len(args.rates)} cooling rates (θ = {args.theta[0]:g}° nose at {nose:.0f} K)")
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo propagation of surface-energy uncertainty to θ, S and the barrier.
+
+Young's equation turns one (γ_SL, γ_SN, γ_NL) into one θ. With error bars
+on the energies, samples are drawn from a joint distribution with
+correlation matrix R,
+
+    γ = μ + D L z,    L Lᵀ = R (Cholesky),  D = diag(σ),  z ~ N(0, I)
+
+(or ln γ drawn the same way for log-normal energies, which cannot go
+negative; μ, σ are then converted so the energies keep the given mean and
+standard deviation). Every sample goes through young() and S(θ), and the
+barrier relative to the homogeneous one at the mean γ_NL,
+
+    ΔG*_het / ΔG*_hom(γ̄_NL) = S(θ) (γ_NL / γ̄_NL)³
+
+Samples are generated and reduced ``chunk`` at a time. Each quantity feeds
+a StreamingHistogram: fixed bins with under/overflow counts plus running
+moments merged per chunk (Chan et al.), so memory does not grow with the
+number of samples and 10⁸+ samples stream through in constant space.
+Quantiles are read from the cumulative counts, interpolated inside the
+bin, so they are exact to within one bin width ((hi - lo) / bins).
+
+Usage:
+    python uncertainty.py --mean 50 30 40 --sd 3 3 2 --corr 0.5 0 0 --samples 10000000
+"""
+
+import argparse
+import functools
+from typing import NamedTuple
+
+import numpy as np
+
+import physics
+
+
+class EnergyModel(NamedTuple):
+    mean: np.ndarray     # (3,) mean γ_SL, γ_SN, γ_NL
+    sd: np.ndarray       # (3,) standard deviations
+    corr: np.ndarray     # (3, 3) correlation matrix (of ln γ if lognormal)
+    lognormal: bool
+
+
+def energy_model(mean, sd, corr=None, lognormal=False):
+    """EnergyModel for (γ_SL, γ_SN, γ_NL) with the given means and standard
+    deviations. ``corr`` is a 3 x 3 correlation matrix or the three pair
+    coefficients (ρ_SL,SN, ρ_SL,NL, ρ_SN,NL); default independent."""
+    if corr is None:
+        corr = np.eye(3)
+    corr = np.asarray(corr, dtype=float)
+    if corr.shape == (3,):
+        a, b, c = corr
+        corr = np.array([[1.0, a, b], [a, 1.0, c], [b, c, 1.0]])
+    return EnergyModel(np.asarray(mean, dtype=float), np.asarray(sd, dtype=float), corr, lognormal)
+
+
+def sample_energies(model, n, rng):
+    """(3, n) correlated (γ_SL, γ_SN, γ_NL) samples of ``model``."""
+    L = np.linalg.cholesky(model.corr)
+    z = L @ rng.standard_normal((3, n))
+    if not model.lognormal:
+        return model.mean[:, None] + model.sd[:, None] * z
+    sigma2 = np.log1p((model.sd / model.mean) ** 2)
+    mu = np.log(model.mean) - sigma2 / 2
+    return np.exp(mu[:, None] + np.sqrt(sigma2)[:, None] * z)
+
+
+# =============================================================================
+# STREAMING ACCUMULATOR
+# =============================================================================
+
+class StreamingHistogram:
+    """Fixed-bin histogram on [lo, hi] with running mean and variance.
+
+    add() takes any number of values; memory is the bins only. Values
+    outside [lo, hi] are counted in ``below`` / ``above`` (and still enter
+    the moments); NaN is ignored.
+    """
+
+    def __init__(self, lo, hi, bins=4096):
+        self.lo, self.hi, self.bins = float(lo), float(hi), bins
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.below = self.above = 0
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min, self.max = np.inf, -np.inf
+
+    @property
+    def edges(self):
+        return np.linspace(self.lo, self.hi, self.bins + 1)
+
+    def add(self, x):
+        x = np.asarray(x, dtype=float).ravel()
+        x = x[~np.isnan(x)]
+        if not x.size:
+            return
+        b = np.floor((x - self.lo) * (self.bins / (self.hi - self.lo)))
+        b = np.clip(b, -1, self.bins).astype(np.int64)
+        b[x == self.hi] = self.bins - 1
+        c = np.bincount(b + 1, minlength=self.bins + 2)
+        self.below += int(c[0])
+        self.above += int(c[-1])
+        self.counts += c[1:-1]
+        # merge (n, mean, M2) of this chunk into the running totals
+        n, mean = x.size, float(x.mean())
+        m2 = float(((x - mean) ** 2).sum())
+        total = self.n + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta * delta * self.n * n / total
+        self.n = total
+        self.min = min(self.min, float(x.min()))
+        self.max = max(self.max, float(x.max()))
+
+    @property
+    def sd(self):
+        return float(np.sqrt(self.m2 / (self.n - 1))) if self.n > 1 else np.nan
+
+    def quantile(self, q):
+        """Quantiles ``q`` (scalar or array in [0, 1]), linear inside a bin;
+        clamped to [lo, hi] when they fall in the under/overflow."""
+        q = np.asarray(q, dtype=float)
+        cum = self.below + np.concatenate(([0], np.cumsum(self.counts)))
+        target = q * self.n
+        i = np.clip(np.searchsorted(cum, target, side='left'), 1, self.bins)
+        inside = self.counts[i - 1]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            frac = np.where(inside > 0, (target - cum[i - 1]) / inside, 0.0)
+        edges = self.edges
+        x = edges[i - 1] + np.clip(frac, 0, 1) * (edges[i] - edges[i - 1])
+        return np.where(target <= self.below, self.lo, np.where(target > cum[-1], self.hi, x))[()]
+
+
+class Summary(NamedTuple):
+    mean: float
+    sd: float
+    median: float
+    lo: float             # lower end of the central confidence interval
+    hi: float             # upper end
+    edges: np.ndarray     # (bins + 1,) histogram edges
+    counts: np.ndarray    # (bins,) counts (outliers in below/above excluded)
+
+
+class Propagation(NamedTuple):
+    n: int                 # samples drawn
+    valid: int             # physical samples (all energies >= 0, γ_NL > 0)
+    complete_wetting: int  # valid samples with θ clamped to 0
+    non_wetting: int       # valid samples with θ clamped to 180°
+    level: float           # confidence level of lo/hi
+    theta: Summary         # degrees
+    S: Summary
+    barrier: Summary       # ΔG*_het / ΔG*_hom at the mean γ_NL
+
+
+def _summary(hist, level):
+    tail = (1 - level) / 2
+    median, lo, hi = hist.quantile([0.5, tail, 1 - tail])
+    return Summary(hist.mean, hist.sd, float(median), float(lo), float(hi), hist.edges, hist.counts.copy())
+
+
+def propagate(model, n=1_000_000, chunk=1 << 18, level=0.95, bins=4096, seed=None):
+    """Push ``n`` samples of ``model`` through Young's equation, S(θ) and the
+    barrier, ``chunk`` at a time, and return a Propagation.
+
+    Unphysical samples (a negative energy, γ_NL <= 0) are counted but left
+    out of the statistics. The barrier histogram spans [0, b_max] with
+    b_max the barrier of S = 1 at γ_NL six standard deviations above its
+    mean; its quantiles are exact to within one bin.
+    """
+    rng = np.random.default_rng(seed)
+    mean_nl = model.mean[2]
+    if model.lognormal:
+        span = np.exp(6 * np.sqrt(np.log1p((model.sd[2] / mean_nl) ** 2)))
+    else:
+        span = 1 + 6 * model.sd[2] / mean_nl
+    hists = (StreamingHistogram(0.0, 180.0, bins), StreamingHistogram(0.0, 1.0, bins),
+             StreamingHistogram(0.0, max(1.0, span ** 3), bins))
+    valid = complete = non = 0
+    done = 0
+    while done < n:
+        size = min(chunk, n - done)
+        sl, sn, nl = sample_energies(model, size, rng)
+        y = physics.young(sl, sn, nl)
+        ok = y.valid
+        valid += int(ok.sum())
+        complete += int(y.complete_wetting.sum())
+        non += int(y.non_wetting.sum())
+        s = y.S[ok]
+        hists[0].add(y.theta[ok])
+        hists[1].add(s)
+        hists[2].add(s * (nl[ok] / mean_nl) ** 3)
+        done += size
+    return Propagation(n, valid, complete, non, level, *(_summary(h, level) for h in hists))
+
+
+@functools.lru_cache(maxsize=512)
+def contact_angle_propagation(theta_deg, sigma, n=100_000, seed=0):
+    """Propagation around a nominal contact angle for the barrier panel.
+
+    Nominal energies γ_NL = 1, γ_SN = 2, γ_SL = 2 + cos θ (so cos θ is
+    exact and every energy stays positive), each with standard deviation
+    ``sigma`` in units of γ_NL and independent. Seeded, so frames rendered
+    in different processes agree; memoized per (θ, σ).
+    """
+    c = float(np.cos(np.radians(theta_deg)))
+    model = energy_model([2.0 + c, 2.0, 1.0], [sigma] * 3)
+    return propagate(model, n, seed=seed)
+
+
+if __name__ == "__main__":
+    import time
+
+    parser = argparse.ArgumentParser(description="Propagate surface-energy uncertainty to θ, S and ΔG*")
+    parser.add_argument('--mean', type=float, nargs=3, default=[50.0, 30.0, 40.0], metavar=('SL', 'SN', 'NL'))
+    parser.add_argument('--sd', type=float, nargs=3, default=[3.0, 3.0, 2.0], metavar=('SL', 'SN', 'NL'))
+    parser.add_argument('--corr', type=float, nargs=3, default=[0.0, 0.0, 0.0],
+                        metavar=('SL_SN', 'SL_NL', 'SN_NL'), help="pair correlation coefficients")
+    parser.add_argument('--lognormal', action='store_true', help="log-normal energies (always positive)")
+    parser.add_argument('--samples', type=int, default=1_000_000)
+    parser.add_argument('--chunk', type=int, default=1 << 18)
+    parser.add_argument('--level', type=float, default=0.95)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    model = energy_model(args.mean, args.sd, args.corr, args.lognormal)
+    start = time.perf_counter()
+    p = propagate(model, args.samples, args.chunk, args.level, seed=args.seed)
+    elapsed = time.perf_counter() - start
+    nominal = physics.young(*args.mean)
+    print(f"{p.n:,} samples in {elapsed:.1f} s ({p.n / elapsed / 1e6:.1f} M/s), "
+          f"{p.valid / p.n:.2%} physical, {p.complete_wetting:,} complete wetting, {p.non_wetting:,} non-wetting")
+    print(f"nominal: θ = {float(nominal.theta):.2f}°  S = {float(nominal.S):.4f}")
+    print(f"{'':10}{'mean':>10}{'sd':>10}{'median':>10}{f'{args.level:.0%} CI':>22}")
+    for name, s in (("θ (°)", p.theta), ("S", p.S), ("ΔG*/ΔG*hom", p.barrier)):
+        print(f"{name:10}{s.mean:10.4f}{s.sd:10.4f}{s.median:10.4f}    [{s.lo:8.4f}, {s.hi:8.4f}]")
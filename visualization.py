@@ -25,11 +25,11 @@ def _(mo):
 
 
 @app.cell
-def _(theta_slider, mo):
+def _():
     import math
+    import numpy as np
     from PIL import Image, ImageDraw, ImageFont
-    import io
-    import base64
+    from physics import S, dG_het, h_over_R, a_over_R
 
     WIDTH = 1100
     HEIGHT = 500
@@ -52,11 +52,6 @@ def _(theta_slider, mo):
     LIGHT_GRAY = (120, 120, 130)
     BLACK = (0, 0, 0)
 
-    def S(theta_deg):
-        theta = math.radians(theta_deg)
-        c = math.cos(theta)
-        return (2 + c) * (1 - c) ** 2 / 4
-
     def draw_arrow(draw, x1, y1, x2, y2, color, width=3, arrow_len=10):
         draw.line([(x1, y1), (x2, y2)], fill=color, width=width)
         angle = math.atan2(y2 - y1, x2 - x1)
@@ -91,44 +86,43 @@ def _(theta_slider, mo):
         return f_small, f_normal, f_medium, f_large, f_title, f_bigtitle
 
     def draw_nucleus(draw, cx, baseY, theta_deg, a=60):
-        theta_rad = math.radians(theta_deg)
-        sin_t = max(math.sin(theta_rad), 0.05)
-        cos_t = math.cos(theta_rad)
+        sin_t = max(a_over_R(theta_deg), 0.05)
         R = a / sin_t
         R = min(R, 400)
-        Cy = baseY + R * cos_t
+        h = R * h_over_R(theta_deg)
+        Cy = baseY - h + R  # apex is h above the substrate, centre R below the apex
         alpha_R = math.atan2(baseY - Cy, a)
         alpha_L = math.atan2(baseY - Cy, -a)
         if alpha_L <= alpha_R:
             span = alpha_R - alpha_L
         else:
             span = alpha_R - (alpha_L - 2*math.pi)
-        arc_pts = []
-        for i in range(61):
-            t = i / 60
-            angle = alpha_R - t * span
-            px = cx + R * math.cos(angle)
-            py = Cy + R * math.sin(angle)
-            if py <= baseY + 1:
-                arc_pts.append((px, py))
+        angles = alpha_R - np.arange(61) / 60 * span
+        arc_x = cx + R * np.cos(angles)
+        arc_y = Cy + R * np.sin(angles)
+        keep = arc_y <= baseY + 1
+        arc_pts = list(zip(arc_x[keep].tolist(), arc_y[keep].tolist()))
         if len(arc_pts) >= 2:
             poly = [(cx - a, baseY)] + arc_pts + [(cx + a, baseY)]
             draw.polygon(poly, fill=NUCLEUS_COLOR, outline=NUCLEUS_OUTLINE)
             draw.line(arc_pts, fill=NUCLEUS_OUTLINE, width=3)
-        h = R * (1 - cos_t)
         return (h, Cy, R)
 
-    def draw_geometry_panel(draw, theta_deg, px, py, pw, ph, fonts):
+    def draw_geometry_background(draw, px, py, pw, ph, fonts):
         f_small, f_normal, f_medium, f_large, f_title, f_bigtitle = fonts
         draw.rectangle([px, py, px+pw, py+ph], fill=PANEL_BG, outline=LIGHT_GRAY)
         draw.text((px + pw//2, py + 18), "NUCLEUS GEOMETRY", fill=YELLOW, anchor="mm", font=f_bigtitle)
-        cx = px + pw//2
         baseY = py + int(ph * 0.58)
         substrate_top = baseY
         substrate_bottom = baseY + 35
         draw.rectangle([px+5, substrate_top, px+pw-5, substrate_bottom], fill=SUBSTRATE_COLOR)
         for i in range(px, px+pw, 8):
             draw.line([(i, substrate_top), (i+12, substrate_bottom)], fill=SUBSTRATE_HATCH, width=1)
+
+    def draw_geometry_overlay(draw, theta_deg, px, py, pw, ph, fonts):
+        f_small, f_normal, f_medium, f_large, f_title, f_bigtitle = fonts
+        cx = px + pw//2
+        baseY = py + int(ph * 0.58)
         a = 55
         h, Cy, R = draw_nucleus(draw, cx, baseY, theta_deg, a)
         theta_rad = math.radians(theta_deg)
@@ -182,8 +176,6 @@ def _(theta_slider, mo):
         draw.text((tpX - L - 16, tpY - 24), "Ysn", fill=BLACK, font=f_title)
         draw.text((tpX + L + 10, tpY - 24), "Ysl", fill=WHITE, font=f_title)
         draw.text((nlX - 36, nlY - 14), "Ynl", fill=GOLD, font=f_title)
-        draw.text((cx, substrate_bottom - 12), "Substrate", fill=WHITE, anchor="mm", font=f_small)
-        draw.text((px + 12, py + 42), "Liquid", fill=WHITE, font=f_normal)
         if h > 20:
             draw.text((cx, baseY - min(h*0.5, 50)), "Nucleus", fill=WHITE, anchor="mm", font=f_normal)
         sf = S(theta_deg)
@@ -202,6 +194,13 @@ def _(theta_slider, mo):
         else:
             wetting, wcolor = "Non-wetting", RED
         draw.text((px + 12, py + 108), wetting, fill=wcolor, font=f_small)
+
+    def draw_geometry_foreground(draw, px, py, pw, ph, fonts):
+        f_small, f_normal, f_medium, f_large, f_title, f_bigtitle = fonts
+        cx = px + pw//2
+        substrate_bottom = py + int(ph * 0.58) + 35
+        draw.text((cx, substrate_bottom - 12), "Substrate", fill=WHITE, anchor="mm", font=f_small)
+        draw.text((px + 12, py + 42), "Liquid", fill=WHITE, font=f_normal)
         ly = py + ph - 55
         legend_box = [px + 5, ly - 2, px + 155, ly + 48]
         draw.rectangle(legend_box, fill=(45, 65, 95), outline=(80, 100, 130))
@@ -214,12 +213,7 @@ def _(theta_slider, mo):
         draw.text((px + pw - 8, ly + 8), "Young's equation:", fill=GRAY, anchor="rt", font=f_small)
         draw.text((px + pw - 8, ly + 26), "Ysl = Ysn + Ynl*cos(theta)", fill=WHITE, anchor="rt", font=f_normal)
 
-    def draw_shape_factor_panel(draw, theta_deg, px, py, pw, ph, fonts):
-        f_small, f_normal, f_medium, f_large, f_title, f_bigtitle = fonts
-        draw.rectangle([px, py, px+pw, py+ph], fill=PANEL_BG, outline=LIGHT_GRAY)
-        draw.text((px + pw//2, py + 18), "SHAPE FACTOR S(theta)", fill=YELLOW, anchor="mm", font=f_bigtitle)
-        sf = S(theta_deg)
-        draw.text((px + pw//2, py + 42), f"S({theta_deg:.0f} deg) = {sf:.4f}", fill=CYAN, anchor="mm", font=f_medium)
+    def shape_factor_plot_area(px, py, pw, ph):
         margin = {'l': 55, 'r': 15, 't': 60, 'b': 55}
         plot_x = px + margin['l']
         plot_y = py + margin['t']
@@ -227,6 +221,13 @@ def _(theta_slider, mo):
         plot_h = ph - margin['t'] - margin['b']
         def to_x(th): return plot_x + (th / 180) * plot_w
         def to_y(s): return plot_y + plot_h - s * plot_h
+        return plot_x, plot_y, plot_w, plot_h, to_x, to_y
+
+    def draw_shape_factor_background(draw, px, py, pw, ph, fonts):
+        f_small, f_normal, f_medium, f_large, f_title, f_bigtitle = fonts
+        draw.rectangle([px, py, px+pw, py+ph], fill=PANEL_BG, outline=LIGHT_GRAY)
+        draw.text((px + pw//2, py + 18), "SHAPE FACTOR S(theta)", fill=YELLOW, anchor="mm", font=f_bigtitle)
+        plot_x, plot_y, plot_w, plot_h, to_x, to_y = shape_factor_plot_area(px, py, pw, ph)
         for s_val in [0.25, 0.5, 0.75]:
             y = to_y(s_val)
             draw.line([(plot_x, y), (plot_x + plot_w, y)], fill=(40, 50, 70), width=1)
@@ -235,12 +236,23 @@ def _(theta_slider, mo):
             draw.line([(x, plot_y), (x, plot_y + plot_h)], fill=(40, 50, 70), width=1)
         draw.line([(plot_x, plot_y + plot_h), (plot_x + plot_w, plot_y + plot_h)], fill=WHITE, width=2)
         draw.line([(plot_x, plot_y), (plot_x, plot_y + plot_h)], fill=WHITE, width=2)
-        pts = [(to_x(th), to_y(S(th))) for th in range(0, 181, 2)]
+        th = np.arange(0, 181, 2)
+        pts = list(zip(to_x(th).tolist(), to_y(S(th)).tolist()))
         draw.line(pts, fill=CYAN, width=3)
-        curr_x, curr_y = to_x(theta_deg), to_y(S(theta_deg))
+
+    def draw_shape_factor_overlay(draw, theta_deg, px, py, pw, ph, fonts):
+        f_small, f_normal, f_medium, f_large, f_title, f_bigtitle = fonts
+        sf = S(theta_deg)
+        draw.text((px + pw//2, py + 42), f"S({theta_deg:.0f} deg) = {sf:.4f}", fill=CYAN, anchor="mm", font=f_medium)
+        plot_x, plot_y, plot_w, plot_h, to_x, to_y = shape_factor_plot_area(px, py, pw, ph)
+        curr_x, curr_y = to_x(theta_deg), to_y(sf)
         draw.ellipse([curr_x-8, curr_y-8, curr_x+8, curr_y+8], fill=GREEN, outline=WHITE, width=2)
         draw_dashed(draw, curr_x, plot_y + plot_h, curr_x, curr_y, GRAY, 4, 3, 1)
         draw_dashed(draw, plot_x, curr_y, curr_x, curr_y, GRAY, 4, 3, 1)
+
+    def draw_shape_factor_foreground(draw, px, py, pw, ph, fonts):
+        f_small, f_normal, f_medium, f_large, f_title, f_bigtitle = fonts
+        plot_x, plot_y, plot_w, plot_h, to_x, to_y = shape_factor_plot_area(px, py, pw, ph)
         draw.text((plot_x + plot_w//2, plot_y + plot_h + 32), "Contact Angle theta (degrees)", 
                   fill=GREEN, anchor="mm", font=f_medium)
         for th_val in [0, 45, 90, 135, 180]:
@@ -254,23 +266,23 @@ def _(theta_slider, mo):
         eq_y = plot_y + int(plot_h * 0.78)
         draw.text((eq_x, eq_y), "S = (2+cos)(1-cos)^2/4", fill=CYAN, anchor="mm", font=f_normal)
 
-    def draw_barrier_panel(draw, theta_deg, px, py, pw, ph, fonts):
-        f_small, f_normal, f_medium, f_large, f_title, f_bigtitle = fonts
-        draw.rectangle([px, py, px+pw, py+ph], fill=PANEL_BG, outline=LIGHT_GRAY)
-        draw.text((px + pw//2, py + 18), "NUCLEATION BARRIER dG*", fill=YELLOW, anchor="mm", font=f_bigtitle)
-        sf = S(theta_deg)
-        draw.text((px + pw//2, py + 42), f"dG*(het) = {sf*100:.1f}% of dG*(hom)", fill=ORANGE, anchor="mm", font=f_medium)
+    def barrier_plot_area(px, py, pw, ph):
         margin = {'l': 55, 'r': 15, 't': 60, 'b': 55}
         plot_x = px + margin['l']
         plot_y = py + margin['t']
         plot_w = pw - margin['l'] - margin['r']
         plot_h = ph - margin['t'] - margin['b']
-        def dG(r, s=1): 
-            return s * (3*r**2 - 2*r**3) if r > 0 else 0
         r_max = 1.5
         dg_max = 1.15
         def to_x(r): return plot_x + (r/r_max) * plot_w
-        def to_y(g): return plot_y + (dg_max - max(g, 0)) / dg_max * plot_h
+        def to_y(g): return plot_y + (dg_max - np.maximum(g, 0)) / dg_max * plot_h
+        return plot_x, plot_y, plot_w, plot_h, r_max, dg_max, to_x, to_y
+
+    def draw_barrier_background(draw, px, py, pw, ph, fonts):
+        f_small, f_normal, f_medium, f_large, f_title, f_bigtitle = fonts
+        draw.rectangle([px, py, px+pw, py+ph], fill=PANEL_BG, outline=LIGHT_GRAY)
+        draw.text((px + pw//2, py + 18), "NUCLEATION BARRIER dG*", fill=YELLOW, anchor="mm", font=f_bigtitle)
+        plot_x, plot_y, plot_w, plot_h, r_max, dg_max, to_x, to_y = barrier_plot_area(px, py, pw, ph)
         zero_y = to_y(0)
         for g_val in [0.25, 0.5, 0.75, 1.0]:
             y = to_y(g_val)
@@ -280,23 +292,29 @@ def _(theta_slider, mo):
             draw.line([(x, plot_y), (x, plot_y + plot_h)], fill=(40, 50, 70), width=1)
         draw.line([(plot_x, zero_y), (plot_x + plot_w, zero_y)], fill=WHITE, width=2)
         draw.line([(plot_x, plot_y), (plot_x, plot_y + plot_h)], fill=WHITE, width=2)
+        r = np.arange(101) / 100 * r_max
+        g = dG_het(r, 1.0)
+        xs, ys = to_x(r).tolist(), to_y(g).tolist()
         prev = None
         for i in range(0, 101, 1):
-            r = i/100 * r_max
-            g = dG(r, 1.0)
-            if 0 <= g <= dg_max:
-                pt = (to_x(r), to_y(g))
+            if 0 <= g[i] <= dg_max:
+                pt = (xs[i], ys[i])
                 if prev and i % 3 < 2:
                     draw.line([prev, pt], fill=GRAY, width=2)
                 prev = pt
             else:
                 prev = None
-        het_pts = []
-        for i in range(101):
-            r = i/100 * r_max
-            g = dG(r, sf)
-            if 0 <= g <= dg_max:
-                het_pts.append((to_x(r), to_y(g)))
+
+    def draw_barrier_overlay(draw, theta_deg, px, py, pw, ph, fonts):
+        f_small, f_normal, f_medium, f_large, f_title, f_bigtitle = fonts
+        sf = S(theta_deg)
+        draw.text((px + pw//2, py + 42), f"dG*(het) = {sf*100:.1f}% of dG*(hom)", fill=ORANGE, anchor="mm", font=f_medium)
+        plot_x, plot_y, plot_w, plot_h, r_max, dg_max, to_x, to_y = barrier_plot_area(px, py, pw, ph)
+        zero_y = to_y(0)
+        r = np.arange(101) / 100 * r_max
+        g = dG_het(r, sf)
+        keep = (g >= 0) & (g <= dg_max)
+        het_pts = list(zip(to_x(r[keep]).tolist(), to_y(g[keep]).tolist()))
         if len(het_pts) >= 2:
             draw.line(het_pts, fill=CYAN, width=3)
         r_star_x = to_x(1.0)
@@ -312,6 +330,11 @@ def _(theta_slider, mo):
             draw.line([(ax, zero_y-2), (ax, het_peak_y+2)], fill=ORANGE, width=2)
             draw.polygon([(ax, het_peak_y), (ax-4, het_peak_y+8), (ax+4, het_peak_y+8)], fill=ORANGE)
             draw.polygon([(ax, zero_y), (ax-4, zero_y-8), (ax+4, zero_y-8)], fill=ORANGE)
+
+    def draw_barrier_foreground(draw, px, py, pw, ph, fonts):
+        f_small, f_normal, f_medium, f_large, f_title, f_bigtitle = fonts
+        plot_x, plot_y, plot_w, plot_h, r_max, dg_max, to_x, to_y = barrier_plot_area(px, py, pw, ph)
+        zero_y = to_y(0)
         lx, ly = plot_x + plot_w - 5, plot_y + 12
         draw.line([(lx-115, ly), (lx-88, ly)], fill=GRAY, width=2)
         draw.text((lx-84, ly), "Homogeneous", fill=WHITE, anchor="lm", font=f_small)
@@ -331,20 +354,58 @@ def _(theta_slider, mo):
         eq_y = plot_y + int(plot_h * 0.15)
         draw.text((eq_x, eq_y), "dG*(het) = S*dG*(hom)", fill=ORANGE, anchor="mm", font=f_medium)
 
-    def draw_frame(theta_deg):
-        img = Image.new('RGB', (WIDTH, HEIGHT), BG_COLOR)
-        draw = ImageDraw.Draw(img)
-        fonts = get_fonts()
+    PANELS = [
+        (draw_geometry_background, draw_geometry_overlay, draw_geometry_foreground),
+        (draw_shape_factor_background, draw_shape_factor_overlay, draw_shape_factor_foreground),
+        (draw_barrier_background, draw_barrier_overlay, draw_barrier_foreground),
+    ]
+
+    def panel_layout():
         gap = 8
         panel_w = (WIDTH - 4*gap) // 3
         panel_h = HEIGHT - 2*gap
-        draw_geometry_panel(draw, theta_deg, gap, gap, panel_w, panel_h, fonts)
-        draw_shape_factor_panel(draw, theta_deg, gap*2 + panel_w, gap, panel_w, panel_h, fonts)
-        draw_barrier_panel(draw, theta_deg, gap*3 + panel_w*2, gap, panel_w, panel_h, fonts)
-        return img
+        return [(gap*(i + 1) + panel_w*i, gap, panel_w, panel_h) for i in range(3)]
+
+    # Static layers live for the whole session: this cell does not depend on
+    # theta_slider, so only the display cell below re-runs on a slider tick.
+    static_layers = {}
+
+    def get_static_layers():
+        key = (WIDTH, HEIGHT)
+        if key not in static_layers:
+            fonts = get_fonts()
+            background = Image.new('RGBA', (WIDTH, HEIGHT), BG_COLOR + (255,))
+            foreground = Image.new('RGBA', (WIDTH, HEIGHT), (0, 0, 0, 0))
+            bg_draw = ImageDraw.Draw(background)
+            fg_draw = ImageDraw.Draw(foreground)
+            for (draw_bg, _, draw_fg), rect in zip(PANELS, panel_layout()):
+                draw_bg(bg_draw, *rect, fonts)
+                draw_fg(fg_draw, *rect, fonts)
+            static_layers[key] = (background, foreground, fonts)
+        return static_layers[key]
+
+    def draw_frame(theta_deg):
+        background, foreground, fonts = get_static_layers()
+        img = background.copy()
+        draw = ImageDraw.Draw(img)
+        for (_, draw_overlay, _), (px, py, pw, ph) in zip(PANELS, panel_layout()):
+            box = (px, py, px + pw + 1, py + ph + 1)
+            img.paste(background.crop(box), box)
+            draw_overlay(draw, theta_deg, px, py, pw, ph, fonts)
+            img.alpha_composite(foreground, (px, py), box)
+        return img.convert('RGB')
+
+    return (draw_frame,)
+
+
+@app.cell
+def _(draw_frame, theta_slider, mo):
+    import io
+    import base64
 
     theta = theta_slider.value
     img = draw_frame(theta)
+
     buffer = io.BytesIO()
     img.save(buffer, format='PNG')
     buffer.seek(0)